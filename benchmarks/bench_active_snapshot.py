@@ -0,0 +1,126 @@
+"""
+유효 NOTAM 조회 벤치마크 ("지금 RKSI에서 FL100 아래, 반경 10 NM 안")
+SQL (find_active_notams 범위 조회 + parsed_data JSON 후처리) vs NOTAMSnapshot (NumPy 마스크)
+
+스냅샷 로드 시간과 변경 1% 증분 갱신(apply_changes) 시간도 함께 측정한다.
+numpy 필요 (pip install -r requirements-snapshot.txt).
+
+실행 예:
+  python benchmarks/bench_active_snapshot.py --notams 10000 100000
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_crawler_api import NOTAMCrawlerAPI, normalize_json_row  # noqa: E402
+from notam_db import find_active_notams, get_connection_manager  # noqa: E402
+from notam_mock_server import MockDataset  # noqa: E402
+from notam_record import NOTAMRecord  # noqa: E402
+from notam_snapshot import EARTH_RADIUS_NM, NOTAMSnapshot  # noqa: E402
+
+# 인천공항 ARP
+RKSI = (37.4692, 126.4505)
+
+QUERIES = (
+    ('RKSI, FL100 아래, 10 NM', dict(location='RKSI', ceiling=100, near=RKSI + (10,))),
+    ('전체, FL100 아래, 30 NM', dict(ceiling=100, near=RKSI + (30,))),
+    ('전체 유효', dict()),
+)
+
+
+def sql_query(conn, now, location=None, ceiling=None, near=None):
+    """현재 방식: SQL 범위 조회 후 parsed_data를 읽어 파이썬에서 고도/거리 필터"""
+    result = []
+    for row in find_active_notams(conn, now, now, location=location):
+        parsed = json.loads(row['parsed_data']) if row['parsed_data'] else {}
+        if ceiling is not None and parsed.get('lower', 0) > ceiling:
+            continue
+        if near is not None:
+            if parsed.get('lat') is None:
+                continue
+            lat0, lon0, lat1, lon1 = map(math.radians, (near[0], near[1], parsed['lat'], parsed['lon']))
+            a = (math.sin((lat1 - lat0) / 2) ** 2
+                 + math.cos(lat0) * math.cos(lat1) * math.sin((lon1 - lon0) / 2) ** 2)
+            if 2 * EARTH_RADIUS_NM * math.asin(math.sqrt(a)) > near[2] + (parsed.get('radius') or 0):
+                continue
+        result.append(row['notam_no'])
+    return result
+
+
+def best_ms(fn, repeat: int) -> float:
+    """repeat회 중 최소 시간 (ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(count: int, directory, repeat: int):
+    notams = [normalize_json_row(row) for row in MockDataset(count).rows]
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        db_name = os.path.join(tmp, 'bench.db')
+        crawler = NOTAMCrawlerAPI(db_name=db_name)
+        crawler.save_to_database(notams, 'domestic', 'ts')
+        conn = get_connection_manager(db_name).get()
+        now = datetime.now(timezone.utc)
+
+        started = time.perf_counter()
+        snapshot = NOTAMSnapshot.load(conn, now=now)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        rows = []
+        for label, query in QUERIES:
+            expected = sorted(sql_query(conn, now, **query))
+            found = sorted(snapshot.query(at=now, **query))
+            assert expected == found, label
+            sql_ms = best_ms(lambda: sql_query(conn, now, **query), max(1, repeat // 10))
+            snapshot_ms = best_ms(lambda: snapshot.query(at=now, **query), repeat)
+            rows.append((label, len(found), sql_ms, snapshot_ms))
+
+        # 변경 1%: 절반은 본문 수정, 절반은 삭제
+        changed = max(2, count // 100)
+        updated = [{'notam_no': n['notam_no'],
+                    'current': NOTAMRecord.from_mapping({**n.to_dict(), 'full_text': n['full_text'] + ' REV'})}
+                   for n in notams[:changed // 2]]
+        changes = {'new': [], 'updated': updated, 'deleted': notams[changed // 2:changed], 'unchanged': 0}
+        started = time.perf_counter()
+        snapshot.apply_changes(changes, 'domestic', now=now)
+        apply_ms = (time.perf_counter() - started) * 1000
+
+        crawler.close()
+        get_connection_manager(db_name).close()
+
+    return len(snapshot), load_ms, apply_ms, changed, rows
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='유효 NOTAM 스냅샷 조회 벤치마크')
+    parser.add_argument('--notams', type=int, nargs='+', default=[10000, 100000], help='NOTAM 수')
+    parser.add_argument('--repeat', type=int, default=50, help='스냅샷 조회 반복 횟수 (SQL은 1/10)')
+    parser.add_argument('--dir', help='임시 DB 위치')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    for count in args.notams:
+        active, load_ms, apply_ms, changed, rows = run(count, args.dir, args.repeat)
+        print(f"NOTAM {count}개 (스냅샷 {active}개): 로드 {load_ms:.0f} ms, 변경 {changed}개 증분 갱신 {apply_ms:.1f} ms")
+        print(f"  {'조회':<22} {'결과':>7} {'SQL(ms)':>9} {'스냅샷(ms)':>11} {'속도':>8}")
+        for label, found, sql_ms, snapshot_ms in rows:
+            print(f"  {label:<22} {found:>7} {sql_ms:>9.2f} {snapshot_ms:>11.3f} {sql_ms / snapshot_ms:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+변경 감지 벤치마크
+기존 방식 (소스 전체 SELECT * + 8개 필드 비교) vs 내용 해시 기반 배치 조회 (NOTAMChangeDetector.detect_changes)
+
+배치 크기는 고정하고 notam_records에 쌓인 이력 크기를 늘려 시간/메모리 증가를 비교한다.
+이력은 다른 데이터 소스에 두어 삭제 판정 결과 크기가 두 방식에 같은 영향을 주지 않도록 한다.
+
+실행 예:
+  python benchmarks/bench_change_detect.py --batch 2000 --history 10000 100000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_change_detector import NOTAMChangeDetector  # noqa: E402
+from notam_crawler_api import NOTAMCrawlerAPI  # noqa: E402
+from notam_db import get_connection_manager  # noqa: E402
+
+
+def make_notam(i: int, revision: str = '') -> dict:
+    """합성 NOTAM"""
+    return {
+        'notam_no': f'A{i:07d}/26',
+        'notam_type': 'A',
+        'issue_time': f'2610{i % 28 + 1:02d}{i % 24:02d}{i % 60:02d}',
+        'location': ('RKSI', 'RKSS', 'RKPC', 'RKPK')[i % 4],
+        'qcode': 'QMRLC',
+        'start_time': '2610170000',
+        'end_time': '2611170000',
+        'full_text': f'Q) RKRR/QMRLC/IV/NBO/A /000/999/3728N12626E005 E) RWY {i % 40} CLSD{revision}',
+        'full_text_detail': ''
+    }
+
+
+def legacy_detect(detector: NOTAMChangeDetector, current_notams, data_source: str) -> dict:
+    """기존 detect_changes 알고리즘"""
+    previous = detector.get_previous_notams(data_source)
+    current = {n['notam_no']: n for n in current_notams}
+    changes = {'new': [], 'updated': [], 'deleted': [], 'unchanged': 0}
+    for notam_no, notam in current.items():
+        if notam_no not in previous:
+            changes['new'].append(notam)
+            continue
+        details = detector.compare_notams(previous[notam_no], notam)
+        if details:
+            changes['updated'].append({'notam_no': notam_no, 'changes': details})
+        else:
+            changes['unchanged'] += 1
+    changes['deleted'] = [previous[n] for n in set(previous) - set(current)]
+    return changes
+
+
+def measure(fn):
+    """실행 시간과 Python 힙 최대 사용량"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(history: int, batch: int, directory=None):
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        db_name = os.path.join(tmp, 'bench.db')
+        crawler = NOTAMCrawlerAPI(db_name=db_name)
+        crawler.save_to_database([make_notam(i) for i in range(batch)], 'domestic', 'ts')
+        crawler.save_to_database([make_notam(batch + i) for i in range(history)], 'international', 'ts')
+
+        # 2% 변경, 1% 신규, 1% 삭제
+        current = [make_notam(i, ' REV' if i % 50 == 0 else '') for i in range(batch // 100, batch)]
+        current += [make_notam(batch + history + i) for i in range(batch // 100)]
+
+        detector = NOTAMChangeDetector(db_name=db_name)
+        legacy, legacy_time, legacy_peak = measure(lambda: legacy_detect(detector, current, 'domestic'))
+        hashed, hashed_time, hashed_peak = measure(lambda: detector.detect_changes(current, 'domestic'))
+
+        assert len(legacy['updated']) == len(hashed['updated'])
+        assert len(legacy['new']) == len(hashed['new'])
+        assert len(legacy['deleted']) == len(hashed['deleted'])
+
+        crawler.close()
+        get_connection_manager(db_name).close()
+
+    return legacy_time, legacy_peak, hashed_time, hashed_peak
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='변경 감지 벤치마크')
+    parser.add_argument('--batch', type=int, default=2000, help='현재 배치 NOTAM 수')
+    parser.add_argument('--history', type=int, nargs='+', default=[0, 10000, 100000],
+                        help='다른 소스에 쌓인 이력 NOTAM 수')
+    parser.add_argument('--dir', help='임시 DB 위치')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"배치 {args.batch}개 (변경 2%, 신규 1%, 삭제 1%)")
+    print(f"{'이력':>8} {'기존(ms)':>9} {'기존 힙(MB)':>11} {'해시(ms)':>9} {'해시 힙(MB)':>11} {'속도':>6}")
+    for history in args.history:
+        legacy_time, legacy_peak, hashed_time, hashed_peak = run(history, args.batch, args.dir)
+        print(f"{history:>8} {legacy_time * 1000:>9.1f} {legacy_peak / 1e6:>11.2f} "
+              f"{hashed_time * 1000:>9.1f} {hashed_peak / 1e6:>11.2f} {legacy_time / hashed_time:>5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
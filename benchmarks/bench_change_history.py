@@ -0,0 +1,119 @@
+"""
+변경 이력 페이지 조회 벤치마크
+기존 방식 (인덱스 없음, ORDER BY timestamp DESC LIMIT/OFFSET, 행마다 JSON 파싱)
+vs 키셋 페이지네이션 (필터별 인덱스, (timestamp, id) 커서, change_details 지연 복원)
+
+--pages 페이지를 차례로 넘기며 첫 페이지와 마지막 페이지 조회 시간을 비교한다.
+
+실행 예:
+  python benchmarks/bench_change_history.py --history 100000 1000000 --pages 50
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_change_detector import NOTAMChangeDetector  # noqa: E402
+from notam_db import get_connection_manager  # noqa: E402
+
+LOCATIONS = ('RKSI', 'RKSS', 'RKPC', 'RKPK', 'RKTN', 'RKJJ')
+TYPES = ('NEW', 'UPDATE', 'DELETE')
+
+
+def fill_history(detector: NOTAMChangeDetector, history: int):
+    """합성 변경 로그 적재 (기존 JSON 형식, 90일 분포)"""
+    now = datetime.now()
+    span = timedelta(days=90)
+    details = json.dumps({'full_text': {'previous': 'RWY 15L/33R CLSD DUE TO MAINT',
+                                        'current': 'RWY 15L/33R CLSD DUE TO MAINT 2200-0600'}})
+    rows = [((now - span * (i / history)).isoformat(), f'A{i % 5000:04d}/26', LOCATIONS[i % len(LOCATIONS)],
+             'domestic', TYPES[i % 3], details, None) for i in range(history)]
+    conn = detector.conn
+    conn.executemany('''
+        INSERT INTO change_logs (timestamp, notam_no, location, data_source, change_type,
+                                 change_details, crawl_batch_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+
+
+def legacy_page(detector: NOTAMChangeDetector, location: str, limit: int, offset: int) -> list:
+    """기존 get_change_history 쿼리에 OFFSET을 더한 페이지 조회"""
+    cursor = detector._cursor()
+    cursor.execute('''
+        SELECT * FROM change_logs NOT INDEXED WHERE 1=1 AND location = ?
+        ORDER BY timestamp DESC LIMIT ? OFFSET ?
+    ''', (location, limit, offset))
+    results = []
+    for row in cursor.fetchall():
+        result = dict(row)
+        result['change_details'] = json.loads(result['change_details'])
+        results.append(result)
+    return results
+
+
+def walk(fetch_page, pages: int):
+    """페이지를 차례로 넘기며 (첫 페이지 시간, 마지막 페이지 시간, 전체 시간)"""
+    timings = []
+    state = None
+    for _ in range(pages):
+        started = time.perf_counter()
+        state = fetch_page(state)
+        timings.append(time.perf_counter() - started)
+    return timings[0], timings[-1], sum(timings)
+
+
+def run(history: int, args):
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db_name = os.path.join(tmp, 'bench.db')
+        detector = NOTAMChangeDetector(db_name=db_name)
+        fill_history(detector, history)
+        detector.conn.execute('ANALYZE')
+
+        def legacy_fetch(offset):
+            offset = offset or 0
+            legacy_page(detector, 'RKSI', args.page_size, offset)
+            return offset + args.page_size
+
+        def keyset_fetch(cursor):
+            page = detector.get_change_history_page(location='RKSI', limit=args.page_size, cursor=cursor)
+            return page['next_cursor']
+
+        legacy = walk(legacy_fetch, args.pages)
+        keyset = walk(keyset_fetch, args.pages)
+
+        detector.close()
+        get_connection_manager(db_name).close()
+
+    return legacy, keyset
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='변경 이력 페이지 조회 벤치마크')
+    parser.add_argument('--history', type=int, nargs='+', default=[100000, 1000000], help='change_logs 행 수')
+    parser.add_argument('--pages', type=int, default=50, help='넘길 페이지 수')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--dir', help='임시 DB 위치')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"location=RKSI, 페이지 {args.page_size}행 x {args.pages}페이지")
+    print(f"{'이력':>9} {'기존 첫(ms)':>11} {'기존 끝(ms)':>11} {'기존 합(ms)':>11} "
+          f"{'키셋 첫(ms)':>11} {'키셋 끝(ms)':>11} {'키셋 합(ms)':>11}")
+    for history in args.history:
+        legacy, keyset = run(history, args)
+        print(f"{history:>9} {legacy[0] * 1000:>11.2f} {legacy[1] * 1000:>11.2f} {legacy[2] * 1000:>11.1f} "
+              f"{keyset[0] * 1000:>11.2f} {keyset[1] * 1000:>11.2f} {keyset[2] * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+변경 로그 기록 처리량 벤치마크 (events/s)
+기존 방식 (이벤트마다 CREATE TABLE IF NOT EXISTS + INSERT + commit)
+vs ChangeLogWriter (크롤링 1회 이벤트를 단일 트랜잭션 executemany, 선택적으로 백그라운드 스레드)
+
+백그라운드 모드는 process_changes() 호출 측 대기 시간과 flush까지의 전체 시간을 따로 보고한다.
+이벤트당 저장 바이트는 change_details + 본문 저장소(notam_bodies) 기준 (기존 JSON vs 압축 인코딩).
+측정 전에 파이프라인 NEW -> DELETE 한 쌍이 본문을 하나만 저장하는지 확인한다.
+
+실행 예:
+  python benchmarks/bench_change_log.py --events 1000 10000
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_change_detector import NOTAMChangeDetector  # noqa: E402
+from notam_crawler_api import NOTAMCrawlerAPI  # noqa: E402
+from notam_db import get_connection_manager  # noqa: E402
+from notam_record import NOTAMRecord  # noqa: E402
+
+CHANGE_LOGS_DDL = '''
+    CREATE TABLE IF NOT EXISTS change_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        notam_no TEXT,
+        location TEXT,
+        data_source TEXT,
+        change_type TEXT,
+        change_details TEXT,
+        crawl_batch_id INTEGER
+    )
+'''
+
+
+def make_notam(i: int) -> dict:
+    """합성 NOTAM"""
+    return {
+        'notam_no': f'A{i:07d}/26',
+        'notam_type': 'A',
+        'issue_time': f'2610{i % 28 + 1:02d}{i % 24:02d}{i % 60:02d}',
+        'location': ('RKSI', 'RKSS', 'RKPC', 'RKPK')[i % 4],
+        'qcode': 'QMRLC',
+        'start_time': '2610170000',
+        'end_time': '2611170000',
+        'full_text': (f'Q) RKRR/QMRLC/IV/NBO/A /000/999/3728N12626E005 A) RKSI B) 2610170000 '
+                      f'C) 2611170000 E) RWY {i % 40} CLSD DUE TO PAVEMENT MAINT. '
+                      f'TWY A{i % 9} BTN TWY B AND C NOT AVBL. ACFT SHALL USE TWY D FOR TAXI.'),
+        'full_text_detail': f'활주로 {i % 40} 포장 보수 공사로 폐쇄. 유도로 A{i % 9} 사용 불가, 유도로 D 이용.'
+    }
+
+
+def make_changes(count: int) -> dict:
+    """신규/업데이트/삭제가 1:1:1인 detect_changes() 형식 변경사항"""
+    changes = {'new': [], 'updated': [], 'deleted': [], 'unchanged': 0}
+    for i in range(count):
+        notam = make_notam(i)
+        if i % 3 == 0:
+            changes['new'].append(notam)
+        elif i % 3 == 1:
+            changes['updated'].append({
+                'notam_no': notam['notam_no'],
+                'previous': notam,
+                'current': notam,
+                'changes': {'full_text': {'previous': notam['full_text'],
+                                          'current': notam['full_text'].replace('CLSD', 'CLSD 2200-0600')}}
+            })
+        else:
+            changes['deleted'].append(notam)
+    return changes
+
+
+def legacy_process(detector: NOTAMChangeDetector, changes: dict, data_source: str) -> None:
+    """기존 process_changes: 이벤트마다 DDL + INSERT + commit"""
+    events = [('NEW', n, {'full_data': n}) for n in changes['new']]
+    events += [('UPDATE', u['current'], u['changes']) for u in changes['updated']]
+    events += [('DELETE', n, {'full_data': n}) for n in changes['deleted']]
+    conn = detector.conn
+    for change_type, notam, details in events:
+        cursor = conn.cursor()
+        cursor.execute(CHANGE_LOGS_DDL)
+        cursor.execute(
+            'INSERT INTO change_logs (timestamp, notam_no, location, data_source, change_type, '
+            'change_details, crawl_batch_id) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (datetime.now().isoformat(), notam['notam_no'], notam.get('location', 'UNKNOWN'),
+             data_source, change_type, json.dumps(details, ensure_ascii=False), None))
+        conn.commit()
+
+
+def check_body_dedup(directory=None) -> int:
+    """
+    파이프라인 NEW -> DELETE 본문 공유 확인
+
+    DELETE의 full_data는 저장된 행 전체(id, crawl_timestamp, parsed_data, epoch 컬럼 등)이므로
+    NOTAM 필드만 본문으로 저장해야 NEW 본문과 같아진다.
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        db_name = os.path.join(tmp, 'dedup.db')
+        NOTAMCrawlerAPI(db_name=db_name).close()
+        detector = NOTAMChangeDetector(db_name=db_name)
+        notams = [NOTAMRecord.from_mapping(make_notam(i)) for i in range(2)]
+        detector.apply_batch(notams, 'domestic', 't1')
+        changes = detector.apply_batch(notams[:1], 'domestic', 't2')
+        assert [n['notam_no'] for n in changes['deleted']] == [notams[1]['notam_no']]
+        assert 'crawl_timestamp' in changes['deleted'][0]
+        detector.flush_change_logs()
+
+        bodies = detector.conn.execute('SELECT COUNT(*) FROM notam_bodies').fetchone()[0]
+        assert bodies == 2, f'NEW/DELETE 본문이 공유되지 않음: 본문 {bodies}개 (NOTAM 2개)'
+        deleted = detector.get_change_history(notam_no=notams[1]['notam_no'], change_type='DELETE')
+        assert deleted[0]['change_details']['full_data'] == notams[1].to_dict()
+
+        detector.close()
+        get_connection_manager(db_name).close()
+    return bodies
+
+
+def run(count: int, directory=None):
+    """세 방식의 (호출 대기 시간, 전체 시간, 이벤트당 저장 바이트)"""
+    changes = make_changes(count)
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        for name in ('legacy', 'batched', 'background'):
+            db_name = os.path.join(tmp, f'{name}.db')
+            detector = NOTAMChangeDetector(db_name=db_name, background_writes=(name == 'background'))
+
+            started = time.perf_counter()
+            if name == 'legacy':
+                legacy_process(detector, changes, 'domestic')
+            else:
+                detector.process_changes(changes, 'domestic')
+            call_time = time.perf_counter() - started
+            detector.flush_change_logs()
+            total_time = time.perf_counter() - started
+
+            saved, details_bytes = detector.conn.execute(
+                'SELECT COUNT(*), SUM(LENGTH(CAST(change_details AS BLOB))) FROM change_logs').fetchone()
+            assert saved == count, (name, saved)
+            body_bytes = detector.conn.execute(
+                'SELECT COALESCE(SUM(LENGTH(CAST(body AS BLOB))), 0) FROM notam_bodies').fetchone()[0]
+
+            detector.close()
+            get_connection_manager(db_name).close()
+            results[name] = (call_time, total_time, (details_bytes + body_bytes) / count)
+    return results
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='변경 로그 기록 처리량 벤치마크')
+    parser.add_argument('--events', type=int, nargs='+', default=[1000, 10000],
+                        help='크롤링 1회 변경 이벤트 수')
+    parser.add_argument('--dir', help='임시 DB 위치')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"검증: NOTAM 2개의 NEW + DELETE 1건 -> 본문 {check_body_dedup(args.dir)}개")
+    print(f"{'이벤트':>8} {'기존(ev/s)':>11} {'일괄(ev/s)':>11} {'백그라운드(ev/s)':>16} "
+          f"{'백그라운드 호출(ms)':>18} {'속도':>6} {'기존 B/ev':>10} {'압축 B/ev':>10}")
+    for count in args.events:
+        results = run(count, args.dir)
+        legacy_total = results['legacy'][1]
+        batched_total = results['batched'][1]
+        call_time, background_total, _ = results['background']
+        print(f"{count:>8} {count / legacy_total:>11.0f} {count / batched_total:>11.0f} "
+              f"{count / background_total:>16.0f} {call_time * 1000:>18.1f} "
+              f"{legacy_total / batched_total:>5.1f}x {results['legacy'][2]:>10.0f} {results['batched'][2]:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+변경 통계 조회 벤치마크
+기존 방식 (change_logs 전체 스캔 GROUP BY change_type, timestamp 문자열 필터)
+vs 시간별 집계 (change_stats_hourly 범위 조회, NOTAMChangeDetector.get_change_stats)
+
+이력은 --days 일에 걸쳐 고르게 쌓고 최근 --hours 시간 통계를 국내/국제 각각 조회한다.
+
+실행 예:
+  python benchmarks/bench_change_stats.py --history 100000 1000000 --hours 24
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_change_detector import NOTAMChangeDetector  # noqa: E402
+from notam_db import get_connection_manager  # noqa: E402
+
+SOURCES = ('domestic', 'international')
+TYPES = ('NEW', 'UPDATE', 'DELETE')
+LOCATIONS = ('RKSI', 'RKSS', 'RKPC', 'RKPK', 'RKTN', 'RKJJ')
+
+
+def fill_history(detector: NOTAMChangeDetector, history: int, days: int):
+    """합성 변경 로그 적재 후 집계 재구성"""
+    now = datetime.now()
+    span = timedelta(days=days)
+    rows = [((now - span * (i / history)).isoformat(), f'A{i:07d}/26', LOCATIONS[i % len(LOCATIONS)],
+             SOURCES[i % 2], TYPES[i % 3], '{"body":"0"}', None, 'c1') for i in range(history)]
+    conn = detector.conn
+    conn.executemany('''
+        INSERT INTO change_logs (timestamp, notam_no, location, data_source, change_type,
+                                 change_details, crawl_batch_id, encoding)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    detector.rebuild_change_stats()
+
+
+def legacy_stats(detector: NOTAMChangeDetector, data_source: str, hours: int) -> dict:
+    """기존 get_change_stats 쿼리"""
+    cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
+    cursor = detector.conn.execute('''
+        SELECT change_type, COUNT(*) FROM change_logs
+        WHERE data_source = ? AND timestamp >= ?
+        GROUP BY change_type
+    ''', (data_source, cutoff_time))
+    return dict(cursor.fetchall())
+
+
+def timed(fn, repeat: int):
+    """평균 실행 시간 (초)과 마지막 결과"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def run(history: int, args):
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db_name = os.path.join(tmp, 'bench.db')
+        detector = NOTAMChangeDetector(db_name=db_name)
+        fill_history(detector, history, args.days)
+
+        legacy_time, legacy = timed(
+            lambda: [legacy_stats(detector, source, args.hours) for source in SOURCES], args.repeat)
+        rollup_time, rollup = timed(
+            lambda: [detector.get_change_stats(source, args.hours) for source in SOURCES], args.repeat)
+        rollup_rows = detector.conn.execute('SELECT COUNT(*) FROM change_stats_hourly').fetchone()[0]
+
+        detector.close()
+        get_connection_manager(db_name).close()
+
+    # 집계는 시간 단위이므로 구간 시작 시간의 앞부분만큼 더 셀 수 있다
+    legacy_total = sum(sum(stats.values()) for stats in legacy)
+    rollup_total = sum(sum(stats.values()) for stats in rollup)
+    return legacy_time, rollup_time, legacy_total, rollup_total, rollup_rows
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='변경 통계 조회 벤치마크')
+    parser.add_argument('--history', type=int, nargs='+', default=[100000, 1000000], help='change_logs 행 수')
+    parser.add_argument('--days', type=int, default=90, help='이력 분포 기간 (일)')
+    parser.add_argument('--hours', type=int, default=24, help='통계 구간 (시간)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--dir', help='임시 DB 위치')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"최근 {args.hours}시간 국내/국제 통계 조회 ({args.repeat}회 평균)")
+    print(f"{'이력':>9} {'집계 행':>8} {'기존(ms)':>9} {'집계(ms)':>9} {'속도':>8} {'기존 건수':>9} {'집계 건수':>9}")
+    for history in args.history:
+        legacy_time, rollup_time, legacy_total, rollup_total, rollup_rows = run(history, args)
+        print(f"{history:>9} {rollup_rows:>8} {legacy_time * 1000:>9.2f} {rollup_time * 1000:>9.2f} "
+              f"{legacy_time / rollup_time:>7.0f}x {legacy_total:>9} {rollup_total:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+로컬 AIM 대역 서버 기반 크롤링 처리량 벤치마크
+main()이 출력하는 3초 성능 목표 회귀 검사 겸용
+
+실행 예:
+  python benchmarks/bench_crawl_mock.py --scale 1 10 100
+  python benchmarks/bench_crawl_mock.py --scale 1 --check-target   # 3초 초과 시 종료 코드 1
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_crawler_api import NOTAMCrawlerAPI  # noqa: E402
+from notam_mock_server import MockAIMServer, MockConfig  # noqa: E402
+
+TARGET_SECONDS = 3.0
+
+
+def run_scale(scale: int, args) -> dict:
+    """배율 하나에 대해 국내 + 국제 크롤링 실행"""
+    config = MockConfig(
+        size=args.base_size * scale,
+        span_hours=args.hours,
+        latency_dist=args.latency_dist,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.server_rate_limit)
+    server = MockAIMServer(config)
+    base_url = server.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = NOTAMCrawlerAPI(
+            db_name=os.path.join(tmp, 'bench.db'),
+            base_url=base_url,
+            max_concurrency=args.concurrency,
+            rate_limit=args.rate_limit,
+            max_rate=max(args.rate_limit, args.max_rate))
+        try:
+            started = time.perf_counter()
+            results = {
+                source: crawler.crawl_notam_api(source, hours_back=args.hours)
+                for source in ('domestic', 'international')
+            } if args.sequential else crawler.test_crawl()
+            wall_time = time.perf_counter() - started
+        finally:
+            crawler.close()
+
+    server.stop()
+
+    records = sum(results[s].get('records_found', 0) for s in ('domestic', 'international'))
+    pages = sum(len(results[s].get('page_timings', [])) for s in ('domestic', 'international'))
+    failed = [s for s in ('domestic', 'international') if results[s]['status'] != 'SUCCESS']
+
+    return {
+        'scale': scale,
+        'records': records,
+        'pages': pages,
+        'wall_time': wall_time,
+        'failed': failed,
+        'server': server.get_stats()
+    }
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='대역 서버 크롤링 처리량 벤치마크')
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10, 100],
+                        help='기준 데이터셋 대비 배율')
+    parser.add_argument('--base-size', type=int, default=200,
+                        help='배율 1의 소스별 NOTAM 수 (검색 구간 안)')
+    parser.add_argument('--hours', type=int, default=2, help='검색 구간 및 데이터셋 분포 (시간)')
+    parser.add_argument('--latency-dist', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+    parser.add_argument('--latency-ms', type=float, default=80.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=40.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--server-rate-limit', type=float, default=0.0)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--rate-limit', type=float, default=5.0)
+    parser.add_argument('--max-rate', type=float, default=20.0)
+    parser.add_argument('--sequential', action='store_true', help='국내/국제 순차 실행')
+    parser.add_argument('--check-target', action='store_true',
+                        help=f'배율 1이 {TARGET_SECONDS:.0f}초를 넘으면 종료 코드 1')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"{'배율':>6} {'NOTAM':>8} {'페이지':>6} {'시간(초)':>9} {'NOTAM/초':>10}  서버 요청")
+    exit_code = 0
+    for scale in args.scale:
+        result = run_scale(scale, args)
+        rate = result['records'] / result['wall_time'] if result['wall_time'] else 0
+        server = result['server']
+        print(f"{scale:>5}x {result['records']:>8} {result['pages']:>6} {result['wall_time']:>9.2f} "
+              f"{rate:>10.0f}  {server['requests']} (429: {server['throttled']}, 500: {server['errors']})")
+
+        if result['failed']:
+            print(f"  [FAIL] 실패한 소스: {', '.join(result['failed'])}")
+            exit_code = 1
+        if args.check_target and scale == 1 and result['wall_time'] > TARGET_SECONDS:
+            print(f"  [FAIL] 성능 목표 초과 (목표: {TARGET_SECONDS:.0f}초, 실제: {result['wall_time']:.2f}초)")
+            exit_code = 1
+
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
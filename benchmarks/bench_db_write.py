@@ -0,0 +1,146 @@
+"""
+notam_records 쓰기 경로 벤치마크
+기존 방식 (행마다 INSERT OR REPLACE, 기본 pragma) vs notam_db 대량 upsert
+(executemany + 단일 트랜잭션 + WAL, 내용 해시가 같은 행은 쓰기 생략)
+
+실행 예:
+  python benchmarks/bench_db_write.py --rows 1000 10000 100000
+  python benchmarks/bench_db_write.py --dir .   # 실제 디스크 (fsync 비용 포함)
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_db import (build_record_rows, bulk_upsert_notams, connect,  # noqa: E402
+                      ensure_content_hash_column, ensure_epoch_columns, ensure_last_seen_column,
+                      ensure_parsed_data_column)
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS notam_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        crawl_timestamp TEXT,
+        data_source TEXT,
+        notam_type TEXT,
+        issue_time TEXT,
+        location TEXT,
+        notam_no TEXT UNIQUE,
+        qcode TEXT,
+        start_time TEXT,
+        end_time TEXT,
+        full_text TEXT,
+        full_text_detail TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_notam_records_location ON notam_records(location)',
+    'CREATE INDEX IF NOT EXISTS idx_notam_records_issue_time ON notam_records(issue_time)',
+    'CREATE INDEX IF NOT EXISTS idx_notam_records_end_time ON notam_records(end_time)',
+    'CREATE INDEX IF NOT EXISTS idx_notam_records_qcode ON notam_records(qcode)'
+)
+
+
+def make_notams(count: int):
+    """합성 NOTAM"""
+    return [{
+        'notam_type': 'A',
+        'issue_time': f'2610{i % 28 + 1:02d}{i % 24:02d}{i % 60:02d}',
+        'location': ('RKSI', 'RKSS', 'RKPC', 'RKPK')[i % 4],
+        'notam_no': f'A{i:06d}/26',
+        'qcode': 'QMRLC',
+        'start_time': '2610170000',
+        'end_time': 'PERM' if i % 20 == 0 else '2611170000',
+        'full_text': f'Q) RKRR/QMRLC/IV/NBO/A /000/999/3728N12626E005 A) RKSI E) RWY {i % 40} CLSD',
+        'full_text_detail': ''
+    } for i in range(count)]
+
+
+def create_db(path: str):
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    for sql in INDEXES:
+        conn.execute(sql)
+    ensure_content_hash_column(conn)
+    ensure_last_seen_column(conn)
+    ensure_parsed_data_column(conn)
+    ensure_epoch_columns(conn)
+    conn.commit()
+    conn.close()
+
+
+def legacy_save(path: str, notams, crawl_timestamp: str) -> int:
+    """기존 save_to_database와 같은 방식"""
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    saved = 0
+    for notam in notams:
+        cursor.execute('''
+            INSERT OR REPLACE INTO notam_records
+            (crawl_timestamp, data_source, notam_type, issue_time, location,
+             notam_no, qcode, start_time, end_time, full_text, full_text_detail)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (crawl_timestamp, 'domestic', notam['notam_type'], notam['issue_time'],
+              notam['location'], notam['notam_no'], notam['qcode'], notam['start_time'],
+              notam['end_time'], notam['full_text'], notam['full_text_detail']))
+        if cursor.rowcount > 0:
+            saved += 1
+    conn.commit()
+    conn.close()
+    return saved
+
+
+def bulk_save(path: str, notams, crawl_timestamp: str) -> int:
+    """notam_db 대량 upsert"""
+    rows = build_record_rows(notams, 'domestic', crawl_timestamp)
+    conn = connect(path)
+    try:
+        return bulk_upsert_notams(conn, rows)
+    finally:
+        conn.close()
+
+
+def measure(save, notams, directory=None) -> tuple:
+    """빈 DB에 첫 저장 + 같은 행 재저장 (변경 없는 다음 크롤링 주기) 시간"""
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        create_db(path)
+
+        started = time.perf_counter()
+        save(path, notams, '2026-10-17T00:00:00')
+        insert_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        save(path, notams, '2026-10-17T00:05:00')
+        replace_time = time.perf_counter() - started
+
+    return insert_time, replace_time
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='notam_records 쓰기 경로 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--dir', help='임시 DB 위치 (tmpfs가 아닌 실제 디스크에서 측정할 때)')
+    args = parser.parse_args()
+
+    print(f"{'행 수':>8} {'방식':<8} {'신규(초)':>9} {'재저장(초)':>11} {'행/초':>10}")
+    for count in args.rows:
+        notams = make_notams(count)
+        results = {}
+        for name, save in (('legacy', legacy_save), ('bulk', bulk_save)):
+            insert_time, replace_time = measure(save, notams, args.dir)
+            results[name] = insert_time + replace_time
+            print(f"{count:>8} {name:<8} {insert_time:>9.3f} {replace_time:>11.3f} "
+                  f"{count * 2 / (insert_time + replace_time):>10.0f}")
+        print(f"{'':>8} 속도 향상: {results['legacy'] / results['bulk']:.2f}배")
+
+
+if __name__ == '__main__':
+    main()
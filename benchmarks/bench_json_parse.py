@@ -0,0 +1,139 @@
+"""
+searchAllNotam.do JSON 파싱 마이크로 벤치마크
+기존 경로 (response.json() + _parse_json_response) vs 단일 패스 스트리밍 (IBSheetJSONStream)
+
+측정 전에 형식 변형 픽스처 (문자열이 아닌 셀, 행 키 여러 개, BOM 등) 에서 스트리밍 결과가
+기존 경로와 같은지 확인한다.
+
+실행: python benchmarks/bench_json_parse.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_crawler_api import NOTAMCrawlerAPI, IBSheetJSONStream  # noqa: E402
+
+
+def build_page(rows: int) -> bytes:
+    """합성 응답 페이지 생성 (한글 본문 포함)"""
+    items = []
+    for i in range(rows):
+        items.append({
+            'AIS_TYPE': 'A',
+            'ISSUE_TIME': '2604010000',
+            'LOCATION': 'RKSI',
+            'NOTAM_NO': f'A{i % 10000:04d}/{26 + i // 10000}',
+            'QCODE': 'QMRLC',
+            'EFFECTIVESTART': '2604010100',
+            'EFFECTIVEEND': '2604010700',
+            'ECODE': f'RWY 15L/33R CLSD 활주로 점검 {i}',
+            'FULL_TEXT': f'Q) RKRR/QMRLC/IV/NBO/A /000/999/3728N12626E005 A) RKSI B) 2604010100 '
+                         f'C) 2604010700 E) RWY 15L/33R CLSD DUE TO MAINT {i}'
+        })
+    return json.dumps({'Total': rows, 'DATA': items}, ensure_ascii=False).encode('utf-8')
+
+
+def fixtures():
+    """형식 변형 픽스처 (이름, 본문, 기대 NOTAM 번호 목록)"""
+    row = {'AIS_TYPE': 'A', 'ISSUE_TIME': '2604010000', 'LOCATION': 'RKSI', 'NOTAM_NO': 'A0001/26',
+           'QCODE': 'QMRLC', 'EFFECTIVESTART': '2604010100', 'EFFECTIVEEND': '2604010700',
+           'ECODE': 'RWY CLSD', 'FULL_TEXT': 'E) RWY CLSD'}
+    numeric = {**row, 'NOTAM_NO': 1234, 'ISSUE_TIME': 2604010000, 'QCODE': None, 'LOCATION': 0}
+    blank = {**row, 'NOTAM_NO': '  '}
+    other = {**row, 'NOTAM_NO': 'B0001/26'}
+
+    def page(**keys):
+        return json.dumps({'Total': 3, **keys})
+
+    yield '숫자 / null 셀', page(DATA=[row, numeric, blank]), ['A0001/26', '1234']
+    yield '낮은 순위 키가 먼저', page(rows=[other], DATA=[row]), ['A0001/26']
+    yield '최우선 키가 먼저', page(DATA=[row], items=[other]), ['A0001/26']
+    yield '빈 최우선 키', page(DATA=[], items=[other]), ['B0001/26']
+    yield '순위만 다른 두 키', page(records=[row], data=[other]), ['B0001/26']
+    yield '번호 없는 행만 있는 키', page(items=[other], data=[blank]), []
+    yield '배열이 아닌 행 키', page(records=[row], data={'x': 1}), []
+    yield 'BOM', '\ufeff' + page(DATA=[row]), ['A0001/26']
+
+
+def validate(crawler: NOTAMCrawlerAPI) -> int:
+    """픽스처에서 parse_response_body / str 입력 스트림 결과가 기존 경로와 같은지 확인"""
+    checked = 0
+    for name, body, expected in fixtures():
+        text = body.lstrip('\ufeff')
+        legacy = crawler._parse_json_response(text)
+        notams, total = crawler.parse_response_body(body.encode('utf-8'))
+        assert [n['notam_no'] for n in legacy] == expected, f'기존 경로 기대값 불일치: {name}'
+        assert notams == legacy and total == json.loads(text)['Total'], f'파싱 결과 불일치: {name}'
+        assert all(isinstance(v, str) for n in notams for v in n.values()), f'문자열이 아닌 값: {name}'
+        assert list(IBSheetJSONStream(body)) == legacy, f'str 입력 결과 불일치: {name}'
+        checked += 1
+    return checked
+
+
+def legacy_path(crawler: NOTAMCrawlerAPI, body: bytes):
+    """기존 경로: 전체 디코딩 두 번 + 행 매핑 리스트"""
+    text = body.decode('utf-8')
+    json_data = json.loads(text)
+    notams = crawler._parse_json_response(text)
+    return notams, json_data.get('Total')
+
+
+def streaming_path(crawler: NOTAMCrawlerAPI, body: bytes):
+    """단일 패스 스트리밍 경로"""
+    stream = IBSheetJSONStream(body)
+    notams = list(stream)
+    return notams, stream.total
+
+
+def measure(func, crawler, body, repeat):
+    """최소 실행 시간과 최대 할당 메모리 측정"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(crawler, body)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func(crawler, body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak, result
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='JSON 응답 파싱 벤치마크')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = NOTAMCrawlerAPI(db_name=os.path.join(tmp, 'bench.db'))
+        print(f"검증: 픽스처 {validate(crawler)}건 기존 경로와 결과 일치")
+        body = build_page(args.rows)
+
+        legacy_time, legacy_peak, legacy_result = measure(legacy_path, crawler, body, args.repeat)
+        stream_time, stream_peak, stream_result = measure(streaming_path, crawler, body, args.repeat)
+        crawler.close()
+
+    assert legacy_result == stream_result, '파싱 결과 불일치'
+
+    print(f"페이지: {args.rows}행, {len(body) / 1024:.0f} KiB")
+    print(f"기존 경로    : {legacy_time * 1000:8.1f} ms, 최대 메모리 {legacy_peak / 1024 / 1024:6.1f} MiB")
+    print(f"스트리밍 경로: {stream_time * 1000:8.1f} ms, 최대 메모리 {stream_peak / 1024 / 1024:6.1f} MiB")
+    print(f"속도 비율    : {legacy_time / stream_time:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
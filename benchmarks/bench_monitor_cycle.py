@@ -0,0 +1,178 @@
+"""
+모니터링 주기 DB 처리 시간 벤치마크
+기존 방식 (호출마다 sqlite3.connect + DDL 재실행) vs notam_db.ConnectionManager (스레드별 연결 재사용)
+
+한 주기에 NOTAMMonitor가 수행하는 DB 작업 순서를 그대로 재현한다 (네트워크 제외):
+  워터마크 조회 -> 구간 행 수 -> notam_records 저장 -> crawl_logs 기록
+  -> 현재 NOTAM 조회 -> 이전 NOTAM 조회 -> 변경 로그 저장 (이벤트마다)
+
+실행 예:
+  python benchmarks/bench_monitor_cycle.py --notams 2000 --changes 50 --cycles 20
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_crawler_api import NOTAMCrawlerAPI  # noqa: E402
+from notam_change_detector import NOTAMChangeDetector  # noqa: E402
+from notam_db import build_record_rows, bulk_upsert_notams, connect, get_connection_manager  # noqa: E402
+
+SOURCES = ('domestic', 'international')
+
+CHANGE_LOGS_DDL = '''
+    CREATE TABLE IF NOT EXISTS change_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        notam_no TEXT,
+        location TEXT,
+        data_source TEXT,
+        change_type TEXT,
+        change_details TEXT,
+        crawl_batch_id INTEGER
+    )
+'''
+
+
+def make_notams(source: str, count: int, cycle: int, changes: int):
+    """주기마다 앞쪽 changes개의 본문이 바뀌는 합성 NOTAM"""
+    prefix = 'D' if source == 'domestic' else 'I'
+    return [{
+        'notam_type': 'A',
+        'issue_time': f'2610{i % 28 + 1:02d}{i % 24:02d}{i % 60:02d}',
+        'location': ('RKSI', 'RKSS', 'RKPC', 'RKPK')[i % 4],
+        'notam_no': f'{prefix}{i:06d}/26',
+        'qcode': 'QMRLC',
+        'start_time': '2610170000',
+        'end_time': '2611170000',
+        'full_text': f'RWY {i % 40} CLSD' + (f' REV {cycle}' if i < changes else ''),
+        'full_text_detail': ''
+    } for i in range(count)]
+
+
+def legacy_cycle(db_name: str, batches, changes: int) -> None:
+    """기존 구조: 작업마다 새 연결, 변경 로그마다 CREATE TABLE + commit"""
+    for source, notams in batches:
+        conn = sqlite3.connect(db_name)
+        conn.execute('SELECT status, window_end FROM crawl_logs WHERE data_source = ? '
+                     'ORDER BY id DESC LIMIT 1', (source,)).fetchone()
+        conn.close()
+
+        conn = sqlite3.connect(db_name)
+        conn.execute('SELECT COUNT(*) FROM notam_records WHERE data_source = ? '
+                     'AND issue_time >= ? AND issue_time < ?', (source, '2610010000', '2610170000')).fetchone()
+        conn.close()
+
+        conn = connect(db_name)
+        bulk_upsert_notams(conn, build_record_rows(notams, source, 'ts'))
+        conn.close()
+
+        conn = sqlite3.connect(db_name)
+        conn.execute('INSERT INTO crawl_logs (crawl_timestamp, data_source, status) VALUES (?, ?, ?)',
+                     ('ts', source, 'SUCCESS'))
+        conn.commit()
+        conn.close()
+
+        conn = sqlite3.connect(db_name)
+        conn.row_factory = sqlite3.Row
+        current = [dict(r) for r in conn.execute('SELECT * FROM notam_records WHERE data_source = ?', (source,))]
+        conn.close()
+
+        detector_conn = sqlite3.connect(db_name)
+        detector_conn.row_factory = sqlite3.Row
+        previous = {r['notam_no']: dict(r) for r in
+                    detector_conn.execute('SELECT * FROM notam_records WHERE data_source = ?', (source,))}
+        for notam in current[:changes]:
+            detector_conn.execute(CHANGE_LOGS_DDL)
+            detector_conn.execute(
+                'INSERT INTO change_logs (timestamp, notam_no, location, data_source, change_type, change_details) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ('ts', notam['notam_no'], notam['location'], source, 'UPDATE',
+                 json.dumps(previous.get(notam['notam_no'], {}), ensure_ascii=False)))
+            detector_conn.commit()
+        detector_conn.close()
+
+
+def managed_cycle(db_name: str, batches, changes: int) -> None:
+    """ConnectionManager: 스레드 연결 재사용, DDL은 초기화 때 한 번"""
+    db = get_connection_manager(db_name)
+    for source, notams in batches:
+        conn = db.get()
+        conn.execute('SELECT status, window_end FROM crawl_logs WHERE data_source = ? '
+                     'ORDER BY id DESC LIMIT 1', (source,)).fetchone()
+        conn.execute('SELECT COUNT(*) FROM notam_records WHERE data_source = ? '
+                     'AND issue_time >= ? AND issue_time < ?', (source, '2610010000', '2610170000')).fetchone()
+
+        bulk_upsert_notams(conn, build_record_rows(notams, source, 'ts'))
+
+        conn.execute('INSERT INTO crawl_logs (crawl_timestamp, data_source, status) VALUES (?, ?, ?)',
+                     ('ts', source, 'SUCCESS'))
+        conn.commit()
+
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        current = [dict(r) for r in cursor.execute('SELECT * FROM notam_records WHERE data_source = ?', (source,))]
+
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        previous = {r['notam_no']: dict(r) for r in
+                    cursor.execute('SELECT * FROM notam_records WHERE data_source = ?', (source,))}
+        for notam in current[:changes]:
+            conn.execute(
+                'INSERT INTO change_logs (timestamp, notam_no, location, data_source, change_type, change_details) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ('ts', notam['notam_no'], notam['location'], source, 'UPDATE',
+                 json.dumps(previous.get(notam['notam_no'], {}), ensure_ascii=False)))
+            conn.commit()
+
+
+def run(name: str, cycle_fn, args) -> float:
+    """새 DB에서 주기 반복 후 주기당 평균 시간 (첫 주기 제외)"""
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db_name = os.path.join(tmp, f'{name}.db')
+
+        # 스키마는 실제 코드로 생성
+        NOTAMCrawlerAPI(db_name=db_name).close()
+        NOTAMChangeDetector(db_name=db_name).close()
+
+        timings = []
+        for cycle in range(args.cycles + 1):
+            batches = [(source, make_notams(source, args.notams, cycle, args.changes)) for source in SOURCES]
+            started = time.perf_counter()
+            cycle_fn(db_name, batches, args.changes)
+            timings.append(time.perf_counter() - started)
+
+        get_connection_manager(db_name).close()
+
+    return sum(timings[1:]) / args.cycles
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='모니터링 주기 DB 처리 시간 벤치마크')
+    parser.add_argument('--notams', type=int, default=2000, help='소스별 NOTAM 수')
+    parser.add_argument('--changes', type=int, default=50, help='주기별 변경 NOTAM 수 (소스별)')
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--dir', help='임시 DB 위치')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    legacy = run('legacy', legacy_cycle, args)
+    managed = run('managed', managed_cycle, args)
+
+    print(f"NOTAM {args.notams}개 x {len(SOURCES)}소스, 변경 {args.changes}개/소스, {args.cycles}주기 평균")
+    print(f"  기존 (호출마다 연결):    {legacy * 1000:8.1f} ms/주기")
+    print(f"  ConnectionManager:       {managed * 1000:8.1f} ms/주기")
+    print(f"  속도 향상: {legacy / managed:.2f}배")
+
+
+if __name__ == '__main__':
+    main()
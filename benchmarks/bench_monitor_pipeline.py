@@ -0,0 +1,102 @@
+"""
+모니터 저장 + 변경 감지 벤치마크 (네트워크 제외)
+기존 방식 (save_to_database -> notam_records 전체 재조회 -> detect_changes -> process_changes)
+vs 파이프라인 모드 (NOTAMChangeDetector.apply_batch: 저장 전 비교, 행 + 변경 로그 단일 트랜잭션)
+
+실행 예:
+  python benchmarks/bench_monitor_pipeline.py --notams 2000 --changes 50 --cycles 10
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_change_detector import NOTAMChangeDetector  # noqa: E402
+from notam_crawler_api import NOTAMCrawlerAPI  # noqa: E402
+from notam_db import get_connection_manager  # noqa: E402
+
+
+def make_notams(count: int, cycle: int, changes: int):
+    """주기마다 앞쪽 changes개의 본문이 바뀌는 합성 NOTAM"""
+    return [{
+        'notam_type': 'A',
+        'issue_time': f'2610{i % 28 + 1:02d}{i % 24:02d}{i % 60:02d}',
+        'location': ('RKSI', 'RKSS', 'RKPC', 'RKPK')[i % 4],
+        'notam_no': f'A{i:06d}/26',
+        'qcode': 'QMRLC',
+        'start_time': '2610170000',
+        'end_time': '2611170000',
+        'full_text': f'RWY {i % 40} CLSD' + (f' REV {cycle}' if i < changes else ''),
+        'full_text_detail': ''
+    } for i in range(count)]
+
+
+def legacy_cycle(crawler, detector, notams) -> int:
+    """기존 monitor_single: 저장 후 테이블을 다시 읽어 비교"""
+    crawler.save_to_database(notams, 'domestic', 'ts')
+    cursor = detector.conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    current = [dict(row) for row in cursor.execute(
+        'SELECT * FROM notam_records WHERE data_source = ?', ('domestic',))]
+    changes = detector.detect_changes(current, 'domestic')
+    detector.process_changes(changes, 'domestic')
+    return len(changes['updated'])
+
+
+def pipeline_cycle(crawler, detector, notams) -> int:
+    """파이프라인 모드: 저장 전 비교 후 한 트랜잭션으로 반영"""
+    changes = detector.apply_batch(notams, 'domestic', 'ts')
+    return len(changes['updated'])
+
+
+def run(name: str, cycle_fn, args):
+    """새 DB에서 주기 반복 후 (주기당 평균 시간, 감지한 업데이트 수)"""
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db_name = os.path.join(tmp, f'{name}.db')
+        crawler = NOTAMCrawlerAPI(db_name=db_name)
+        detector = NOTAMChangeDetector(db_name=db_name)
+        crawler.save_to_database(make_notams(args.notams, 0, 0), 'domestic', 'ts')
+
+        timings = []
+        updated = 0
+        for cycle in range(1, args.cycles + 1):
+            notams = make_notams(args.notams, cycle, args.changes)
+            started = time.perf_counter()
+            updated += cycle_fn(crawler, detector, notams)
+            timings.append(time.perf_counter() - started)
+
+        detector.close()
+        crawler.close()
+        get_connection_manager(db_name).close()
+
+    return sum(timings) / len(timings), updated
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='모니터 저장 + 변경 감지 벤치마크')
+    parser.add_argument('--notams', type=int, default=2000, help='배치 NOTAM 수')
+    parser.add_argument('--changes', type=int, default=50, help='주기별 변경 NOTAM 수')
+    parser.add_argument('--cycles', type=int, default=10)
+    parser.add_argument('--dir', help='임시 DB 위치')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    legacy, legacy_updates = run('legacy', legacy_cycle, args)
+    pipeline, pipeline_updates = run('pipeline', pipeline_cycle, args)
+
+    print(f"NOTAM {args.notams}개, 변경 {args.changes}개/주기, {args.cycles}주기 평균")
+    print(f"  기존 (저장 후 재조회):  {legacy * 1000:8.1f} ms/주기, 감지한 업데이트 {legacy_updates}개")
+    print(f"  파이프라인:             {pipeline * 1000:8.1f} ms/주기, 감지한 업데이트 {pipeline_updates}개")
+    print(f"  속도 향상: {legacy / pipeline:.2f}배")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+NOTAM 본문 파서 처리량 벤치마크 (NOTAMs/s)
+임시 정규식 (호출마다 패턴 문자열로 re.search/findall, 메모 없음)
+vs notam_parser (미리 컴파일한 패턴, 첫 파싱) vs notam_parser 메모 적중 (같은 본문 재크롤링)
+
+데이터는 notam_mock_server의 합성 데이터셋 (Q) 행 + A) ~ E) 항목).
+
+실행 예:
+  python benchmarks/bench_notam_parser.py --notams 10000 50000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import notam_parser  # noqa: E402
+from notam_crawler_api import normalize_json_row  # noqa: E402
+from notam_db import build_record_rows  # noqa: E402
+from notam_mock_server import MockDataset  # noqa: E402
+
+
+def adhoc_parse(notam: dict) -> dict:
+    """소비 측에서 흔히 쓰던 방식: 필요한 값마다 원문에 정규식 재실행"""
+    text = notam.get('full_text_detail') or ''
+    parsed = {}
+    match = re.search(r'Q\)\s*([A-Z]{4})/(Q[A-Z]{4})/([A-Z]*)/([A-Z]*)/([A-Z]*)\s*/(\d{3})/(\d{3})/'
+                      r'(\d{4}[NS])(\d{5}[EW])(\d{3})?', text)
+    if match:
+        parsed.update(zip(('fir', 'qcode', 'traffic', 'purpose', 'scope', 'lower', 'upper',
+                           'lat', 'lon', 'radius'), match.groups()))
+    for letter, value in re.findall(r'(?<![A-Z0-9])([A-G])\)\s*(.*?)(?=\s+[A-G]\)|$)', text):
+        parsed[letter.lower()] = value
+    return parsed
+
+
+def validate():
+    """항목 분리 / 메모 키 확인 (본문의 "(E)"는 항목이 아님, 메모는 본문 문자열을 키로 갖지 않음)"""
+    text = ('Q) RKRR/QMRLC/IV/NBO/A /000/999/3747N12627E005\n'
+            'A) RKSI B) 2601010000 C) 2602010000 EST\nE) RWY 15L CLSD (E) SIDE TWY A) CLSD')
+    notam_parser.clear_memo()
+    parsed = notam_parser.parse_notam({'full_text_detail': text})
+    assert parsed['e'] == 'RWY 15L CLSD (E) SIDE TWY A) CLSD', parsed
+    assert parsed['c'] == '2602010000 EST', parsed
+    assert notam_parser.parse_notam({'full_text_detail': text}) == parsed
+    assert notam_parser.memo_info().hits == 1 and notam_parser.memo_info().currsize == 1
+    assert all(not isinstance(part, str) or part != text for key in notam_parser._memo for part in key)
+    notam_parser.clear_memo()
+    print("검증: 항목 분리 / 메모 키 OK")
+
+
+def throughput(fn, notams) -> float:
+    """NOTAMs/s"""
+    started = time.perf_counter()
+    for notam in notams:
+        fn(notam)
+    return len(notams) / (time.perf_counter() - started)
+
+
+def run(count: int):
+    notams = [normalize_json_row(row) for row in MockDataset(count).rows]
+
+    adhoc = throughput(adhoc_parse, notams)
+
+    notam_parser.clear_memo()
+    cold = throughput(notam_parser.parse_notam, notams)
+    warm = throughput(notam_parser.parse_notam, notams)
+
+    # 수집 경로 (build_record_rows) 에서의 첫 파싱 / 재크롤링 비용
+    notam_parser.clear_memo()
+    started = time.perf_counter()
+    build_record_rows(notams, 'domestic', 'ts')
+    ingest_cold = count / (time.perf_counter() - started)
+    started = time.perf_counter()
+    build_record_rows(notams, 'domestic', 'ts')
+    ingest_warm = count / (time.perf_counter() - started)
+
+    return adhoc, cold, warm, ingest_cold, ingest_warm
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='NOTAM 본문 파서 처리량 벤치마크')
+    parser.add_argument('--notams', type=int, nargs='+', default=[10000, 50000], help='NOTAM 수')
+    args = parser.parse_args()
+
+    validate()
+    print(f"{'NOTAM':>8} {'임시 정규식':>11} {'파서(첫)':>10} {'파서(메모)':>10} "
+          f"{'수집 행(첫)':>11} {'수집 행(메모)':>12}   (NOTAMs/s)")
+    for count in args.notams:
+        adhoc, cold, warm, ingest_cold, ingest_warm = run(count)
+        print(f"{count:>8} {adhoc:>11.0f} {cold:>10.0f} {warm:>10.0f} {ingest_cold:>11.0f} {ingest_warm:>12.0f}")
+    print(f"메모: {notam_parser.memo_info()}")
+
+
+if __name__ == '__main__':
+    main()
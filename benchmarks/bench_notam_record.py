@@ -0,0 +1,133 @@
+"""
+NOTAM 레코드 타입 메모리/시간 벤치마크 (레코드 100k 기준)
+기존 방식 (NOTAM마다 키 9개 딕셔너리) vs NOTAMRecord (__slots__, location/qcode/notam_type intern)
+
+단계별 시간: 파싱 (API 응답 행 -> NOTAM), build_record_rows, detect_changes (저장된 배치와 같은 배치).
+방식마다 새 프로세스에서 실행해 최대 RSS를 따로 잰다. 'NOTAM 보유'는 파싱 결과 목록이 차지하는 Python 힙.
+
+실행 예:
+  python benchmarks/bench_notam_record.py --notams 100000
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_change_detector import NOTAMChangeDetector  # noqa: E402
+from notam_crawler_api import NOTAMCrawlerAPI, normalize_json_row  # noqa: E402
+from notam_db import build_record_rows, get_connection_manager  # noqa: E402
+from notam_mock_server import MockDataset  # noqa: E402
+
+MODES = ('dict', 'record')
+
+
+def legacy_normalize(item: dict) -> dict:
+    """기존 normalize_json_row (딕셔너리)"""
+    get = item.get
+    notam_no = get('NOTAM_NO') or ''
+    if not notam_no or not notam_no.strip():
+        return None
+    return {
+        'notam_type': get('AIS_TYPE') or get('SERIES') or '',
+        'issue_time': get('ISSUE_TIME') or '',
+        'location': get('LOCATION') or '',
+        'notam_no': notam_no,
+        'qcode': get('QCODE') or '',
+        'start_time': get('EFFECTIVESTART') or '',
+        'end_time': get('EFFECTIVEEND') or '',
+        'full_text': get('ECODE') or '',
+        'full_text_detail': get('FULL_TEXT') or ''
+    }
+
+
+def child(mode: str, count: int, directory) -> dict:
+    """한 방식의 단계별 측정 (자식 프로세스)"""
+    logging.disable(logging.INFO)
+    # 응답 행은 JSON 문자열에서 새로 만들어 두 방식 모두 같은 상태에서 시작 (문자열 공유 없음)
+    raw = json.dumps([{k: v for k, v in row.items() if k != '_issue'} for row in MockDataset(count).rows])
+    items = json.loads(raw)
+    del raw
+    normalize = legacy_normalize if mode == 'dict' else normalize_json_row
+
+    result = {}
+    # 보유 메모리는 tracemalloc 아래에서 한 번 만들어 재고, 시간은 tracemalloc 없이 측정
+    tracemalloc.start()
+    notams = [normalize(item) for item in items]
+    result['held'] = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del notams
+
+    started = time.perf_counter()
+    notams = [normalize(item) for item in items]
+    result['parse'] = time.perf_counter() - started
+    del items
+
+    started = time.perf_counter()
+    build_record_rows(notams, 'domestic', 'ts')
+    result['build'] = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        db_name = os.path.join(tmp, 'bench.db')
+        crawler = NOTAMCrawlerAPI(db_name=db_name)
+        crawler.save_to_database(notams, 'domestic', 'ts')
+        detector = NOTAMChangeDetector(db_name=db_name)
+
+        started = time.perf_counter()
+        changes = detector.detect_changes(notams, 'domestic')
+        result['detect'] = time.perf_counter() - started
+        assert changes['unchanged'] == len({n['notam_no'] for n in notams})
+
+        started = time.perf_counter()
+        previous = detector.get_previous_notams('domestic')
+        result['previous'] = time.perf_counter() - started
+        assert len(previous) == changes['unchanged']
+
+        detector.close()
+        crawler.close()
+        get_connection_manager(db_name).close()
+
+    # Linux ru_maxrss 단위는 KB
+    result['rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return result
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='NOTAM 레코드 타입 메모리/시간 벤치마크')
+    parser.add_argument('--notams', type=int, default=100000, help='NOTAM 수')
+    parser.add_argument('--dir', help='임시 DB 위치')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.notams, args.dir)))
+        return
+
+    results = {}
+    for mode in MODES:
+        command = [sys.executable, os.path.abspath(__file__), '--child', mode, '--notams', str(args.notams)]
+        if args.dir:
+            command += ['--dir', args.dir]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"NOTAM {args.notams}개")
+    print(f"{'방식':>8} {'파싱(ms)':>9} {'저장 행(ms)':>11} {'감지(ms)':>9} {'이전 조회(ms)':>13} "
+          f"{'NOTAM 보유(MB)':>14} {'최대 RSS(MB)':>12}")
+    for mode in MODES:
+        r = results[mode]
+        print(f"{mode:>8} {r['parse'] * 1000:>9.0f} {r['build'] * 1000:>11.0f} {r['detect'] * 1000:>9.0f} "
+              f"{r['previous'] * 1000:>13.0f} {r['held'] / 1e6:>14.1f} {r['rss'] / 1e6:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
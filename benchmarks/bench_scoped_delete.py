@@ -0,0 +1,104 @@
+"""
+삭제 판정 범위 벤치마크
+소스 전체 대상 (배치에 없는 저장 NOTAM 전부 DELETE) vs 조회 범위 한정 (scope: 발행 시각 구간/공항/SERIES)
+
+이력은 --days 일에 걸쳐 고르게 쌓고, 배치는 최근 --hours 시간 구간만 조회한 결과로 만든다.
+배치에서 1%를 빼서 실제 삭제로 둔다. 시간은 감지 + 변경 로그 JSON 직렬화 기준.
+
+실행 예:
+  python benchmarks/bench_scoped_delete.py --history 10000 100000 --hours 24
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_change_detector import NOTAMChangeDetector  # noqa: E402
+from notam_crawler_api import NOTAMCrawlerAPI  # noqa: E402
+from notam_db import get_connection_manager  # noqa: E402
+
+NOW = datetime(2026, 10, 17, 12, 0)
+
+
+def make_notam(i: int, issue: datetime) -> dict:
+    """합성 NOTAM"""
+    return {
+        'notam_no': f'A{i:07d}/26',
+        'notam_type': 'A',
+        'issue_time': issue.strftime('%y%m%d%H%M'),
+        'location': ('RKSI', 'RKSS', 'RKPC', 'RKPK')[i % 4],
+        'qcode': 'QMRLC',
+        'start_time': issue.strftime('%y%m%d%H%M'),
+        'end_time': '2611170000',
+        'full_text': f'RWY {i % 40} CLSD',
+        'full_text_detail': ''
+    }
+
+
+def detect(detector, batch, scope):
+    """감지 + DELETE 로그 직렬화 시간"""
+    started = time.perf_counter()
+    changes = detector.detect_changes(batch, 'domestic', scope)
+    # process_changes()가 DELETE 이벤트마다 기록하는 change_details
+    payload = sum(len(json.dumps({'full_data': notam}, ensure_ascii=False)) for notam in changes['deleted'])
+    return time.perf_counter() - started, len(changes['deleted']), payload
+
+
+def run(history: int, args):
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db_name = os.path.join(tmp, 'bench.db')
+        crawler = NOTAMCrawlerAPI(db_name=db_name)
+        span = timedelta(days=args.days)
+        notams = [make_notam(i, NOW - span * (i / history)) for i in range(history)]
+        crawler.save_to_database(notams, 'domestic', 'ts')
+
+        window_start = NOW - timedelta(hours=args.hours)
+        in_window = [n for n in notams if n['issue_time'] >= window_start.strftime('%y%m%d%H%M')]
+        batch = [n for i, n in enumerate(in_window) if i % 100 != 0]
+        scope = {'window_start': window_start, 'window_end': NOW + timedelta(minutes=1),
+                 'airports': list(crawler.airports), 'series': list(crawler.series_types)}
+
+        detector = NOTAMChangeDetector(db_name=db_name)
+        full = detect(detector, batch, None)
+        scoped = detect(detector, batch, scope)
+
+        plan = detector.conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM notam_records WHERE data_source = ? '
+            'AND issue_time >= ? AND issue_time < ?', ('domestic', '2610160000', '2610170000')).fetchall()
+
+        detector.close()
+        crawler.close()
+        get_connection_manager(db_name).close()
+
+    return len(batch), full, scoped, plan[-1][-1]
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='삭제 판정 범위 벤치마크')
+    parser.add_argument('--history', type=int, nargs='+', default=[10000, 100000], help='저장된 NOTAM 수')
+    parser.add_argument('--days', type=int, default=90, help='이력 분포 기간 (일)')
+    parser.add_argument('--hours', type=int, default=24, help='조회 구간 (시간)')
+    parser.add_argument('--dir', help='임시 DB 위치')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'이력':>8} {'배치':>6} {'전체 DELETE':>11} {'전체(ms)':>9} {'로그(KB)':>9} "
+          f"{'범위 DELETE':>11} {'범위(ms)':>9} {'로그(KB)':>9}")
+    for history in args.history:
+        batch, full, scoped, plan = run(history, args)
+        print(f"{history:>8} {batch:>6} {full[1]:>11} {full[0] * 1000:>9.1f} {full[2] / 1024:>9.0f} "
+              f"{scoped[1]:>11} {scoped[0] * 1000:>9.1f} {scoped[2] / 1024:>9.0f}")
+    print(f"범위 조회 계획: {plan}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+NOTAM 시각 컬럼 벤치마크
+1) 변환: 행마다 datetime.strptime vs notam_time.epoch_columns (배치 안 고유 문자열만 변환)
+2) 유효 구간 조회: 원문 문자열 비교 (idx_notam_records_end_time) vs epoch 범위 조회
+   (idx_notam_records_active는 필터 컬럼을 모두 포함하므로 id만 읽을 때 테이블 접근 없음)
+   + find_active_notams 전체 행 조회 시간
+
+이력은 --days 일 동안 발행된 NOTAM (PERM 5%, EST 15%), 조회는 현재부터 6시간 구간.
+원문 문자열 비교는 'EST'/'PERM'/형식이 다른 값이 섞이면 사전순 비교라 결과가 정확하지 않다.
+
+실행 예:
+  python benchmarks/bench_time_columns.py --history 100000 1000000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_crawler_api import NOTAMCrawlerAPI  # noqa: E402
+from notam_db import find_active_notams, get_connection_manager  # noqa: E402
+from notam_time import epoch_columns, to_epoch  # noqa: E402
+
+NOW = datetime(2026, 10, 17, 12, 0)
+
+
+def make_notams(count: int, days: int):
+    """합성 NOTAM (발행 후 1~30일 유효, 분 단위는 10분 간격)"""
+    rng = random.Random(1)
+    notams = []
+    for i in range(count):
+        issue = NOW - timedelta(minutes=10 * rng.randrange(days * 144))
+        start = issue + timedelta(hours=rng.randrange(48))
+        roll = rng.random()
+        if roll < 0.05:
+            end = 'PERM'
+        else:
+            end = (start + timedelta(days=rng.randint(1, 30))).strftime('%y%m%d%H%M') + ('EST' if roll < 0.2 else '')
+        notams.append({
+            'notam_no': f'A{i:07d}/26', 'notam_type': 'A', 'location': ('RKSI', 'RKSS', 'RKPC')[i % 3],
+            'issue_time': issue.strftime('%y%m%d%H%M'), 'start_time': start.strftime('%y%m%d%H%M'),
+            'end_time': end, 'qcode': 'QMRLC', 'full_text': 'RWY CLSD', 'full_text_detail': ''
+        })
+    return notams
+
+
+def legacy_convert(notams):
+    """행마다 strptime (PERM/EST는 별도 처리)"""
+    rows = []
+    for notam in notams:
+        values = []
+        for field in ('issue_time', 'start_time', 'end_time'):
+            text = notam[field]
+            if text == 'PERM':
+                values.append(None)
+                continue
+            values.append(int((datetime.strptime(text[:10], '%y%m%d%H%M') - datetime(1970, 1, 1)).total_seconds()))
+        rows.append(tuple(values))
+    return rows
+
+
+def legacy_active_ids(conn, window_start, window_end):
+    """원문 문자열 비교 조회"""
+    return conn.execute('SELECT id FROM notam_records WHERE end_time >= ? AND start_time <= ?',
+                        (window_start.strftime('%y%m%d%H%M'), window_end.strftime('%y%m%d%H%M'))).fetchall()
+
+
+def epoch_active_ids(conn, window_start, window_end):
+    """epoch 범위 조회"""
+    return conn.execute('SELECT id FROM notam_records WHERE end_ts >= ? AND start_ts <= ?',
+                        (to_epoch(window_start), to_epoch(window_end))).fetchall()
+
+
+def timed(fn, repeat=5):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def run(history: int, args):
+    notams = make_notams(history, args.days)
+    legacy_convert_time, _ = timed(lambda: legacy_convert(notams), 1)
+    batch_convert_time, _ = timed(lambda: epoch_columns(notams), 1)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        db_name = os.path.join(tmp, 'bench.db')
+        crawler = NOTAMCrawlerAPI(db_name=db_name)
+        crawler.save_to_database(notams, 'domestic', 'ts')
+        conn = crawler.db.get()
+        conn.execute('ANALYZE')
+
+        window_start, window_end = NOW, NOW + timedelta(hours=6)
+        legacy_time, legacy = timed(lambda: legacy_active_ids(conn, window_start, window_end))
+        epoch_time, active = timed(lambda: epoch_active_ids(conn, window_start, window_end))
+        rows_time, rows = timed(lambda: find_active_notams(conn, window_start, window_end, 'domestic'))
+        assert len(rows) == len(active)
+
+        crawler.close()
+        get_connection_manager(db_name).close()
+
+    return legacy_convert_time, batch_convert_time, legacy_time, len(legacy), epoch_time, len(active), rows_time
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='NOTAM 시각 컬럼 벤치마크')
+    parser.add_argument('--history', type=int, nargs='+', default=[100000, 1000000], help='저장된 NOTAM 수')
+    parser.add_argument('--days', type=int, default=730, help='발행 시각 분포 기간 (일)')
+    parser.add_argument('--dir', help='임시 DB 위치')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'이력':>9} {'strptime(ms)':>13} {'배치 변환(ms)':>13} {'문자열 조회(ms)':>15} {'건수':>6} "
+          f"{'epoch 조회(ms)':>14} {'건수':>6} {'전체 행(ms)':>11}")
+    for history in args.history:
+        (legacy_convert_time, batch_convert_time, legacy_time, legacy_count,
+         epoch_time, epoch_count, rows_time) = run(history, args)
+        print(f"{history:>9} {legacy_convert_time * 1000:>13.1f} {batch_convert_time * 1000:>13.1f} "
+              f"{legacy_time * 1000:>15.2f} {legacy_count:>6} {epoch_time * 1000:>14.2f} {epoch_count:>6} "
+              f"{rows_time * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+searchAllNotam.do XML 파싱 벤치마크
+기존 경로 (ET.fromstring + findall('.//TR') + 행마다 findall('.//TD')) vs 스트리밍 (IBSheetXMLStream, iterparse)
+
+합성 픽스처 (notam_mock_server XML 페이지 + 형식 변형) 에서 두 파서의 결과가 같은지 먼저 확인한 뒤,
+페이지 크기별 시간과 최대 메모리를 잰다. '파서 메모리'는 행을 보관하지 않고 세기만 할 때의 최대 메모리,
+'목록 메모리'는 NOTAM 리스트까지 만들 때의 최대 메모리.
+
+실행 예:
+  python benchmarks/bench_xml_parse.py --rows 1000 10000 50000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notam_crawler_api import IBSheetXMLStream  # noqa: E402
+from notam_mock_server import MockAIMServer, MockConfig  # noqa: E402
+from notam_record import NOTAMRecord  # noqa: E402
+
+
+def legacy_parse(xml_text):
+    """기존 _parse_xml_response (트리 전체 생성 후 탐색)"""
+    notam_list = []
+    root = ET.fromstring(xml_text)
+    rows = root.findall('.//TR') or root.findall('.//Row')
+    for row in rows:
+        cells = row.findall('.//TD') or row.findall('.//Cell')
+        if len(cells) < 10:
+            continue
+        notam = NOTAMRecord(*[cell.text or '' for cell in cells[1:10]])
+        if notam['notam_no'] and notam['notam_no'].strip():
+            notam_list.append(notam)
+    return notam_list
+
+
+def stream_parse(xml_text):
+    """스트리밍 경로"""
+    return list(IBSheetXMLStream(xml_text))
+
+
+def legacy_count(xml_text) -> int:
+    return len(legacy_parse(xml_text))
+
+
+def stream_count(xml_text) -> int:
+    count = 0
+    for _ in IBSheetXMLStream(xml_text):
+        count += 1
+    return count
+
+
+def mock_page(rows: int) -> bytes:
+    """notam_mock_server XML 응답 페이지 (크롤러가 받는 것과 같은 형식)"""
+    server = MockAIMServer(MockConfig(size=rows, intl_size=0, response_format='xml'))
+    try:
+        body, _ = server.render_page({'ibsheetRowPerPage': str(rows)})
+    finally:
+        server.httpd.server_close()
+    return body
+
+
+def fixtures():
+    """형식 변형 픽스처 (이름, 본문)"""
+    cells = ['1', 'A', '2610170000', 'RKSI', 'A0001/26', 'QMRLC', '2610170100', '2610170700',
+             'RWY 15L/33R CLSD & 점검 <주간>', 'Q) RKRR/QMRLC/IV/NBO/A /000/999/3728N12626E005 A) RKSI']
+
+    def row(values, row_tag='TR', cell_tag='TD'):
+        return (f'<{row_tag}>' + ''.join(f'<{cell_tag}>{escape(v)}</{cell_tag}>' for v in values)
+                + f'</{row_tag}>')
+
+    second = cells[:4] + ['A0002/26'] + cells[5:]
+    yield 'TR/TD', f'<SHEET><DATA TOTAL="2">{row(cells)}{row(second)}</DATA></SHEET>'
+    yield 'Row/Cell', f'<Sheet><Data>{row(cells, "Row", "Cell")}{row(second, "Row", "Cell")}</Data></Sheet>'
+    yield '짧은 행 / 빈 번호', (f'<SHEET><DATA>{row(cells[:9])}{row(cells[:4] + ["  "] + cells[5:])}'
+                             f'{row(second)}</DATA></SHEET>')
+    yield '빈 셀 / CDATA', ('<SHEET><DATA><TR>' + '<TD/>' * 4 + '<TD>A0003/26</TD>'
+                          + '<TD><![CDATA[Q&A <raw>]]></TD>' * 5 + '</TR></DATA></SHEET>')
+    yield '들여쓰기 / 선언', ('<?xml version="1.0" encoding="UTF-8"?>\n<SHEET>\n  <DATA TOTAL="1">\n    '
+                          + row(cells).replace('<TD>', '\n      <TD>') + '\n  </DATA>\n</SHEET>\n')
+    yield '셀 안 요소', ('<SHEET><DATA><TR>' + '<TD>x</TD>' * 4 + '<TD>A0004/26<B>bold</B></TD>'
+                      + '<TD><SPAN>in</SPAN></TD>' * 5 + '</TR></DATA></SHEET>')
+    yield '행 없음', '<SHEET><DATA TOTAL="0"></DATA></SHEET>'
+
+
+def validate(pages) -> int:
+    """픽스처 + 페이지에서 두 파서 결과 비교 (bytes / str 입력 모두)"""
+    checked = 0
+    for name, body in list(fixtures()) + pages:
+        for source in (body, body.encode('utf-8')) if isinstance(body, str) else (body, body.decode('utf-8')):
+            expected = [notam.to_dict() for notam in legacy_parse(source)]
+            stream = IBSheetXMLStream(source)
+            found = [notam.to_dict() for notam in stream]
+            assert found == expected, f'파싱 결과 불일치: {name}'
+            assert stream.row_count == len(expected)
+            checked += 1
+    return checked
+
+
+def measure(func, body, repeat: int):
+    """최소 실행 시간 (ms), 최대 할당 메모리 (bytes)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(body)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak
+
+
+def main():
+    """벤치마크 실행"""
+    parser = argparse.ArgumentParser(description='XML 응답 파싱 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000], help='페이지 행 수')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    pages = [(f'mock {rows}행', mock_page(rows)) for rows in args.rows]
+    print(f"검증: 픽스처/페이지 {validate(pages)}건 결과 일치 (bytes / str 입력)")
+    for (_, body), rows in zip(pages, args.rows):
+        stream = IBSheetXMLStream(body)
+        list(stream)
+        assert stream.total == rows
+
+    mib = 1024 * 1024
+    print(f"{'행':>7} {'KiB':>7} {'방식':>8} {'시간(ms)':>9} {'파서 메모리(MiB)':>16} {'목록 메모리(MiB)':>16}")
+    for (_, body), rows in zip(pages, args.rows):
+        for label, parse, count in (('기존', legacy_parse, legacy_count), ('스트리밍', stream_parse, stream_count)):
+            elapsed, list_peak = measure(parse, body, args.repeat)
+            _, parser_peak = measure(count, body, 1)
+            print(f"{rows:>7} {len(body) / 1024:>7.0f} {label:>8} {elapsed:>9.1f} "
+                  f"{parser_peak / mib:>16.2f} {list_peak / mib:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+"""
+NOTAM 원본 응답 보관소 - searchAllNotam.do 응답 원문 압축 저장 및 재처리
+작성일: 2026-10-17
+기능:
+  - 페이지 응답 원문을 gzip 압축, SHA-256 내용 주소로 저장 (동일 페이지 중복 제거)
+  - crawl_timestamp / data_source / 샤드 / 페이지 단위 색인 (index.db)
+  - 크롤링 실행 단위 완료 상태 기록 (재처리 대상 선별)
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RawResponseArchive:
+    """
+    내용 주소 기반 원본 응답 보관소
+
+    디렉터리 구조:
+        <root>/index.db                      페이지/실행 색인
+        <root>/objects/ab/abcdef....gz       압축된 응답 원문 (SHA-256)
+    """
+
+    def __init__(self, root_dir: str = 'notam_archive'):
+        """
+        초기화
+
+        Args:
+            root_dir (str): 보관소 루트 디렉터리
+        """
+        self.root_dir = root_dir
+        self.objects_dir = os.path.join(root_dir, 'objects')
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        # 페이지 스레드가 동시에 기록하므로 연결 공유 + lock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root_dir, 'index.db'), check_same_thread=False)
+        self._setup_index()
+
+    def _setup_index(self):
+        """색인 테이블 생성"""
+        with self._lock:
+            cursor = self.conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS raw_pages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    crawl_timestamp TEXT NOT NULL,
+                    data_source TEXT NOT NULL,
+                    shard INTEGER NOT NULL DEFAULT 0,
+                    page INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    raw_size INTEGER,
+                    window_start TEXT,
+                    window_end TEXT,
+                    archived_at TEXT,
+                    UNIQUE(crawl_timestamp, data_source, shard, page)
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS raw_objects (
+                    content_hash TEXT PRIMARY KEY,
+                    raw_size INTEGER,
+                    stored_size INTEGER,
+                    ref_count INTEGER DEFAULT 0
+                )
+            ''')
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS raw_runs (
+                    crawl_timestamp TEXT NOT NULL,
+                    data_source TEXT NOT NULL,
+                    status TEXT,
+                    records_found INTEGER,
+                    completed_at TEXT,
+                    PRIMARY KEY (crawl_timestamp, data_source)
+                )
+            ''')
+
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_raw_pages_run ON raw_pages(data_source, crawl_timestamp)')
+            self._repair_objects()
+            self.conn.commit()
+
+    def _repair_objects(self):
+        """
+        raw_objects 참조 수를 raw_pages 기준으로 다시 계산하고 빈 stored_size 채우기 (lock 보유 상태에서 호출)
+
+        이전 버전은 같은 페이지를 다시 저장할 때마다 참조 수를 올렸고, 파일이 이미 있으면
+        stored_size를 비워 두었다.
+        """
+        counts = dict(self.conn.execute('SELECT content_hash, COUNT(*) FROM raw_pages GROUP BY content_hash'))
+        objects = self.conn.execute('SELECT content_hash, ref_count, stored_size FROM raw_objects').fetchall()
+
+        updates = []
+        for content_hash, ref_count, stored_size in objects:
+            expected = counts.get(content_hash, 0)
+            if stored_size is None:
+                path = self._object_path(content_hash)
+                stored_size = os.path.getsize(path) if os.path.exists(path) else None
+            if ref_count != expected or stored_size is not None:
+                updates.append((expected, stored_size, content_hash))
+        if updates:
+            self.conn.executemany(
+                'UPDATE raw_objects SET ref_count = ?, stored_size = COALESCE(stored_size, ?) '
+                'WHERE content_hash = ?', updates)
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self.objects_dir, content_hash[:2], f'{content_hash}.gz')
+
+    def store(self, body: bytes, crawl_timestamp: str, data_source: str,
+              page: int, shard: int = 0,
+              window_start: Optional[str] = None,
+              window_end: Optional[str] = None) -> str:
+        """
+        페이지 응답 원문 저장 (이미 있는 내용이면 색인만 추가)
+
+        같은 페이지 키 (crawl_timestamp, data_source, shard, page)를 다시 저장하면 (재시도/재크롤링)
+        색인을 교체하므로, 참조 수는 새 키이거나 내용이 바뀐 경우에만 바뀐다.
+
+        Args:
+            body (bytes): 응답 본문
+            crawl_timestamp (str): 크롤링 타임스탬프
+            data_source (str): 'domestic' 또는 'international'
+            page (int): ibsheetPageNo
+            shard (int): 샤드 번호 (샤드 모드가 아니면 0)
+            window_start (str, optional): 검색 구간 시작
+            window_end (str, optional): 검색 구간 종료
+
+        Returns:
+            str: 내용 해시 (SHA-256)
+        """
+        content_hash = hashlib.sha256(body).hexdigest()
+        path = self._object_path(content_hash)
+
+        if os.path.exists(path):
+            stored_size = os.path.getsize(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = gzip.compress(body, compresslevel=6, mtime=0)
+            # 동시 기록 시 반쯤 쓰인 파일이 보이지 않도록 임시 파일 후 교체
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+            stored_size = len(compressed)
+
+        with self._lock:
+            cursor = self.conn.cursor()
+            previous = cursor.execute('''
+                SELECT content_hash FROM raw_pages
+                WHERE crawl_timestamp = ? AND data_source = ? AND shard = ? AND page = ?
+            ''', (crawl_timestamp, data_source, shard, page)).fetchone()
+
+            cursor.execute('''
+                INSERT INTO raw_objects (content_hash, raw_size, stored_size, ref_count)
+                VALUES (?, ?, ?, 0)
+                ON CONFLICT(content_hash) DO UPDATE SET stored_size = COALESCE(stored_size, excluded.stored_size)
+            ''', (content_hash, len(body), stored_size))
+            if previous is None or previous[0] != content_hash:
+                cursor.execute('UPDATE raw_objects SET ref_count = ref_count + 1 WHERE content_hash = ?',
+                               (content_hash,))
+                if previous is not None:
+                    cursor.execute('UPDATE raw_objects SET ref_count = ref_count - 1 WHERE content_hash = ?',
+                                   (previous[0],))
+            cursor.execute('''
+                INSERT OR REPLACE INTO raw_pages
+                (crawl_timestamp, data_source, shard, page, content_hash, raw_size,
+                 window_start, window_end, archived_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (crawl_timestamp, data_source, shard, page, content_hash, len(body),
+                  window_start, window_end, datetime.now().isoformat()))
+            self.conn.commit()
+
+        return content_hash
+
+    def mark_run(self, crawl_timestamp: str, data_source: str,
+                 status: str, records_found: int = 0):
+        """
+        크롤링 실행 결과 기록 (재처리는 SUCCESS 실행만 대상)
+
+        Args:
+            crawl_timestamp (str): 크롤링 타임스탬프
+            data_source (str): 'domestic' 또는 'international'
+            status (str): 'SUCCESS' 또는 'FAILED'
+            records_found (int): 발견된 레코드 수
+        """
+        with self._lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO raw_runs
+                (crawl_timestamp, data_source, status, records_found, completed_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (crawl_timestamp, data_source, status, records_found, datetime.now().isoformat()))
+            self.conn.commit()
+
+    def load(self, content_hash: str) -> bytes:
+        """
+        내용 해시로 응답 원문 읽기
+
+        Args:
+            content_hash (str): SHA-256 해시
+
+        Returns:
+            bytes: 압축 해제된 응답 본문
+        """
+        with open(self._object_path(content_hash), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def iter_runs(self, data_source: Optional[str] = None,
+                  since: Optional[str] = None,
+                  until: Optional[str] = None) -> List[Dict]:
+        """
+        재처리 대상 실행 목록 (SUCCESS, crawl_timestamp 오름차순)
+
+        Args:
+            data_source (str, optional): 'domestic' 또는 'international'
+            since (str, optional): 이 crawl_timestamp 이후 (포함)
+            until (str, optional): 이 crawl_timestamp 이전 (미포함)
+
+        Returns:
+            List[Dict]: [{'crawl_timestamp', 'data_source', 'records_found'}]
+        """
+        query = "SELECT crawl_timestamp, data_source, records_found FROM raw_runs WHERE status = 'SUCCESS'"
+        params = []
+
+        if data_source:
+            query += " AND data_source = ?"
+            params.append(data_source)
+        if since:
+            query += " AND crawl_timestamp >= ?"
+            params.append(since)
+        if until:
+            query += " AND crawl_timestamp < ?"
+            params.append(until)
+
+        query += " ORDER BY crawl_timestamp, data_source"
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        return [{'crawl_timestamp': r[0], 'data_source': r[1], 'records_found': r[2]} for r in rows]
+
+    def iter_pages(self, crawl_timestamp: str, data_source: str) -> Iterator[bytes]:
+        """
+        실행 하나의 페이지 원문을 샤드/페이지 순서로 반환
+
+        Args:
+            crawl_timestamp (str): 크롤링 타임스탬프
+            data_source (str): 'domestic' 또는 'international'
+
+        Yields:
+            bytes: 응답 본문
+        """
+        with self._lock:
+            hashes = [r[0] for r in self.conn.execute('''
+                SELECT content_hash FROM raw_pages
+                WHERE crawl_timestamp = ? AND data_source = ?
+                ORDER BY shard, page
+            ''', (crawl_timestamp, data_source)).fetchall()]
+
+        for content_hash in hashes:
+            yield self.load(content_hash)
+
+    def get_stats(self) -> Dict:
+        """
+        보관소 통계 (중복 제거/압축 효과)
+
+        Returns:
+            Dict: 페이지 수, 고유 객체 수, 원문/저장 바이트
+        """
+        with self._lock:
+            pages, raw_bytes = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(raw_size), 0) FROM raw_pages').fetchone()
+            objects, stored_bytes = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(stored_size), 0) FROM raw_objects').fetchone()
+
+        return {
+            'pages': pages,
+            'objects': objects,
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes
+        }
+
+    def close(self):
+        """색인 연결 종료"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
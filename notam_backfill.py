@@ -0,0 +1,441 @@
+"""
+NOTAM 과거 데이터 백필 - 날짜 구간 분할 + 동시 크롤링 + 체크포인트 재개
+작성일: 2026-10-17
+기능:
+  - 긴 기간을 고정 길이 구간(window)으로 나눠 동시에 요청
+  - 모든 구간이 크롤러의 적응형 속도 제한기를 공유 (전체 요청 예산)
+  - 완료 구간을 SQLite backfill_checkpoints 테이블에 기록, 중단 후 재실행 시 남은 구간만 요청
+  - 진행률, 초당 행 수, 예상 남은 시간 출력
+
+실행 예:
+  python notam_backfill.py --start 2026-01-01 --end 2026-04-01 --source all --window-hours 24
+  python notam_backfill.py --status
+"""
+
+import argparse
+import logging
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import pytz
+from requests.adapters import HTTPAdapter
+
+from notam_crawler_api import NOTAMCrawlerAPI
+
+logger = logging.getLogger(__name__)
+
+DATA_SOURCES = ('domestic', 'international')
+
+
+def parse_utc(value: str) -> datetime:
+    """'YYYY-MM-DD' 또는 'YYYY-MM-DDTHH:MM' 문자열을 UTC datetime으로 변환"""
+    for fmt in ('%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return pytz.UTC.localize(datetime.strptime(value, fmt))
+        except ValueError:
+            continue
+    raise ValueError(f"잘못된 날짜 형식: {value} (YYYY-MM-DD 또는 YYYY-MM-DDTHH:MM)")
+
+
+def format_duration(seconds: float) -> str:
+    """초를 HH:MM:SS 문자열로 변환"""
+    seconds = max(0, int(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class NOTAMBackfill:
+    """체크포인트 기반 과거 NOTAM 백필"""
+
+    def __init__(self, crawler: NOTAMCrawlerAPI,
+                 window_hours: int = 24,
+                 window_workers: int = 4):
+        """
+        초기화
+
+        Args:
+            crawler (NOTAMCrawlerAPI): 요청/저장에 사용할 크롤러 (속도 제한기 공유)
+            window_hours (int): 구간 길이 (시간)
+            window_workers (int): 동시에 요청할 구간 수
+        """
+        if window_hours <= 0:
+            raise ValueError(f"잘못된 구간 길이: {window_hours}")
+
+        self.crawler = crawler
+        self.db_name = crawler.db_name
+        self.db = crawler.db
+        self.window = timedelta(hours=window_hours)
+        self.window_workers = max(1, int(window_workers))
+
+        # 구간 x 페이지 동시 요청 수만큼 연결 풀 확대 (요청 속도는 크롤러의 제한기가 결정)
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=self.window_workers * crawler.max_concurrency)
+        crawler.session.mount('https://', adapter)
+        crawler.session.mount('http://', adapter)
+
+        # 체크포인트 기록 직렬화 (구간 스레드가 동시에 완료됨)
+        self.checkpoint_lock = threading.Lock()
+
+        self.setup_checkpoints()
+
+    def setup_checkpoints(self):
+        """체크포인트 테이블 생성 (프로세스당 한 번)"""
+        self.db.init_schema('backfill_checkpoints', self._create_schema)
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        """backfill_checkpoints 테이블 생성"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+                job_id TEXT NOT NULL,
+                data_source TEXT NOT NULL,
+                window_start TEXT NOT NULL,
+                window_end TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'PENDING',
+                records_found INTEGER DEFAULT 0,
+                records_saved INTEGER DEFAULT 0,
+                attempts INTEGER DEFAULT 0,
+                error_message TEXT,
+                execution_time REAL,
+                updated_at TEXT,
+                PRIMARY KEY (job_id, data_source, window_start)
+            )
+        ''')
+
+    @staticmethod
+    def make_job_id(start: datetime, end: Optional[datetime], window_hours: int) -> str:
+        """
+        같은 인자로 다시 실행하면 같은 작업으로 이어지도록 인자에서 작업 ID 생성
+
+        종료를 지정하지 않은 작업은 실행 시각이 ID에 들어가지 않도록 'open'으로 표시한다
+        (종료 시각은 처음 등록할 때 정해져 체크포인트에 남음, get_job_end()).
+        """
+        end_part = end.strftime('%Y%m%d%H%M') if end else 'open'
+        return f"{start.strftime('%Y%m%d%H%M')}-{end_part}-{window_hours}h"
+
+    def get_job_end(self, job_id: str) -> Optional[datetime]:
+        """
+        등록된 작업의 종료 시각 (마지막 구간의 끝)
+
+        Returns:
+            Optional[datetime]: 종료 시각 (등록된 구간이 없으면 None)
+        """
+        row = self.db.get().execute(
+            'SELECT MAX(window_end) FROM backfill_checkpoints WHERE job_id = ?', (job_id,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def plan_windows(self, start: datetime, end: datetime) -> List[Dict]:
+        """
+        [start, end) 구간을 window 길이로 분할 (마지막 구간은 end에서 잘림)
+
+        Args:
+            start (datetime): 시작 (UTC)
+            end (datetime): 종료 (UTC)
+
+        Returns:
+            List[Dict]: [{'window_start', 'window_end'}] (오래된 구간부터)
+        """
+        if start >= end:
+            raise ValueError(f"시작이 종료보다 늦음: {start.isoformat()} >= {end.isoformat()}")
+
+        windows = []
+        cursor = start
+        while cursor < end:
+            window_end = min(cursor + self.window, end)
+            windows.append({'window_start': cursor, 'window_end': window_end})
+            cursor = window_end
+
+        return windows
+
+    def register_job(self, job_id: str, data_sources: List[str],
+                     windows: List[Dict]) -> List[Dict]:
+        """
+        작업 구간을 체크포인트에 등록하고 아직 완료되지 않은 구간 반환
+
+        이미 등록된 구간은 상태를 유지하므로, 중단된 작업을 같은 job_id로
+        다시 실행하면 DONE이 아닌 구간(PENDING/RUNNING/FAILED)만 다시 요청한다.
+
+        Returns:
+            List[Dict]: [{'data_source', 'window_start', 'window_end'}]
+        """
+        with self.checkpoint_lock:
+            conn = self.db.get()
+            cursor = conn.cursor()
+
+            cursor.executemany('''
+                INSERT OR IGNORE INTO backfill_checkpoints
+                (job_id, data_source, window_start, window_end, status, updated_at)
+                VALUES (?, ?, ?, ?, 'PENDING', ?)
+            ''', [(job_id, source, w['window_start'].isoformat(), w['window_end'].isoformat(),
+                   datetime.now().isoformat())
+                  for source in data_sources for w in windows])
+            conn.commit()
+
+            placeholders = ','.join('?' * len(data_sources))
+            cursor.execute(f'''
+                SELECT data_source, window_start, window_end FROM backfill_checkpoints
+                WHERE job_id = ? AND data_source IN ({placeholders}) AND status != 'DONE'
+                ORDER BY window_start, data_source
+            ''', [job_id, *data_sources])
+            rows = cursor.fetchall()
+
+        return [{
+            'data_source': source,
+            'window_start': datetime.fromisoformat(window_start),
+            'window_end': datetime.fromisoformat(window_end)
+        } for source, window_start, window_end in rows]
+
+    def _update_checkpoint(self, job_id: str, task: Dict, status: str,
+                           records_found: int = 0, records_saved: int = 0,
+                           error_message: Optional[str] = None,
+                           execution_time: Optional[float] = None):
+        """구간 상태 기록 (RUNNING 전환 시 시도 횟수 증가)"""
+        with self.checkpoint_lock:
+            conn = self.db.get()
+            conn.execute('''
+                UPDATE backfill_checkpoints
+                SET status = ?, records_found = ?, records_saved = ?, error_message = ?,
+                    execution_time = ?, updated_at = ?,
+                    attempts = attempts + (CASE WHEN ? = 'RUNNING' THEN 1 ELSE 0 END)
+                WHERE job_id = ? AND data_source = ? AND window_start = ?
+            ''', (status, records_found, records_saved, error_message, execution_time,
+                  datetime.now().isoformat(), status,
+                  job_id, task['data_source'], task['window_start'].isoformat()))
+            conn.commit()
+
+    def crawl_window(self, job_id: str, task: Dict) -> Dict:
+        """
+        구간 하나 수집 + 저장 + 체크포인트 기록
+
+        crawl_logs에는 기록하지 않는다 (과거 구간이 증분 크롤링 워터마크를 되돌리지 않도록).
+
+        Returns:
+            Dict: {'status', 'records_found', 'records_saved', 'execution_time', 'error'}
+        """
+        start_time = time.time()
+        crawl_timestamp = datetime.now().isoformat()
+        data_source = task['data_source']
+        self._update_checkpoint(job_id, task, 'RUNNING')
+
+        try:
+            notam_list, error = self.crawler.fetch_notam_data(
+                data_source,
+                start_date=task['window_start'],
+                end_date=task['window_end'],
+                crawl_timestamp=crawl_timestamp)
+
+            if error:
+                raise RuntimeError(error)
+
+            saved_count = self.crawler.save_to_database(notam_list, data_source, crawl_timestamp)
+            execution_time = time.time() - start_time
+
+            self._update_checkpoint(job_id, task, 'DONE', len(notam_list), saved_count,
+                                    execution_time=execution_time)
+            if self.crawler.archive:
+                self.crawler.archive.mark_run(crawl_timestamp, data_source, 'SUCCESS', len(notam_list))
+
+            return {
+                'status': 'DONE',
+                'records_found': len(notam_list),
+                'records_saved': saved_count,
+                'execution_time': execution_time
+            }
+
+        except Exception as e:
+            execution_time = time.time() - start_time
+            self._update_checkpoint(job_id, task, 'FAILED', error_message=str(e),
+                                    execution_time=execution_time)
+            if self.crawler.archive:
+                self.crawler.archive.mark_run(crawl_timestamp, data_source, 'FAILED')
+
+            return {
+                'status': 'FAILED',
+                'records_found': 0,
+                'records_saved': 0,
+                'execution_time': execution_time,
+                'error': str(e)
+            }
+
+    def run(self, start: datetime, end: Optional[datetime] = None,
+            data_sources: List[str] = DATA_SOURCES,
+            job_id: Optional[str] = None) -> Dict:
+        """
+        백필 실행 (이미 완료된 구간은 건너뜀)
+
+        Args:
+            start (datetime): 시작 (UTC)
+            end (datetime, optional): 종료 (UTC). 없으면 처음 실행 시각으로 정하고,
+                같은 시작으로 다시 실행하면 그때 정한 종료를 그대로 사용해 이어서 진행
+            data_sources (List[str]): 'domestic' / 'international'
+            job_id (str, optional): 작업 ID (기본: 인자에서 생성, 같은 인자로 재실행 시 재개)
+
+        Returns:
+            Dict: 백필 결과
+        """
+        data_sources = list(data_sources)
+        job_id = job_id or self.make_job_id(start, end, int(self.window.total_seconds() // 3600))
+        if end is None:
+            # 현재 시각을 새로 쓰면 구간 경계가 바뀌어 완료한 구간을 다시 요청하게 됨
+            end = self.get_job_end(job_id) or self.crawler.get_utc_time()
+        windows = self.plan_windows(start, end)
+
+        tasks = self.register_job(job_id, data_sources, windows)
+        windows_total = len(windows) * len(data_sources)
+        skipped = windows_total - len(tasks)
+
+        logger.info(f"\n{'='*70}")
+        logger.info(f"[BACKFILL] 작업 {job_id}: {start.strftime('%Y-%m-%d %H:%M')} ~ "
+                    f"{end.strftime('%Y-%m-%d %H:%M')} UTC, {', '.join(data_sources)}")
+        logger.info(f"[BACKFILL] 구간 {windows_total}개 (완료 {skipped}개 건너뜀, 남은 {len(tasks)}개), "
+                    f"동시 구간 {self.window_workers}개")
+        logger.info(f"{'='*70}")
+
+        started = time.time()
+        done = failed = records_found = records_saved = 0
+
+        with ThreadPoolExecutor(max_workers=self.window_workers) as executor:
+            futures = {executor.submit(self.crawl_window, job_id, task): task for task in tasks}
+
+            for future in as_completed(futures):
+                task = futures[future]
+                result = future.result()
+                label = (f"{task['data_source']} {task['window_start'].strftime('%Y-%m-%d %H:%M')}~"
+                         f"{task['window_end'].strftime('%Y-%m-%d %H:%M')}")
+
+                if result['status'] == 'DONE':
+                    done += 1
+                    records_found += result['records_found']
+                    records_saved += result['records_saved']
+                else:
+                    failed += 1
+                    logger.error(f"[ERROR] 구간 실패 ({label}): {result['error']}")
+
+                # 처리량 및 남은 시간 (이번 실행에서 처리한 구간 평균 기준)
+                elapsed = time.time() - started
+                processed = done + failed
+                rows_per_sec = records_found / elapsed if elapsed > 0 else 0
+                eta = elapsed / processed * (len(tasks) - processed)
+                logger.info(f"[PROGRESS] {skipped + processed}/{windows_total} 구간 "
+                            f"({label}: {result['records_found']}개) - "
+                            f"누적 {records_found}개, {rows_per_sec:.1f}행/초, "
+                            f"남은 시간 {format_duration(eta)}")
+
+        execution_time = time.time() - started
+        status = 'SUCCESS' if failed == 0 else 'PARTIAL'
+        logger.info(f"\n[BACKFILL] {status} - 완료 {done}개, 실패 {failed}개, "
+                    f"{records_found}개 발견, {records_saved}개 저장 ({format_duration(execution_time)})")
+        if failed:
+            logger.info("[INFO] 같은 인자로 다시 실행하면 실패한 구간만 재요청합니다")
+
+        return {
+            'status': status,
+            'job_id': job_id,
+            'windows_total': windows_total,
+            'windows_skipped': skipped,
+            'windows_done': done,
+            'windows_failed': failed,
+            'records_found': records_found,
+            'records_saved': records_saved,
+            'execution_time': execution_time,
+            'rows_per_sec': records_found / execution_time if execution_time > 0 else 0,
+            'rate_limiter': self.crawler.rate_limiter.get_stats()
+        }
+
+    def get_job_status(self, job_id: Optional[str] = None) -> List[Dict]:
+        """
+        작업별 체크포인트 요약
+
+        Args:
+            job_id (str, optional): 특정 작업만 조회
+
+        Returns:
+            List[Dict]: [{'job_id', 'data_source', 'total', 'done', 'failed', 'pending', 'records_found'}]
+        """
+        query = '''
+            SELECT job_id, data_source, COUNT(*),
+                   SUM(status = 'DONE'), SUM(status = 'FAILED'),
+                   SUM(status IN ('PENDING', 'RUNNING')), COALESCE(SUM(records_found), 0)
+            FROM backfill_checkpoints
+        '''
+        params = []
+        if job_id:
+            query += ' WHERE job_id = ?'
+            params.append(job_id)
+        query += ' GROUP BY job_id, data_source ORDER BY job_id, data_source'
+
+        rows = self.db.get().execute(query, params).fetchall()
+
+        return [{
+            'job_id': r[0],
+            'data_source': r[1],
+            'total': r[2],
+            'done': r[3],
+            'failed': r[4],
+            'pending': r[5],
+            'records_found': r[6]
+        } for r in rows]
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description='NOTAM 과거 데이터 백필 (체크포인트 재개 지원)')
+    parser.add_argument('--db', default='notam_realtime.db', help='SQLite 데이터베이스 파일')
+    parser.add_argument('--start', help='시작 (UTC, YYYY-MM-DD 또는 YYYY-MM-DDTHH:MM)')
+    parser.add_argument('--end', help='종료 (UTC, 기본: 처음 실행 시각, 재실행 시 유지)')
+    parser.add_argument('--source', choices=['domestic', 'international', 'all'], default='all')
+    parser.add_argument('--window-hours', type=int, default=24, help='구간 길이 (시간)')
+    parser.add_argument('--workers', type=int, default=4, help='동시에 요청할 구간 수')
+    parser.add_argument('--page-concurrency', type=int, default=4, help='구간별 페이지 동시 요청 수')
+    parser.add_argument('--rate-limit', type=float, default=5.0, help='초기 초당 요청 수 (전체 구간 공유)')
+    parser.add_argument('--max-rate', type=float, default=20.0, help='최대 초당 요청 수 (전체 구간 공유)')
+    parser.add_argument('--job-id', help='작업 ID (기본: 인자에서 생성)')
+    parser.add_argument('--archive-dir', help='응답 원문 보관 디렉터리')
+    parser.add_argument('--status', action='store_true', help='체크포인트 진행 상황만 출력')
+    args = parser.parse_args()
+
+    if not args.status and not args.start:
+        parser.error('--start가 필요합니다')
+
+    crawler = NOTAMCrawlerAPI(db_name=args.db,
+                              max_concurrency=args.page_concurrency,
+                              rate_limit=args.rate_limit,
+                              max_rate=args.max_rate,
+                              archive_dir=args.archive_dir)
+
+    try:
+        backfill = NOTAMBackfill(crawler, window_hours=args.window_hours,
+                                 window_workers=args.workers)
+
+        if args.status:
+            for job in backfill.get_job_status(args.job_id):
+                print(f"{job['job_id']} {job['data_source']:<13} "
+                      f"완료 {job['done']}/{job['total']}, 실패 {job['failed']}, "
+                      f"대기 {job['pending']}, {job['records_found']}개")
+            return
+
+        start = parse_utc(args.start)
+        end = parse_utc(args.end) if args.end else None
+        sources = list(DATA_SOURCES) if args.source == 'all' else [args.source]
+
+        result = backfill.run(start, end, sources, job_id=args.job_id)
+
+        print(f"\n[SUMMARY] {result['job_id']}: 구간 {result['windows_done']}개 완료, "
+              f"{result['windows_failed']}개 실패, {result['windows_skipped']}개 건너뜀")
+        print(f"[SUMMARY] {result['records_found']}개 발견, {result['records_saved']}개 저장, "
+              f"{result['rows_per_sec']:.1f}행/초 ({format_duration(result['execution_time'])})")
+
+        if result['status'] != 'SUCCESS':
+            sys.exit(1)
+
+    finally:
+        crawler.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""
+NOTAM 변경 로그 압축 인코딩
+작성일: 2026-10-17
+기능:
+  - NEW/DELETE 이벤트의 NOTAM 레코드(RECORD_FIELDS)를 내용 주소 본문 저장소(notam_bodies)에 한 번만 저장하고 해시로 참조
+  - UPDATE 이벤트는 변경 필드만 기록, 긴 텍스트의 이전 값은 현재 값 대비 차이 연산으로 기록
+  - NOTAM 공통 토큰 사전(preset dictionary)을 쓰는 deflate로 본문/긴 change_details 압축
+  - 기존 JSON change_logs 마이그레이션 및 절감 바이트 보고
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import zlib
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from notam_record import NOTAMRecord
+
+logger = logging.getLogger(__name__)
+
+# change_logs.encoding 값 (NULL은 기존 JSON 텍스트)
+# 압축 사전(DEFLATE_ZDICT)이 바뀌면 기존 행을 읽을 수 없으므로 새 인코딩 값을 써야 한다.
+COMPACT_ENCODING = 'c1'
+
+# 이 길이 이상인 UPDATE 텍스트 필드는 이전 값을 차이 연산으로 기록
+DELTA_MIN_LENGTH = 64
+
+# 이보다 짧은 값은 압축하지 않음 (본문 참조 등은 압축 이득보다 비용이 큼)
+PACK_MIN_LENGTH = 256
+
+# raw deflate, 4KB 창 (NOTAM 레코드 크기에 충분하고 호출당 초기화 비용이 작음)
+DEFLATE_WBITS = -12
+
+# 레코드 하나씩 압축하므로 JSON 키와 NOTAM 본문 공통 토큰을 사전으로 제공
+DEFLATE_ZDICT = (
+    '{"content_hash":"","crawl_timestamp":"2026-10-17T00:00:00.000000","created_at":"2026-10-17 00:00:00",'
+    '"data_source":"domestic","end_time":"2610170000","full_text":"","full_text_detail":"","id":1,'
+    '"issue_time":"2610170000","location":"RKSI","notam_no":"A0001/26","notam_type":"A","qcode":"QMRLC",'
+    '"start_time":"2610170000","previous":"","current":"","delta":['
+    ' CLSD DUE TO MAINT NOT AVBL TWY RWY APRON ILS GP LOC VOR DME OBST LGT U/S WIP ACFT SHALL ESTIMATED PERM '
+    'Q) RKRR/Q/IV/NBO/A /000/999/N E005 A) RKSI B) C) E) F) SFC G) FL'
+).encode('utf-8')
+
+CHANGE_LOG_INSERT_SQL = '''
+    INSERT INTO change_logs
+    (timestamp, notam_no, location, data_source, change_type,
+     change_details, crawl_batch_id, encoding)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+BODY_INSERT_SQL = 'INSERT OR IGNORE INTO notam_bodies (body_hash, body, raw_size) VALUES (?, ?, ?)'
+
+_LOOKUP_CHUNK = 500
+
+
+def ensure_compact_schema(conn: sqlite3.Connection):
+    """
+    notam_bodies 테이블 생성 및 change_logs.encoding 컬럼 추가 (기존 DB 마이그레이션)
+
+    Args:
+        conn (sqlite3.Connection): 연결 (change_logs 생성 후)
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS notam_bodies (
+            body_hash TEXT PRIMARY KEY,
+            body BLOB,
+            raw_size INTEGER
+        )
+    ''')
+
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(change_logs)')}
+    if 'encoding' not in columns:
+        conn.execute('ALTER TABLE change_logs ADD COLUMN encoding TEXT')
+
+
+def _dumps(value) -> str:
+    """공백 없는 JSON (키 정렬로 같은 내용은 같은 문자열)"""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def _pack(text: str):
+    """압축이 이득이면 deflate 바이트, 아니면 원문 텍스트"""
+    if len(text) < PACK_MIN_LENGTH:
+        return text
+    raw = text.encode('utf-8')
+    compressor = zlib.compressobj(6, zlib.DEFLATED, DEFLATE_WBITS, zdict=DEFLATE_ZDICT)
+    packed = compressor.compress(raw) + compressor.flush()
+    return packed if len(packed) < len(raw) else text
+
+
+def _unpack(value) -> str:
+    """_pack() 역변환"""
+    if isinstance(value, bytes):
+        return zlib.decompressobj(DEFLATE_WBITS, zdict=DEFLATE_ZDICT).decompress(value).decode('utf-8')
+    return value
+
+
+def _stored_size(value) -> int:
+    """_pack() 결과의 저장 바이트 수"""
+    return len(value) if isinstance(value, bytes) else len(value.encode('utf-8'))
+
+
+def encode_body(record: Dict) -> Tuple[str, str]:
+    """
+    레코드의 본문 저장소 키와 직렬화 본문
+
+    Args:
+        record (Dict): NOTAM 레코드 (이벤트의 full_data)
+
+    Returns:
+        Tuple[str, str]: (body_hash, JSON 본문)
+    """
+    text = _dumps(record)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest(), text
+
+
+def store_bodies(conn: sqlite3.Connection, bodies: Dict[str, str]) -> int:
+    """
+    본문 저장소에 없는 본문만 압축해 저장 (트랜잭션은 호출 측에서 관리)
+
+    본문은 NOTAM 필드(RECORD_FIELDS)만 담으므로 (encode_details), 내용이 바뀌지 않고 삭제된 NOTAM의
+    DELETE 본문은 NEW 때 저장한 본문과 같아 압축 없이 건너뛴다.
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        bodies (Dict[str, str]): {body_hash: JSON 본문}
+
+    Returns:
+        int: 새로 저장한 바이트 수
+    """
+    hashes = list(bodies)
+    existing = set()
+    for i in range(0, len(hashes), _LOOKUP_CHUNK):
+        chunk = hashes[i:i + _LOOKUP_CHUNK]
+        cursor = conn.execute(
+            f"SELECT body_hash FROM notam_bodies WHERE body_hash IN ({','.join('?' * len(chunk))})", chunk)
+        existing.update(row[0] for row in cursor)
+
+    rows = []
+    for body_hash, text in bodies.items():
+        if body_hash not in existing:
+            rows.append((body_hash, _pack(text), len(text.encode('utf-8'))))
+    if rows:
+        conn.executemany(BODY_INSERT_SQL, rows)
+
+    return sum(_stored_size(row[1]) for row in rows)
+
+
+def text_delta(previous: str, current: str) -> List:
+    """
+    current에서 previous를 복원하는 연산 목록
+
+    NOTAM 수정은 대부분 한 구간만 바뀌므로 공통 접두/접미만 찾는다 (슬라이스 비교 이분 탐색).
+    [i1, i2]는 current[i1:i2] 복사, 문자열은 그대로 삽입.
+
+    Args:
+        previous (str): 이전 값
+        current (str): 현재 값
+
+    Returns:
+        List: 차이 연산
+    """
+    limit = min(len(previous), len(current))
+
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if previous[:mid] == current[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    prefix = low
+
+    low, high = 0, limit - prefix
+    while low < high:
+        mid = (low + high + 1) // 2
+        if previous[len(previous) - mid:] == current[len(current) - mid:]:
+            low = mid
+        else:
+            high = mid - 1
+    suffix = low
+
+    ops = []
+    if prefix:
+        ops.append([0, prefix])
+    if len(previous) - suffix > prefix:
+        ops.append(previous[prefix:len(previous) - suffix])
+    if suffix:
+        ops.append([len(current) - suffix, len(current)])
+    return ops
+
+
+def apply_delta(current: str, ops: List) -> str:
+    """text_delta() 역변환"""
+    return ''.join(current[op[0]:op[1]] if isinstance(op, list) else op for op in ops)
+
+
+def _encode_update(change_details: Dict) -> Dict:
+    """UPDATE 변경 필드 인코딩 (긴 텍스트의 이전 값은 차이 연산)"""
+    encoded = {}
+    for field, values in change_details.items():
+        if (isinstance(values, dict) and set(values) == {'previous', 'current'}
+                and isinstance(values['previous'], str) and isinstance(values['current'], str)
+                and len(values['previous']) >= DELTA_MIN_LENGTH):
+            ops = text_delta(values['previous'], values['current'])
+            if len(_dumps(ops)) < len(_dumps(values['previous'])):
+                encoded[field] = {'current': values['current'], 'delta': ops}
+                continue
+        encoded[field] = values
+    return encoded
+
+
+def _decode_update(payload: Dict) -> Dict:
+    """_encode_update() 역변환"""
+    decoded = {}
+    for field, values in payload.items():
+        if isinstance(values, dict) and 'delta' in values:
+            decoded[field] = {'previous': apply_delta(values['current'], values['delta']),
+                              'current': values['current']}
+        else:
+            decoded[field] = values
+    return decoded
+
+
+def encode_details(change_type: str, change_details: Dict) -> Tuple[object, Optional[Tuple[str, str]]]:
+    """
+    change_details 압축 인코딩
+
+    Args:
+        change_type (str): 'NEW', 'UPDATE', 'DELETE'
+        change_details (Dict): 기존 형식 변경 상세 ({'full_data': ...} 또는 필드별 이전/현재 값).
+            full_data는 NOTAM 필드만 저장하고 나머지 키(저장 행의 id, 시각 컬럼 등)는 버린다
+
+    Returns:
+        Tuple[object, Optional[Tuple[str, str]]]: (change_details 컬럼 값, (body_hash, 본문) 또는 None)
+    """
+    body = None
+    if set(change_details) == {'full_data'} and isinstance(change_details['full_data'], Mapping):
+        # NOTAM 필드만 저장: DELETE의 full_data는 저장된 행 전체 (id, crawl_timestamp, last_seen,
+        # parsed_data, epoch 컬럼 등) 이므로 그대로 두면 같은 NOTAM의 NEW 본문과 해시가 달라짐
+        body = encode_body(NOTAMRecord.from_mapping(change_details['full_data']).to_dict())
+        payload = {'body': body[0]}
+    elif change_type == 'UPDATE':
+        payload = _encode_update(change_details)
+    else:
+        payload = change_details
+
+    return _pack(_dumps(payload)), body
+
+
+def encode_events(events: Iterable[Tuple]) -> Tuple[List[Tuple], Dict[str, str]]:
+    """
+    변경 이벤트를 change_logs 행과 참조 본문으로 변환
+
+    Args:
+        events (Iterable[Tuple]): (timestamp, notam_no, location, data_source,
+            change_type, change_details, crawl_batch_id) 목록
+
+    Returns:
+        Tuple[List[Tuple], Dict[str, str]]: (CHANGE_LOG_INSERT_SQL 파라미터, {body_hash: 본문})
+    """
+    rows = []
+    bodies = {}
+    for timestamp, notam_no, location, data_source, change_type, change_details, crawl_batch_id in events:
+        payload, body = encode_details(change_type, change_details)
+        if body is not None:
+            bodies[body[0]] = body[1]
+        rows.append((timestamp, notam_no, location, data_source, change_type,
+                     payload, crawl_batch_id, COMPACT_ENCODING))
+    return rows, bodies
+
+
+def store_events(conn: sqlite3.Connection, events: Iterable[Tuple]) -> int:
+    """
+    변경 이벤트 기록 (트랜잭션은 호출 측에서 관리)
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        events (Iterable[Tuple]): encode_events()와 같은 형식의 이벤트
+
+    Returns:
+        int: 기록한 이벤트 수
+    """
+    rows, bodies = encode_events(events)
+    if bodies:
+        store_bodies(conn, bodies)
+    if rows:
+        conn.executemany(CHANGE_LOG_INSERT_SQL, rows)
+    return len(rows)
+
+
+def load_bodies(conn: sqlite3.Connection, body_hashes: Iterable[str]) -> Dict[str, Dict]:
+    """
+    본문 저장소 조회
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        body_hashes (Iterable[str]): 본문 해시
+
+    Returns:
+        Dict[str, Dict]: {body_hash: 레코드}
+    """
+    hashes = list(set(body_hashes))
+    bodies = {}
+    for i in range(0, len(hashes), _LOOKUP_CHUNK):
+        chunk = hashes[i:i + _LOOKUP_CHUNK]
+        cursor = conn.execute(
+            f"SELECT body_hash, body FROM notam_bodies WHERE body_hash IN ({','.join('?' * len(chunk))})", chunk)
+        for body_hash, body in cursor:
+            bodies[body_hash] = json.loads(_unpack(body))
+    return bodies
+
+
+def decode_details(conn: sqlite3.Connection, rows: List[Dict]) -> List[Dict]:
+    """
+    change_logs 행의 change_details를 기존 형식 딕셔너리로 복원 (행을 직접 갱신)
+
+    Args:
+        conn (sqlite3.Connection): 연결 (본문 저장소 조회용)
+        rows (List[Dict]): change_logs 행 (encoding, change_details 포함)
+
+    Returns:
+        List[Dict]: 같은 행 목록
+    """
+    pending = []
+    for row in rows:
+        value = row.get('change_details')
+        if value is None:
+            continue
+        try:
+            payload = json.loads(_unpack(value))
+        except (ValueError, zlib.error):
+            continue
+
+        if row.get('encoding') != COMPACT_ENCODING:
+            row['change_details'] = payload
+        elif isinstance(payload, dict) and set(payload) == {'body'}:
+            pending.append((row, payload['body']))
+        elif row.get('change_type') == 'UPDATE':
+            row['change_details'] = _decode_update(payload)
+        else:
+            row['change_details'] = payload
+
+    if pending:
+        bodies = load_bodies(conn, [body_hash for _, body_hash in pending])
+        for row, body_hash in pending:
+            row['change_details'] = {'full_data': bodies.get(body_hash)}
+
+    return rows
+
+
+def migrate_change_logs(conn: sqlite3.Connection, batch_size: int = 1000) -> Dict:
+    """
+    기존 JSON change_logs 행을 압축 인코딩으로 변환 (배치마다 커밋, 중단 후 재실행 가능)
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        batch_size (int): 한 번에 변환할 행 수
+
+    Returns:
+        Dict: rows, skipped, bytes_before, bytes_after (새로 저장한 본문 포함), saved_per_event
+    """
+    report = {'rows': 0, 'skipped': 0, 'bytes_before': 0, 'bytes_after': 0}
+    last_id = 0
+
+    while True:
+        batch = conn.execute('''
+            SELECT id, change_type, change_details FROM change_logs
+            WHERE encoding IS NULL AND id > ?
+            ORDER BY id LIMIT ?
+        ''', (last_id, int(batch_size))).fetchall()
+        if not batch:
+            break
+        last_id = batch[-1][0]
+
+        updates = []
+        bodies = {}
+        for row_id, change_type, change_details in batch:
+            try:
+                details = json.loads(change_details) if change_details is not None else None
+            except ValueError:
+                details = None
+            if not isinstance(details, dict):
+                report['skipped'] += 1
+                continue
+
+            payload, body = encode_details(change_type, details)
+            if body is not None:
+                bodies[body[0]] = body[1]
+            updates.append((payload, COMPACT_ENCODING, row_id))
+            report['bytes_before'] += len(change_details.encode('utf-8'))
+            report['bytes_after'] += _stored_size(payload)
+
+        if conn.in_transaction:
+            conn.commit()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            # 이미 저장된 본문은 추가 용량이 없으므로 새로 저장한 본문만 집계
+            report['bytes_after'] += store_bodies(conn, bodies)
+            conn.executemany('UPDATE change_logs SET change_details = ?, encoding = ? WHERE id = ?', updates)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        report['rows'] += len(updates)
+        logger.info(f"[PROGRESS] change_logs 변환: {report['rows']}개")
+
+    report['saved_per_event'] = ((report['bytes_before'] - report['bytes_after']) / report['rows']
+                                 if report['rows'] else 0.0)
+    return report
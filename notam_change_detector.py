@@ -6,17 +6,33 @@ NOTAM 변경 감지 시스템
   - 기존 NOTAM 업데이트 감지
   - NOTAM 상태 변경 감지 (ACTIVE -> CANCELLED 등)
   - 삭제/만료 NOTAM 감지
+  - 변경 로그 압축 인코딩 (notam_change_codec) 및 기존 로그 마이그레이션
+  - 시간별 변경 통계 집계 (notam_change_stats)
+  - 변경 이력 키셋(커서) 페이지 조회 및 change_details 지연 복원
 """
 
+import argparse
 import sqlite3
 import json
 import logging
 import sys
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional, Set
 from difflib import unified_diff
 
+from notam_change_codec import (CHANGE_LOG_INSERT_SQL, COMPACT_ENCODING, decode_details,
+                                encode_details, ensure_compact_schema, migrate_change_logs,
+                                store_bodies, store_events)
+from notam_change_stats import (ensure_stats_schema, query_change_stats, rebuild_change_stats,
+                                update_change_stats)
+from notam_db import (UPSERT_NOTAM_SQL, ConnectionManager, build_record_rows, content_hash,
+                      get_connection_manager, mark_seen)
+from notam_record import RECORD_FIELDS, NOTAMRecord
+
 # Windows 한국어 환경 인코딩 설정
 if sys.platform == 'win32':
     try:
@@ -39,22 +55,274 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def record_events(conn: sqlite3.Connection, events: List[Tuple]) -> int:
+    """
+    변경 로그와 시간별 통계 집계를 함께 기록 (트랜잭션은 호출 측에서 관리)
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        events (List[Tuple]): (timestamp, notam_no, location, data_source,
+            change_type, change_details, crawl_batch_id) 목록
+
+    Returns:
+        int: 기록한 이벤트 수
+    """
+    written = store_events(conn, events)
+    update_change_stats(conn, events)
+    return written
+
+
+CHANGE_LOG_COLUMNS = ('id', 'timestamp', 'notam_no', 'location', 'data_source',
+                      'change_type', 'change_details', 'crawl_batch_id', 'encoding')
+
+# 변경 이력 조회 필터별 정렬 인덱스 (필터 + timestamp 정렬, rowid(id)는 인덱스에 포함됨)
+# 커버링 인덱스가 아니다. 조회는 모든 컬럼을 읽으므로 반환하는 행마다 테이블을 한 번 찾아간다.
+# 필터 하나 + 키셋 조건이면 인덱스에서 읽는 행이 곧 반환 행이라 페이지 비용은 limit에만 비례한다.
+# 필터를 둘 이상 주면 첫 필터의 인덱스만 쓰고 나머지는 테이블 행에서 거른다.
+CHANGE_LOG_INDEXES = {
+    'idx_change_logs_timestamp': '(timestamp)',
+    'idx_change_logs_notam': '(notam_no, timestamp)',
+    'idx_change_logs_location': '(location, timestamp)',
+    'idx_change_logs_type': '(change_type, timestamp)',
+}
+
+
+class ChangeLogEntry:
+    """
+    change_logs 한 행 (change_details는 처음 접근할 때 복원)
+
+    페이지를 넘기기만 하는 호출 측은 압축 해제/JSON 파싱 비용을 내지 않는다.
+    entry['notam_no']처럼 딕셔너리 방식으로도 읽을 수 있다.
+    """
+
+    __slots__ = tuple(name for name in CHANGE_LOG_COLUMNS if name != 'change_details') + ('_raw', '_details', '_db')
+
+    _PENDING = object()
+
+    def __init__(self, row: sqlite3.Row, db: ConnectionManager):
+        """
+        초기화
+
+        Args:
+            row (sqlite3.Row): CHANGE_LOG_COLUMNS 순서의 change_logs 행
+            db (ConnectionManager): 본문 저장소 조회용 연결 관리자
+        """
+        for name, value in zip(CHANGE_LOG_COLUMNS, row):
+            if name == 'change_details':
+                self._raw = value
+            else:
+                setattr(self, name, value)
+        self._details = self._PENDING
+        self._db = db
+
+    @property
+    def change_details(self):
+        """기존 형식으로 복원한 change_details"""
+        if self._details is self._PENDING:
+            row = {'change_type': self.change_type, 'encoding': self.encoding, 'change_details': self._raw}
+            self._details = decode_details(self._db.get(), [row])[0]['change_details']
+            self._raw = None
+        return self._details
+
+    @property
+    def cursor(self) -> str:
+        """이 행 다음부터 이어서 조회하는 페이지 커서"""
+        return f'{self.timestamp}|{self.id}'
+
+    def __getitem__(self, key: str):
+        if key not in CHANGE_LOG_COLUMNS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self):
+        return CHANGE_LOG_COLUMNS
+
+    def to_dict(self) -> Dict:
+        """get_change_history()와 같은 형식의 딕셔너리"""
+        return {name: getattr(self, name) for name in CHANGE_LOG_COLUMNS}
+
+    def __repr__(self):
+        return f'ChangeLogEntry(id={self.id}, notam_no={self.notam_no!r}, change_type={self.change_type!r})'
+
+
+class ChangeLogWriter:
+    """
+    change_logs 일괄 기록기
+
+    process_changes() 한 번의 이벤트 전체를 하나의 트랜잭션 + executemany로 기록한다.
+    change_details는 notam_change_codec의 압축 인코딩으로 저장한다.
+    background=True이면 전용 스레드가 큐에서 꺼내 JSON 직렬화와 기록을 수행하고,
+    호출 측은 flush()로 기록 완료를 기다린다.
+    """
+
+    def __init__(self, db: ConnectionManager, background: bool = False):
+        """
+        초기화
+
+        Args:
+            db (ConnectionManager): 공용 연결 관리자
+            background (bool): 백그라운드 스레드에서 기록할지 여부
+        """
+        self.db = db
+        self.background = background
+        self.stats = {'events': 0, 'batches': 0, 'write_time': 0.0}
+        self._stats_lock = threading.Lock()
+        self._error = None
+        self._queue = None
+        self._thread = None
+
+        if background:
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run, name='change-log-writer', daemon=True)
+            self._thread.start()
+
+    def write(self, events: List[Tuple]) -> int:
+        """
+        이벤트 기록 (background 모드에서는 큐에 넣고 바로 반환)
+
+        Args:
+            events (List[Tuple]): (timestamp, notam_no, location, data_source,
+                change_type, change_details, crawl_batch_id) 목록
+
+        Returns:
+            int: 기록(또는 대기열에 추가)한 이벤트 수
+        """
+        if not events:
+            return 0
+
+        if self.background:
+            self._raise_pending_error()
+            self._queue.put(events)
+            return len(events)
+
+        return self._write_batch(events)
+
+    def _write_batch(self, events: List[Tuple]) -> int:
+        """이벤트 묶음을 단일 트랜잭션으로 기록"""
+        started = time.perf_counter()
+
+        conn = self.db.get()
+        if conn.in_transaction:
+            conn.commit()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            written = record_events(conn, events)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        with self._stats_lock:
+            self.stats['events'] += written
+            self.stats['batches'] += 1
+            self.stats['write_time'] += time.perf_counter() - started
+        return written
+
+    def _run(self):
+        """백그라운드 기록 루프 (None을 받으면 종료)"""
+        while True:
+            events = self._queue.get()
+            try:
+                if events is None:
+                    return
+                self._write_batch(events)
+            except Exception as e:
+                logger.error(f"[ERROR] 변경 로그 기록 실패 ({len(events)}건): {e}")
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_pending_error(self):
+        """백그라운드 스레드에서 발생한 오류를 호출 측으로 전달"""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def flush(self):
+        """대기 중인 이벤트가 모두 기록될 때까지 대기"""
+        if self.background:
+            self._queue.join()
+            self._raise_pending_error()
+
+    def get_stats(self) -> Dict:
+        """
+        기록 통계
+
+        Returns:
+            Dict: events, batches, write_time, events_per_sec
+        """
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['events_per_sec'] = stats['events'] / stats['write_time'] if stats['write_time'] else 0.0
+        return stats
+
+    def close(self):
+        """대기 중인 이벤트를 기록하고 백그라운드 스레드 종료"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+        if self._error is not None:
+            logger.error(f"[ERROR] 변경 로그 기록기 종료 시 미처리 오류: {self._error}")
+            self._error = None
+
+
 class NOTAMChangeDetector:
     """NOTAM 변경 감지 시스템"""
 
-    def __init__(self, db_name='notam_realtime.db'):
+    def __init__(self, db_name='notam_realtime.db', background_writes: bool = False):
         """
         초기화
 
         Args:
             db_name (str): SQLite 데이터베이스 파일명
+            background_writes (bool): 변경 로그를 백그라운드 스레드에서 기록할지 여부
         """
         self.db_name = db_name
-        self.conn = sqlite3.connect(db_name)
-        self.conn.row_factory = sqlite3.Row  # 딕셔너리 스타일 접근
+        # 프로세스 공용 연결 관리 (스레드별 연결, 크롤러/모니터와 공유)
+        self.db = get_connection_manager(db_name)
+        self.db.init_schema('change_logs', self._create_schema)
+        # 모니터가 국내/국제를 병렬 처리하므로 감지 + 로그 저장 직렬화용
+        self.lock = threading.RLock()
+        # process_changes()의 변경 로그 일괄 기록기
+        self.writer = ChangeLogWriter(self.db, background=background_writes)
 
         logger.info("[OK] NOTAM 변경 감지 시스템 초기화 완료")
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """현재 스레드의 DB 연결"""
+        return self.db.get()
+
+    def _cursor(self) -> sqlite3.Cursor:
+        """딕셔너리 스타일 접근 커서 (공유 연결의 row_factory는 바꾸지 않음)"""
+        cursor = self.conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        """change_logs / notam_bodies / change_stats_hourly 테이블 생성"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS change_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT,
+                notam_no TEXT,
+                location TEXT,
+                data_source TEXT,
+                change_type TEXT,
+                change_details TEXT,
+                crawl_batch_id INTEGER
+            )
+        ''')
+        # 압축 인코딩 본문 저장소 + encoding 컬럼 (기존 DB 마이그레이션)
+        ensure_compact_schema(conn)
+        # 시간별 통계 집계 (처음 생성 시 기존 이력으로 채움)
+        ensure_stats_schema(conn)
+        # 변경 이력 조회 인덱스
+        for index_name, columns in CHANGE_LOG_INDEXES.items():
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON change_logs {columns}')
+
     def get_previous_notams(self, data_source: Optional[str] = None) -> Dict[str, Dict]:
         """
         이전 크롤링에서 가져온 NOTAM 데이터 조회
@@ -63,36 +331,47 @@ class NOTAMChangeDetector:
             data_source (str, optional): 'domestic' 또는 'international'
 
         Returns:
-            Dict[str, Dict]: {notam_no: notam_data} 형식의 딕셔너리
+            Dict[str, NOTAMRecord]: {notam_no: notam_data} 형식의 딕셔너리
         """
         cursor = self.conn.cursor()
+        columns = ', '.join(RECORD_FIELDS)
 
         if data_source:
-            query = """
-                SELECT * FROM notam_records
+            query = f"""
+                SELECT {columns} FROM notam_records
                 WHERE data_source = ?
             """
             cursor.execute(query, (data_source,))
         else:
-            query = "SELECT * FROM notam_records"
+            query = f"SELECT {columns} FROM notam_records"
             cursor.execute(query)
 
+        # 행 복사 없이 레코드 생성 (컬럼 순서 = RECORD_FIELDS)
         notams = {}
-        for row in cursor.fetchall():
-            notam_no = row['notam_no']
-            notams[notam_no] = dict(row)
+        for row in cursor:
+            notam = NOTAMRecord(*row)
+            notams[notam.notam_no] = notam
 
         logger.debug(f"[INFO] 이전 NOTAM 데이터: {len(notams)}개")
         return notams
 
     def detect_changes(self, current_notams: List[Dict],
-                      data_source: str = 'domestic') -> Dict:
+                      data_source: str = 'domestic',
+                      scope: Optional[Dict] = None) -> Dict:
         """
         NOTAM 변경사항 감지
 
+        저장된 내용 해시(content_hash)로 현재 배치에 포함된 NOTAM만 조회하고,
+        해시가 다른 NOTAM만 필드 단위로 비교한다. 삭제 판정은 SQL에서 수행한다.
+
+        scope를 주면 삭제 판정을 그 조회 범위(발행 시각 구간, 공항, SERIES)에 저장된
+        NOTAM으로 한정한다. 없으면 소스 전체가 대상이다.
+
         Args:
             current_notams (List[Dict]): 현재 크롤링한 NOTAM 리스트
             data_source (str): 'domestic' 또는 'international'
+            scope (Dict, optional): 조회 범위 {'window_start', 'window_end' (datetime, UTC),
+                'airports', 'series' (None이면 전체)}
 
         Returns:
             Dict: 변경사항 정보
@@ -101,9 +380,6 @@ class NOTAMChangeDetector:
         logger.info(f"[START] {data_source.upper()} NOTAM 변경 감지")
         logger.info(f"{'='*70}\n")
 
-        # 이전 데이터 가져오기
-        previous_notams = self.get_previous_notams(data_source)
-
         # 현재 NOTAM을 딕셔너리로 변환
         current_notams_dict = {n['notam_no']: n for n in current_notams}
 
@@ -115,36 +391,46 @@ class NOTAMChangeDetector:
             'unchanged': 0    # 변경 없음
         }
 
+        # 배치 키와 내용 해시를 임시 테이블에 적재 (이전 데이터는 배치 키로만 조회)
+        self._load_batch(current_notams_dict)
+
+        # 해시가 같은 NOTAM은 필드 비교 없이 변경 없음
+        unchanged_nos = self._get_unchanged_notam_nos(data_source)
+
+        # 해시가 다른 NOTAM만 전체 행을 읽어 필드 비교
+        changed_previous = self._get_changed_previous_notams(data_source)
+
         # 1. 신규 및 업데이트 감지
         for notam_no, current_notam in current_notams_dict.items():
-            if notam_no not in previous_notams:
+            if notam_no in unchanged_nos:
+                changes['unchanged'] += 1
+                continue
+
+            previous_notam = changed_previous.get(notam_no)
+            if previous_notam is None:
                 # 신규 NOTAM
                 changes['new'].append(current_notam)
                 logger.info(f"[NEW] 신규 NOTAM: {notam_no} - {current_notam.get('location', 'N/A')}")
+                continue
+
+            # 기존 NOTAM - 변경 필드 확인
+            change_details = self.compare_notams(previous_notam, current_notam)
+
+            if change_details:
+                changes['updated'].append({
+                    'notam_no': notam_no,
+                    'previous': previous_notam,
+                    'current': current_notam,
+                    'changes': change_details
+                })
+                logger.info(f"[UPDATE] 업데이트: {notam_no} - {', '.join(change_details.keys())}")
             else:
-                # 기존 NOTAM - 변경 여부 확인
-                previous_notam = previous_notams[notam_no]
-                change_details = self.compare_notams(previous_notam, current_notam)
-
-                if change_details:
-                    changes['updated'].append({
-                        'notam_no': notam_no,
-                        'previous': previous_notam,
-                        'current': current_notam,
-                        'changes': change_details
-                    })
-                    logger.info(f"[UPDATE] 업데이트: {notam_no} - {', '.join(change_details.keys())}")
-                else:
-                    changes['unchanged'] += 1
-
-        # 2. 삭제/만료 감지
-        current_notam_nos = set(current_notams_dict.keys())
-        previous_notam_nos = set(previous_notams.keys())
-        deleted_notam_nos = previous_notam_nos - current_notam_nos
-
-        for notam_no in deleted_notam_nos:
-            changes['deleted'].append(previous_notams[notam_no])
-            logger.info(f"[DELETED] 삭제/만료: {notam_no}")
+                changes['unchanged'] += 1
+
+        # 2. 삭제/만료 감지 (조회 범위 안에서 배치에 없는 이전 NOTAM을 SQL에서 판정)
+        for previous_notam in self._get_missing_notams(data_source, scope):
+            changes['deleted'].append(previous_notam)
+            logger.info(f"[DELETED] 삭제/만료: {previous_notam['notam_no']}")
 
         # 요약
         logger.info(f"\n{'='*70}")
@@ -158,6 +444,70 @@ class NOTAMChangeDetector:
 
         return changes
 
+    def _load_batch(self, current_notams_dict: Dict[str, Dict]):
+        """현재 배치의 (notam_no, content_hash)를 연결 전용 임시 테이블에 적재"""
+        conn = self.conn
+        # apply_batch()가 연 트랜잭션 안이면 커밋하지 않음
+        owns_transaction = not conn.in_transaction
+        conn.execute('''
+            CREATE TEMP TABLE IF NOT EXISTS detect_batch (
+                notam_no TEXT PRIMARY KEY,
+                content_hash TEXT
+            )
+        ''')
+        conn.execute('DELETE FROM temp.detect_batch')
+        conn.executemany(
+            'INSERT OR REPLACE INTO temp.detect_batch (notam_no, content_hash) VALUES (?, ?)',
+            [(notam_no, content_hash(notam)) for notam_no, notam in current_notams_dict.items()])
+        # 임시 테이블만 변경했으므로 본 DB 잠금 없이 바로 커밋
+        if owns_transaction:
+            conn.commit()
+
+    def _get_unchanged_notam_nos(self, data_source: str) -> Set[str]:
+        """배치 중 저장된 해시와 같은 NOTAM 번호"""
+        # CROSS JOIN: 배치 쪽에서 notam_no 인덱스로 조회하도록 조인 순서 고정
+        cursor = self.conn.execute('''
+            SELECT b.notam_no FROM temp.detect_batch b
+            CROSS JOIN notam_records r ON r.notam_no = b.notam_no
+            WHERE r.data_source = ? AND r.content_hash = b.content_hash
+        ''', (data_source,))
+        return {row[0] for row in cursor}
+
+    def _get_changed_previous_notams(self, data_source: str) -> Dict[str, NOTAMRecord]:
+        """배치 중 저장된 해시와 다른 NOTAM의 이전 행 (해시 없는 구버전 행 포함)"""
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT {', '.join('r.' + field for field in RECORD_FIELDS)} FROM temp.detect_batch b
+            CROSS JOIN notam_records r ON r.notam_no = b.notam_no
+            WHERE r.data_source = ? AND r.content_hash IS NOT b.content_hash
+        ''', (data_source,))
+        return {notam.notam_no: notam for notam in (NOTAMRecord(*row) for row in cursor)}
+
+    def _get_missing_notams(self, data_source: str, scope: Optional[Dict] = None) -> List[Dict]:
+        """저장되어 있지만 현재 배치에 없는 NOTAM (삭제/만료 후보, scope 지정 시 조회 범위 안)"""
+        conditions = ['r.data_source = ?']
+        params = [data_source]
+
+        if scope is not None:
+            # issue_time은 'YYMMDDHHMM' 문자열 (idx_notam_records_scope 범위 조회)
+            conditions.append('r.issue_time >= ? AND r.issue_time < ?')
+            params += [scope['window_start'].strftime('%y%m%d%H%M'),
+                       scope['window_end'].strftime('%y%m%d%H%M')]
+            if scope.get('airports'):
+                conditions.append(f"r.location IN ({','.join('?' * len(scope['airports']))})")
+                params += scope['airports']
+            if scope.get('series'):
+                conditions.append(f"r.notam_type IN ({','.join('?' * len(scope['series']))})")
+                params += scope['series']
+
+        cursor = self._cursor()
+        cursor.execute(f'''
+            SELECT r.* FROM notam_records r
+            WHERE {' AND '.join(conditions)}
+              AND NOT EXISTS (SELECT 1 FROM temp.detect_batch b WHERE b.notam_no = r.notam_no)
+        ''', params)
+        return [dict(row) for row in cursor]
+
     def compare_notams(self, previous: Dict, current: Dict) -> Dict[str, Dict]:
         """
         두 NOTAM 데이터를 비교하여 변경사항 반환
@@ -208,33 +558,17 @@ class NOTAMChangeDetector:
         Returns:
             int: 변경 로그 ID
         """
-        cursor = self.conn.cursor()
-
-        # change_logs 테이블이 없으면 생성
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS change_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                notam_no TEXT,
-                location TEXT,
-                data_source TEXT,
-                change_type TEXT,
-                change_details TEXT,
-                crawl_batch_id INTEGER
-            )
-        ''')
-
-        # 변경 로그 저장
+        # 변경 로그 저장 (압축 인코딩, 전체 레코드는 본문 저장소 참조)
         timestamp = datetime.now().isoformat()
-        change_details_json = json.dumps(change_details, ensure_ascii=False)
+        payload, body = encode_details(change_type, change_details)
 
-        cursor.execute('''
-            INSERT INTO change_logs
-            (timestamp, notam_no, location, data_source, change_type,
-             change_details, crawl_batch_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (timestamp, notam_no, location, data_source, change_type,
-              change_details_json, crawl_batch_id))
+        cursor = self.conn.cursor()
+        if body is not None:
+            store_bodies(self.conn, dict([body]))
+        cursor.execute(CHANGE_LOG_INSERT_SQL, (timestamp, notam_no, location, data_source, change_type,
+                                               payload, crawl_batch_id, COMPACT_ENCODING))
+        update_change_stats(self.conn, [(timestamp, notam_no, location, data_source, change_type,
+                                         None, crawl_batch_id)])
 
         self.conn.commit()
 
@@ -257,172 +591,335 @@ class NOTAMChangeDetector:
         logger.info(f"[START] 변경사항 로그 저장")
         logger.info(f"{'='*70}\n")
 
-        saved_count = 0
+        events = self._build_events(changes, data_source, crawl_batch_id)
+
+        # 단일 트랜잭션 일괄 기록 (background 모드에서는 대기열에 추가)
+        saved_count = self.writer.write(events)
+
+        if self.writer.background:
+            logger.info(f"[OK] 변경 로그 {saved_count}개 기록 대기열 추가\n")
+        else:
+            logger.info(f"[OK] 변경 로그 {saved_count}개 저장 완료\n")
+
+        return {
+            'status': 'SUCCESS',
+            'saved_count': saved_count,
+            'queued': self.writer.background
+        }
+
+    @staticmethod
+    def _build_events(changes: Dict, data_source: str,
+                      crawl_batch_id: Optional[int] = None) -> List[Tuple]:
+        """detect_changes() 결과를 ChangeLogWriter 이벤트 목록으로 변환"""
+        # 크롤링 1회의 이벤트는 같은 시각으로 기록
+        timestamp = datetime.now().isoformat()
+        events = []
 
         # 1. 신규 NOTAM 로그
         for notam in changes['new']:
-            self.save_change_log(
-                notam_no=notam['notam_no'],
-                location=notam.get('location', 'UNKNOWN'),
-                change_type='NEW',
-                change_details={'full_data': notam},
-                data_source=data_source,
-                crawl_batch_id=crawl_batch_id
-            )
-            saved_count += 1
+            events.append((timestamp, notam['notam_no'], notam.get('location', 'UNKNOWN'),
+                           data_source, 'NEW', {'full_data': notam}, crawl_batch_id))
 
         # 2. 업데이트 NOTAM 로그
         for update in changes['updated']:
-            self.save_change_log(
-                notam_no=update['notam_no'],
-                location=update['current'].get('location', 'UNKNOWN'),
-                change_type='UPDATE',
-                change_details=update['changes'],
-                data_source=data_source,
-                crawl_batch_id=crawl_batch_id
-            )
-            saved_count += 1
+            events.append((timestamp, update['notam_no'], update['current'].get('location', 'UNKNOWN'),
+                           data_source, 'UPDATE', update['changes'], crawl_batch_id))
 
         # 3. 삭제/만료 NOTAM 로그
         for notam in changes['deleted']:
-            self.save_change_log(
-                notam_no=notam['notam_no'],
-                location=notam.get('location', 'UNKNOWN'),
-                change_type='DELETE',
-                change_details={'full_data': notam},
-                data_source=data_source,
-                crawl_batch_id=crawl_batch_id
-            )
-            saved_count += 1
+            events.append((timestamp, notam['notam_no'], notam.get('location', 'UNKNOWN'),
+                           data_source, 'DELETE', {'full_data': notam}, crawl_batch_id))
 
-        logger.info(f"[OK] 변경 로그 {saved_count}개 저장 완료\n")
+        return events
 
-        return {
-            'status': 'SUCCESS',
-            'saved_count': saved_count
-        }
+    def apply_batch(self, current_notams: List[Dict], data_source: str,
+                    crawl_timestamp: str, crawl_batch_id: Optional[int] = None,
+                    stats: Optional[Dict] = None, scope: Optional[Dict] = None) -> Dict:
+        """
+        파이프라인 모드: 수집한 배치를 저장 전 상태와 비교한 뒤 반영
 
-    def get_change_history(self, notam_no: Optional[str] = None,
-                          location: Optional[str] = None,
-                          change_type: Optional[str] = None,
-                          limit: int = 100) -> List[Dict]:
+        변경 감지 결과로 신규/변경 NOTAM만 notam_records에 upsert하고 (바뀌지 않은 NOTAM은 last_seen만 갱신),
+        같은 트랜잭션에서 변경 로그를 기록한다. 감지부터 커밋까지 쓰기 잠금을 유지하므로 비교 기준이
+        중간에 바뀌지 않는다.
+
+        Args:
+            current_notams (List[Dict]): 수집한 NOTAM 리스트
+            data_source (str): 'domestic' 또는 'international'
+            crawl_timestamp (str): 크롤링 타임스탬프
+            crawl_batch_id (int, optional): 크롤링 배치 ID
+            stats (Dict, optional): 전달 시 'inserted', 'updated', 'unchanged', 'logs_saved' 기록
+            scope (Dict, optional): 삭제 판정 범위 (detect_changes() 참고)
+
+        Returns:
+            Dict: detect_changes()와 같은 형식의 변경사항
         """
-        변경 이력 조회
+        current_notams = [n for n in current_notams if n.get('notam_no')]
+
+        with self.lock:
+            conn = self.conn
+            if conn.in_transaction:
+                conn.commit()
+
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                changes = self.detect_changes(current_notams, data_source, scope)
+
+                changed = changes['new'] + [update['current'] for update in changes['updated']]
+                if changed:
+                    conn.executemany(UPSERT_NOTAM_SQL,
+                                     build_record_rows(changed, data_source, crawl_timestamp))
+                # 바뀌지 않은 NOTAM은 마지막 수집 시각만 갱신
+                changed_nos = {notam['notam_no'] for notam in changed}
+                mark_seen(conn, {notam['notam_no'] for notam in current_notams} - changed_nos,
+                          crawl_timestamp)
+
+                events = self._build_events(changes, data_source, crawl_batch_id)
+                record_events(conn, events)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        if stats is not None:
+            stats.update({
+                'inserted': len(changes['new']),
+                'updated': len(changes['updated']),
+                'unchanged': changes['unchanged'],
+                'logs_saved': len(events)
+            })
+
+        logger.info(f"[OK] 파이프라인 반영: 기록 {len(changed)}개, 변경 로그 {len(events)}개")
+        return changes
+
+    def flush_change_logs(self):
+        """백그라운드 기록 대기 중인 변경 로그를 모두 기록"""
+        self.writer.flush()
+
+    def _query_change_logs(self, notam_no: Optional[str], location: Optional[str],
+                           change_type: Optional[str], limit: int,
+                           cursor: Optional[str] = None) -> List[sqlite3.Row]:
+        """
+        최신순 change_logs 조회 (필터별 정렬 인덱스 + (timestamp, id) 키셋)
+
+        CHANGE_LOG_INDEXES는 정렬 인덱스이므로 반환 행마다 테이블 조회가 한 번씩 일어난다.
+        change_details 복원(압축 해제/JSON 파싱)은 호출 측에서 필요할 때만 한다 (ChangeLogEntry).
 
         Args:
             notam_no (str, optional): NOTAM 번호로 필터
             location (str, optional): 위치로 필터
             change_type (str, optional): 변경 유형으로 필터
             limit (int): 최대 반환 개수
+            cursor (str, optional): 이전 페이지 마지막 행의 커서 (이 행 다음부터 조회)
 
         Returns:
-            List[Dict]: 변경 이력 리스트
+            List[sqlite3.Row]: CHANGE_LOG_COLUMNS 순서의 행
         """
-        cursor = self.conn.cursor()
+        # 백그라운드 기록 대기분까지 반영
+        self.writer.flush()
 
-        query = "SELECT * FROM change_logs WHERE 1=1"
+        conditions = []
         params = []
 
         if notam_no:
-            query += " AND notam_no = ?"
+            conditions.append("notam_no = ?")
             params.append(notam_no)
 
         if location:
-            query += " AND location = ?"
+            conditions.append("location = ?")
             params.append(location)
 
         if change_type:
-            query += " AND change_type = ?"
+            conditions.append("change_type = ?")
             params.append(change_type)
 
-        query += " ORDER BY timestamp DESC LIMIT ?"
-        params.append(limit)
+        if cursor:
+            timestamp, _, row_id = cursor.rpartition('|')
+            if not timestamp or not row_id.isdigit():
+                raise ValueError(f"잘못된 변경 이력 커서: {cursor!r}")
+            conditions.append("(timestamp, id) < (?, ?)")
+            params.extend([timestamp, int(row_id)])
 
-        cursor.execute(query, params)
+        query = f"SELECT {', '.join(CHANGE_LOG_COLUMNS)} FROM change_logs"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(int(limit))
 
-        results = []
-        for row in cursor.fetchall():
-            result = dict(row)
-            # JSON 파싱
-            if result.get('change_details'):
-                try:
-                    result['change_details'] = json.loads(result['change_details'])
-                except:
-                    pass
-            results.append(result)
+        return self._cursor().execute(query, params).fetchall()
 
-        return results
+    def get_change_history(self, notam_no: Optional[str] = None,
+                          location: Optional[str] = None,
+                          change_type: Optional[str] = None,
+                          limit: int = 100) -> List[Dict]:
+        """
+        변경 이력 조회
+
+        Args:
+            notam_no (str, optional): NOTAM 번호로 필터
+            location (str, optional): 위치로 필터
+            change_type (str, optional): 변경 유형으로 필터
+            limit (int): 최대 반환 개수
+
+        Returns:
+            List[Dict]: 변경 이력 리스트
+        """
+        rows = self._query_change_logs(notam_no, location, change_type, limit)
+
+        # 압축/기존 JSON 모두 기존 형식으로 복원 (본문 참조는 한 번에 조회)
+        results = [dict(row) for row in rows]
+        return decode_details(self.conn, results)
+
+    def get_change_history_page(self, notam_no: Optional[str] = None,
+                                location: Optional[str] = None,
+                                change_type: Optional[str] = None,
+                                limit: int = 100,
+                                cursor: Optional[str] = None) -> Dict:
+        """
+        변경 이력 페이지 조회 (키셋 페이지네이션, 페이지 위치와 무관하게 일정한 비용)
+
+        Args:
+            notam_no (str, optional): NOTAM 번호로 필터
+            location (str, optional): 위치로 필터
+            change_type (str, optional): 변경 유형으로 필터
+            limit (int): 페이지 크기
+            cursor (str, optional): 이전 페이지의 next_cursor
+
+        Returns:
+            Dict: entries (List[ChangeLogEntry], change_details 지연 복원),
+                next_cursor (다음 페이지가 없으면 None)
+        """
+        rows = self._query_change_logs(notam_no, location, change_type, limit + 1, cursor)
+
+        entries = [ChangeLogEntry(row, self.db) for row in rows[:limit]]
+        next_cursor = entries[-1].cursor if len(rows) > limit else None
+
+        return {'entries': entries, 'next_cursor': next_cursor}
 
     def get_change_stats(self, data_source: Optional[str] = None,
-                        hours: int = 24) -> Dict:
+                        hours: int = 24, location: Optional[str] = None) -> Dict:
         """
-        변경 통계 조회
+        변경 통계 조회 (change_stats_hourly 집계, 시간 단위 정밀도)
 
         Args:
             data_source (str, optional): 'domestic' 또는 'international'
-            hours (int): 최근 몇 시간
+            hours (int): 최근 몇 시간 (시작 시각이 속한 시간 전체 포함)
+            location (str, optional): 공항 코드
 
         Returns:
             Dict: 통계 정보
         """
-        cursor = self.conn.cursor()
-
-        # change_logs 테이블 존재 여부 확인
-        cursor.execute("""
-            SELECT name FROM sqlite_master
-            WHERE type='table' AND name='change_logs'
-        """)
-
-        if not cursor.fetchone():
-            # 테이블이 없으면 빈 통계 반환
-            return {}
+        # 백그라운드 기록 대기분까지 반영
+        self.writer.flush()
 
-        # 시간 필터 생성
         from datetime import timedelta
-        cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
+        since = datetime.now() - timedelta(hours=hours)
 
         try:
-            if data_source:
-                query = """
-                    SELECT change_type, COUNT(*) as count
-                    FROM change_logs
-                    WHERE data_source = ? AND timestamp >= ?
-                    GROUP BY change_type
-                """
-                cursor.execute(query, (data_source, cutoff_time))
-            else:
-                query = """
-                    SELECT change_type, COUNT(*) as count
-                    FROM change_logs
-                    WHERE timestamp >= ?
-                    GROUP BY change_type
-                """
-                cursor.execute(query, (cutoff_time,))
-
-            stats = {}
-            for row in cursor.fetchall():
-                stats[row['change_type']] = row['count']
-
-            return stats
+            return query_change_stats(self.conn, since, data_source, location)
 
         except Exception as e:
             logger.error(f"[ERROR] 통계 조회 오류: {e}")
             return {}
 
+    def rebuild_change_stats(self) -> int:
+        """
+        change_logs 전체 이력으로 시간별 통계 재구성
+
+        Returns:
+            int: 집계 행 수
+        """
+        self.writer.flush()
+
+        with self.lock:
+            conn = self.conn
+            if conn.in_transaction:
+                conn.commit()
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                rows = rebuild_change_stats(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        logger.info(f"[OK] 시간별 변경 통계 재구성: {rows}개 집계 행")
+        return rows
+
+    def migrate_change_logs(self, batch_size: int = 1000, vacuum: bool = False) -> Dict:
+        """
+        기존 JSON change_logs를 압축 인코딩으로 변환
+
+        Args:
+            batch_size (int): 한 번에 변환할 행 수
+            vacuum (bool): 변환 후 VACUUM으로 파일 크기 축소
+
+        Returns:
+            Dict: migrate_change_logs() 보고 (+ VACUUM 시 file_bytes_before/after)
+        """
+        self.writer.flush()
+
+        with self.lock:
+            conn = self.conn
+            if vacuum:
+                # WAL 내용을 본 파일에 반영한 뒤 크기 비교
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                file_before = os.path.getsize(self.db_name)
+
+            report = migrate_change_logs(conn, batch_size)
+
+            if vacuum:
+                conn.execute('VACUUM')
+                conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                report['file_bytes_before'] = file_before
+                report['file_bytes_after'] = os.path.getsize(self.db_name)
+
+        logger.info(f"[OK] change_logs 변환 {report['rows']}개: {report['bytes_before']:,} -> "
+                    f"{report['bytes_after']:,} bytes (이벤트당 {report['saved_per_event']:.0f} bytes 절감)")
+        return report
+
     def close(self):
         """데이터베이스 연결 종료"""
-        if self.conn:
-            self.conn.close()
+        self.writer.close()
+        self.db.close()
 
 
 def main():
-    """테스트용 메인 함수"""
-    # 테스트용으로 현재 DB의 NOTAM을 가져와서 변경 감지 시뮬레이션
-    detector = NOTAMChangeDetector()
+    """테스트용 메인 함수 (--migrate-change-logs: 기존 변경 로그 압축 변환, --rebuild-stats: 통계 재구성)"""
+    parser = argparse.ArgumentParser(description='NOTAM 변경 감지')
+    parser.add_argument('--db', default='notam_realtime.db', help='SQLite 데이터베이스 파일')
+    parser.add_argument('--migrate-change-logs', action='store_true',
+                        help='기존 JSON change_logs를 압축 인코딩으로 변환하고 절감량 출력')
+    parser.add_argument('--batch-size', type=int, default=1000, help='마이그레이션 배치 행 수')
+    parser.add_argument('--vacuum', action='store_true', help='마이그레이션 후 VACUUM 실행')
+    parser.add_argument('--rebuild-stats', action='store_true',
+                        help='change_logs 이력으로 시간별 변경 통계(change_stats_hourly) 재구성')
+    args = parser.parse_args()
+
+    detector = NOTAMChangeDetector(db_name=args.db)
+
+    if args.migrate_change_logs:
+        try:
+            report = detector.migrate_change_logs(args.batch_size, args.vacuum)
+            print(f"[SUMMARY] 변환 {report['rows']}개 (건너뜀 {report['skipped']}개)")
+            print(f"[SUMMARY] change_details {report['bytes_before']:,} -> {report['bytes_after']:,} bytes "
+                  f"(본문 저장소 포함), 이벤트당 {report['saved_per_event']:.0f} bytes 절감")
+            if args.vacuum:
+                print(f"[SUMMARY] DB 파일 {report['file_bytes_before']:,} -> {report['file_bytes_after']:,} bytes")
+        finally:
+            detector.close()
+        return
+
+    if args.rebuild_stats:
+        try:
+            rows = detector.rebuild_change_stats()
+            print(f"[SUMMARY] 시간별 변경 통계 {rows}개 집계 행 재구성")
+        finally:
+            detector.close()
+        return
 
     try:
         # 현재 DB의 NOTAM 가져오기 (테스트)
-        conn = sqlite3.connect('notam_realtime.db')
+        conn = sqlite3.connect(args.db)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
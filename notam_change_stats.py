@@ -0,0 +1,128 @@
+"""
+NOTAM 변경 통계 시간별 집계 (change_stats_hourly)
+작성일: 2026-10-17
+기능:
+  - 변경 이벤트 기록 시 시간/데이터 소스/공항/변경 유형별 카운터를 같은 트랜잭션에서 증분 갱신
+  - 통계 조회는 change_logs 전체 스캔 대신 집계 행 범위 조회
+  - 기존 change_logs 이력으로 집계 재구성
+"""
+
+import logging
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 집계 시간 키: ISO timestamp 앞 13자 ('YYYY-MM-DDTHH')
+HOUR_KEY_LENGTH = 13
+
+STATS_UPSERT_SQL = '''
+    INSERT INTO change_stats_hourly (hour, data_source, location, change_type, count)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(hour, data_source, location, change_type)
+    DO UPDATE SET count = count + excluded.count
+'''
+
+
+def hour_key(moment: datetime) -> str:
+    """시각의 집계 시간 키"""
+    return moment.strftime('%Y-%m-%dT%H')
+
+
+def rebuild_change_stats(conn: sqlite3.Connection) -> int:
+    """
+    change_logs 전체로 집계 재구성 (트랜잭션은 호출 측에서 관리)
+
+    Args:
+        conn (sqlite3.Connection): 연결
+
+    Returns:
+        int: 집계 행 수
+    """
+    conn.execute('DELETE FROM change_stats_hourly')
+    cursor = conn.execute(f'''
+        INSERT INTO change_stats_hourly (hour, data_source, location, change_type, count)
+        SELECT substr(timestamp, 1, {HOUR_KEY_LENGTH}), COALESCE(data_source, ''),
+               COALESCE(location, ''), change_type, COUNT(*)
+        FROM change_logs
+        WHERE timestamp IS NOT NULL AND change_type IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    ''')
+    return cursor.rowcount
+
+
+def ensure_stats_schema(conn: sqlite3.Connection):
+    """
+    change_stats_hourly 테이블 생성 (change_logs 생성 후, 처음 만들 때 기존 이력으로 채움)
+
+    Args:
+        conn (sqlite3.Connection): 연결
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_stats_hourly'").fetchone()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS change_stats_hourly (
+            hour TEXT NOT NULL,
+            data_source TEXT NOT NULL,
+            location TEXT NOT NULL,
+            change_type TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (hour, data_source, location, change_type)
+        ) WITHOUT ROWID
+    ''')
+
+    if not exists:
+        rows = rebuild_change_stats(conn)
+        if rows:
+            logger.info(f"[OK] 기존 change_logs로 시간별 통계 {rows}개 집계")
+
+
+def update_change_stats(conn: sqlite3.Connection, events: Iterable[Tuple]) -> int:
+    """
+    이벤트 묶음만큼 집계 카운터 증가 (change_logs 기록과 같은 트랜잭션에서 호출)
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        events (Iterable[Tuple]): (timestamp, notam_no, location, data_source,
+            change_type, change_details, crawl_batch_id) 목록
+
+    Returns:
+        int: 갱신한 집계 행 수
+    """
+    counts = Counter(
+        (timestamp[:HOUR_KEY_LENGTH], data_source or '', location or '', change_type)
+        for timestamp, _, location, data_source, change_type, _, _ in events
+    )
+    if counts:
+        conn.executemany(STATS_UPSERT_SQL, [key + (count,) for key, count in counts.items()])
+    return len(counts)
+
+
+def query_change_stats(conn: sqlite3.Connection, since: datetime,
+                       data_source: Optional[str] = None,
+                       location: Optional[str] = None) -> Dict[str, int]:
+    """
+    since가 속한 시간부터의 변경 유형별 건수 (시간 단위 정밀도)
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        since (datetime): 시작 시각
+        data_source (str, optional): 데이터 소스 필터
+        location (str, optional): 공항 필터
+
+    Returns:
+        Dict[str, int]: {change_type: 건수}
+    """
+    query = 'SELECT change_type, SUM(count) FROM change_stats_hourly WHERE hour >= ?'
+    params = [hour_key(since)]
+    if data_source:
+        query += ' AND data_source = ?'
+        params.append(data_source)
+    if location:
+        query += ' AND location = ?'
+        params.append(location)
+    query += ' GROUP BY change_type'
+
+    return {change_type: count for change_type, count in conn.execute(query, params)}
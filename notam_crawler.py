@@ -16,6 +16,11 @@ import logging
 import sys
 import os
 
+from notam_db import (build_record_rows, bulk_upsert_notams, ensure_content_hash_column,
+                      ensure_epoch_columns, ensure_last_seen_column, ensure_parsed_data_column,
+                      get_connection_manager)
+from notam_record import NOTAMRecord
+
 # Windows 한국어 환경 인코딩 설정
 if sys.platform == 'win32':
     try:
@@ -53,14 +58,20 @@ class NOTAMCrawler:
         # NOTAM SERIES 타입
         self.series_types = ['A', 'C', 'D', 'E', 'G', 'Z', 'S', 'N', 'O', 'W', 'T', 'A', 'M']
         
+        # 프로세스 공용 연결 관리 (API 크롤러/변경 감지와 같은 연결 재사용)
+        self.db = get_connection_manager(db_name)
+        
         self.setup_database()
         logger.info("[OK] NOTAM 크롤러 초기화 완료")
         logger.info(f"[INFO] 공항 수: {len(self.airports)}개")
         logger.info(f"[INFO] SERIES 타입: {', '.join(self.series_types)}")
     
     def setup_database(self):
-        """SQLite 데이터베이스 초기화"""
-        conn = sqlite3.connect(self.db_name)
+        """SQLite 데이터베이스 초기화 (프로세스당 한 번)"""
+        self.db.init_schema('notam_records_selenium', self._create_schema)
+    
+    def _create_schema(self, conn):
+        """notam_records / crawl_logs 테이블 생성"""
         cursor = conn.cursor()
         
         # NOTAM 데이터 테이블
@@ -68,6 +79,7 @@ class NOTAMCrawler:
             CREATE TABLE IF NOT EXISTS notam_records (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 crawl_timestamp TEXT,
+                last_seen TEXT,
                 data_source TEXT,
                 notam_type TEXT,
                 issue_time TEXT,
@@ -78,9 +90,23 @@ class NOTAMCrawler:
                 end_time TEXT,
                 full_text TEXT,
                 full_text_detail TEXT,
+                content_hash TEXT,
+                parsed_data TEXT,
+                parsed_version INTEGER,
+                issue_ts INTEGER,
+                start_ts INTEGER,
+                end_ts INTEGER,
+                end_perm INTEGER,
+                end_est INTEGER,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        ensure_content_hash_column(conn)
+        ensure_last_seen_column(conn)
+        ensure_parsed_data_column(conn)
+        ensure_epoch_columns(conn)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_active ON notam_records(end_ts, start_ts)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_issue_ts ON notam_records(issue_ts)')
         
         # 크롤링 로그 테이블
         cursor.execute('''
@@ -96,9 +122,6 @@ class NOTAMCrawler:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
-        conn.commit()
-        conn.close()
     
     def get_utc_time(self):
         """현재 UTC 시간 반환"""
@@ -260,7 +283,7 @@ class NOTAMCrawler:
         logger.info(f"SERIES 선택 완료: {success_count}/{len(all_series)}")
     
     def set_search_time(self, driver, hours_back=24):
-        """검색 시간 설정 (UTC 기준, HHMM 형식)"""
+        """검색 시간 설정 (UTC 기준, HHMM 형식), (시작, 종료) 구간 반환"""
         utc_now = self.get_utc_time()
         start_time = utc_now - timedelta(hours=hours_back)
 
@@ -300,6 +323,8 @@ class NOTAMCrawler:
             logger.error(f"[ERROR] 시간 설정 실패: {e}")
             import traceback
             logger.error(traceback.format_exc())
+
+        return start_time, utc_now
     
     def extract_notam_data(self, driver):
         """테이블에서 NOTAM 데이터 추출 (IBSheet API 사용)"""
@@ -368,7 +393,7 @@ class NOTAMCrawler:
 
             # 데이터 처리
             if 'data' in extraction_result:
-                notam_list = extraction_result['data']
+                notam_list = [NOTAMRecord.from_mapping(notam) for notam in extraction_result['data']]
                 logger.info(f"IBSheet에서 {len(notam_list)}개 NOTAM 추출 (총 {extraction_result.get('count', 0)}개 행)")
 
                 # 디버그: 처음 3개 샘플 출력
@@ -435,17 +460,17 @@ class NOTAMCrawler:
                         continue
 
                     # 기본 인덱스로 시도 (조정 가능)
-                    notam = {
-                        'notam_type': cell_texts[2] if len(cell_texts) > 2 else notam_type or '',
-                        'issue_time': cell_texts[3] if len(cell_texts) > 3 else '',
-                        'location': cell_texts[4] if len(cell_texts) > 4 else '',
-                        'notam_no': notam_no,
-                        'qcode': cell_texts[6] if len(cell_texts) > 6 else '',
-                        'start_time': cell_texts[7] if len(cell_texts) > 7 else '',
-                        'end_time': cell_texts[8] if len(cell_texts) > 8 else '',
-                        'full_text': cell_texts[9] if len(cell_texts) > 9 else '',
-                        'full_text_detail': cell_texts[10] if len(cell_texts) > 10 else ''
-                    }
+                    notam = NOTAMRecord(
+                        notam_type=cell_texts[2] if len(cell_texts) > 2 else notam_type or '',
+                        issue_time=cell_texts[3] if len(cell_texts) > 3 else '',
+                        location=cell_texts[4] if len(cell_texts) > 4 else '',
+                        notam_no=notam_no,
+                        qcode=cell_texts[6] if len(cell_texts) > 6 else '',
+                        start_time=cell_texts[7] if len(cell_texts) > 7 else '',
+                        end_time=cell_texts[8] if len(cell_texts) > 8 else '',
+                        full_text=cell_texts[9] if len(cell_texts) > 9 else '',
+                        full_text_detail=cell_texts[10] if len(cell_texts) > 10 else ''
+                    )
 
                     notam_list.append(notam)
                     logger.debug(f"Fallback 행 {idx}: NOTAM 추가됨 - {notam_no}")
@@ -460,41 +485,24 @@ class NOTAMCrawler:
         logger.info(f"Fallback: {len(notam_list)}개 NOTAM 추출 완료")
         return notam_list
     
-    def save_to_database(self, notam_list, data_source, crawl_timestamp):
-        """NOTAM 데이터를 DB에 저장"""
+    def save_to_database(self, notam_list, data_source, crawl_timestamp, stats=None):
+        """NOTAM 데이터를 DB에 저장 (내용 해시가 같은 NOTAM은 기록 생략)"""
         if not notam_list:
             return 0
         
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        saved_count = 0
+        rows = build_record_rows(notam_list, data_source, crawl_timestamp)
         
-        for notam in notam_list:
-            try:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO notam_records 
-                    (crawl_timestamp, data_source, notam_type, issue_time, location, 
-                     notam_no, qcode, start_time, end_time, full_text, full_text_detail)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    crawl_timestamp, data_source, notam['notam_type'], 
-                    notam['issue_time'], notam['location'], notam['notam_no'],
-                    notam['qcode'], notam['start_time'], notam['end_time'],
-                    notam['full_text'], notam['full_text_detail']
-                ))
-                if cursor.rowcount > 0:
-                    saved_count += 1
-            except Exception as e:
-                logger.error(f"DB 저장 오류: {e}")
-        
-        conn.commit()
-        conn.close()
+        try:
+            saved_count = bulk_upsert_notams(self.db.get(), rows, stats)
+        except Exception as e:
+            logger.error(f"DB 저장 오류: {e}")
+            saved_count = 0
         return saved_count
     
     def log_crawl(self, crawl_timestamp, data_source, status, records_found, 
                   records_saved, error_message=None, execution_time=0):
         """크롤링 로그 저장"""
-        conn = sqlite3.connect(self.db_name)
+        conn = self.db.get()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -506,7 +514,6 @@ class NOTAMCrawler:
               records_saved, error_message, execution_time))
         
         conn.commit()
-        conn.close()
     
     def close_modal_if_exists(self, driver):
         """모달 창이 있으면 닫기"""
@@ -549,8 +556,8 @@ class NOTAMCrawler:
             logger.warning(f"[WARN] 모달 처리 중 오류: {e}")
             return False
 
-    def crawl_notam(self, data_source='domestic', hours_back=24):
-        """NOTAM 크롤링 실행"""
+    def crawl_notam(self, data_source='domestic', hours_back=24, persist=None):
+        """NOTAM 크롤링 실행 (persist 전달 시 save_to_database 대신 사용)"""
         driver = None
         start_time = time.time()
         crawl_timestamp = datetime.now().isoformat()
@@ -610,7 +617,7 @@ class NOTAMCrawler:
             self.click_series_buttons(driver)
 
             # 검색 시간 설정
-            self.set_search_time(driver, hours_back=hours_back)
+            window_start, window_end = self.set_search_time(driver, hours_back=hours_back)
             
             # 검색 실행
             try:
@@ -630,8 +637,15 @@ class NOTAMCrawler:
             logger.info(f"[INFO] 추출된 NOTAM: {len(notam_list)}개")
             
             # DB 저장
-            saved_count = self.save_to_database(notam_list, data_source, crawl_timestamp)
-            logger.info(f"[INFO] DB 저장 완료: {saved_count}개")
+            save_stats = {}
+            if persist:
+                # 전체 공항/SERIES를 선택했으므로 조회 범위는 발행 시각 구간
+                scope = {'window_start': window_start, 'window_end': window_end,
+                         'airports': None, 'series': None}
+                saved_count = persist(notam_list, data_source, crawl_timestamp, save_stats, scope=scope)
+            else:
+                saved_count = self.save_to_database(notam_list, data_source, crawl_timestamp, save_stats)
+            logger.info(f"[INFO] DB 저장 완료: {saved_count}개 (변경 없음 {save_stats.get('unchanged', 0)}개)")
             
             # 실행 시간
             execution_time = time.time() - start_time
@@ -652,6 +666,9 @@ class NOTAMCrawler:
                 'status': 'SUCCESS',
                 'records_found': len(notam_list),
                 'records_saved': saved_count,
+                'records_inserted': save_stats.get('inserted', 0),
+                'records_updated': save_stats.get('updated', 0),
+                'records_unchanged': save_stats.get('unchanged', 0),
                 'execution_time': execution_time
             }
             
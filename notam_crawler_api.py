@@ -7,14 +7,27 @@
 import requests
 import sqlite3
 import time
+import io
 import json
 import logging
 import sys
 import os
+import re
+import threading
+import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pytz
+from requests.adapters import HTTPAdapter
+
+from notam_archive import RawResponseArchive
+from notam_db import (build_record_rows, bulk_upsert_notams, ensure_content_hash_column,
+                      ensure_epoch_columns, ensure_last_seen_column, ensure_parsed_data_column,
+                      get_connection_manager)
+from notam_rate_limiter import AdaptiveRateLimiter
+from notam_record import NOTAMRecord
 
 # Windows 한국어 환경 인코딩 설정
 if sys.platform == 'win32':
@@ -37,21 +50,292 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# searchAllNotam.do JSON 응답에서 행 배열이 담길 수 있는 키
+JSON_ROW_KEYS = ('DATA', 'data', 'items', 'rows', 'records')
+
+# IBSheet XML 응답의 행 / 셀 태그 (TR/TD 우선, 없으면 Row/Cell)
+XML_ROW_TAGS = ('TR', 'Row')
+
+# JSON 토큰 사이 공백 (json.decoder와 동일한 정의)
+_JSON_WS = re.compile(r'[ \t\n\r]*')
+
+
+def normalize_json_row(item: Dict) -> Optional[NOTAMRecord]:
+    """
+    API 응답 행을 NOTAM 딕셔너리로 매핑
+
+    AIS_TYPE: NOTAM 타입 (A, C, D, E, G, Z 등)
+    ISSUE_TIME: 발행 시간
+    LOCATION: 공항 코드
+    NOTAM_NO: NOTAM 번호
+    QCODE: Q 코드
+    EFFECTIVESTART: 시작 시간
+    EFFECTIVEEND: 종료 시간
+    ECODE: E 코드 (간략 설명)
+    FULL_TEXT: 전체 텍스트
+
+    Args:
+        item (Dict): API 응답 행
+
+    Returns:
+        Optional[NOTAMRecord]: NOTAM 데이터 (NOTAM NO가 없으면 None)
+    """
+    get = item.get
+    notam_no = get('NOTAM_NO')
+    # 숫자 셀 등 문자열이 아닌 값도 문자열로 비교 (나머지 필드는 NOTAMRecord가 변환)
+    if notam_no.__class__ is not str:
+        notam_no = str(notam_no) if notam_no else ''
+    if not notam_no.strip():
+        return None
+
+    return NOTAMRecord(
+        notam_type=get('AIS_TYPE') or get('SERIES'),
+        issue_time=get('ISSUE_TIME'),
+        location=get('LOCATION'),
+        notam_no=notam_no,
+        qcode=get('QCODE'),
+        start_time=get('EFFECTIVESTART'),
+        end_time=get('EFFECTIVEEND'),
+        full_text=get('ECODE'),
+        full_text_detail=get('FULL_TEXT')
+    )
+
+
+class IBSheetJSONStream:
+    """
+    searchAllNotam.do JSON 응답 단일 패스 스트리밍 파서
+
+    응답 바이트의 최상위 키를 순서대로 읽으면서 Total 값을 기록하고,
+    행 배열은 원소 단위로 디코딩해 정규화된 NOTAM으로 내보낸다.
+    원본 행 리스트 전체를 만들지 않으므로 디코딩은 응답당 한 번뿐이다.
+
+    행 배열은 기존 json.loads 경로와 같이 JSON_ROW_KEYS 우선순위에서 비어 있지 않은 첫 키를 쓴다.
+    최우선 키('DATA')는 바로 내보내고, 낮은 순위 키의 행은 문서 끝까지 더 높은 키가 없을 때만 내보낸다.
+
+    사용 예:
+        stream = IBSheetJSONStream(response.content)
+        notams = list(stream)
+        total = stream.total   # 순회 후 확정 (Total이 행 배열 뒤에 올 수 있음)
+    """
+
+    def __init__(self, body):
+        """
+        Args:
+            body (bytes | str): 응답 본문
+        """
+        if isinstance(body, (bytes, bytearray)):
+            body = body.decode(json.detect_encoding(body), 'surrogatepass')
+        if body.startswith('\ufeff'):
+            body = body[1:]
+
+        self.text = body
+        self.total = None
+        self.row_count = 0
+        self._items = 0
+        self._decoder = json.JSONDecoder()
+
+    def __iter__(self):
+        try:
+            yield from self._iter_document()
+        except IndexError:
+            raise ValueError('JSON 응답이 중간에 끊김') from None
+
+    def _iter_document(self):
+        text = self.text
+        ws = _JSON_WS.match
+        decode = self._decoder.raw_decode
+
+        idx = ws(text, 0).end()
+        if text[idx] == '[':
+            yield from self._iter_rows(idx)
+            return
+        if text[idx] != '{':
+            raise ValueError('JSON 객체/배열 응답이 아님')
+
+        idx = ws(text, idx + 1).end()
+        if text[idx] == '}':
+            return
+
+        # 지금까지 고른 행 키의 순위 (JSON_ROW_KEYS 인덱스)와 내보내지 않은 행
+        chosen_rank = len(JSON_ROW_KEYS)
+        pending = []
+        while True:
+            key, idx = decode(text, idx)
+            idx = ws(text, idx).end()
+            if text[idx] != ':':
+                raise ValueError(f'JSON 키 뒤 구분자 누락 (위치 {idx})')
+            idx = ws(text, idx + 1).end()
+
+            rank = JSON_ROW_KEYS.index(key) if key in JSON_ROW_KEYS else None
+            if rank is not None and rank < chosen_rank and text[idx] == '[':
+                rows = [] if rank else None
+                items_before = self._items
+                idx = yield from self._iter_rows(idx, rows)
+                # 기존 경로처럼 원소가 있는 배열만 선택 (NOTAM 번호가 없는 행만 있어도 선택)
+                if self._items > items_before:
+                    chosen_rank = rank
+                    pending = rows or []
+            elif rank is not None and rank < chosen_rank:
+                value, idx = decode(text, idx)
+                if value:
+                    # 배열이 아닌 값도 기존 경로에서는 선택되어 행이 없는 결과가 됨
+                    chosen_rank = rank
+                    pending = []
+            else:
+                value, idx = decode(text, idx)
+                if key == 'Total':
+                    self.total = int(value)
+
+            idx = ws(text, idx).end()
+            if text[idx] == ',':
+                idx = ws(text, idx + 1).end()
+            elif text[idx] == '}':
+                break
+            else:
+                raise ValueError(f'JSON 객체 구분자 오류 (위치 {idx})')
+
+        # 최우선 키가 없었으면 고른 배열의 행을 내보냄
+        if chosen_rank:
+            self.row_count = len(pending)
+            yield from pending
+
+    def _iter_rows(self, idx: int, collect: Optional[List] = None):
+        """
+        행 배열을 원소 단위로 디코딩 (배열 다음 위치 반환)
+
+        collect가 주어지면 NOTAM을 내보내지 않고 그 리스트에 모은다.
+        """
+        text = self.text
+        ws = _JSON_WS.match
+        decode = self._decoder.raw_decode
+
+        idx = ws(text, idx + 1).end()
+        if text[idx] == ']':
+            return idx + 1
+
+        while True:
+            item, idx = decode(text, idx)
+            self._items += 1
+            if isinstance(item, dict):
+                notam = normalize_json_row(item)
+                if notam is not None:
+                    if collect is not None:
+                        collect.append(notam)
+                    else:
+                        self.row_count += 1
+                        yield notam
+
+            idx = ws(text, idx).end()
+            if text[idx] == ',':
+                idx = ws(text, idx + 1).end()
+            elif text[idx] == ']':
+                return idx + 1
+            else:
+                raise ValueError(f'JSON 배열 구분자 오류 (위치 {idx})')
+
+
+class IBSheetXMLStream:
+    """
+    searchAllNotam.do XML 응답 스트리밍 파서 (ElementTree iterparse)
+
+    <TR> (없으면 <Row>) 요소가 닫힐 때마다 정규화된 NOTAM으로 내보내고, 그 요소를 비운 뒤
+    부모에서 떼어낸다. 문서 트리 전체를 만들지 않으므로 페이지 크기와 관계없이 파서 메모리가 일정하다.
+    행 태그는 처음 닫힌 행 태그(TR 또는 Row)로 고정한다.
+
+    사용 예:
+        stream = IBSheetXMLStream(response.content)
+        notams = list(stream)
+        total = stream.total   # <DATA TOTAL="..."> 값 (없으면 None)
+    """
+
+    def __init__(self, body):
+        """
+        Args:
+            body (bytes | str): 응답 본문
+        """
+        self.body = body
+        self.total = None
+        self.row_count = 0
+
+    def __iter__(self):
+        body = self.body
+        source = io.BytesIO(body) if isinstance(body, (bytes, bytearray)) else io.StringIO(body)
+
+        # 열린 요소 스택 (처리한 행을 부모에서 떼어내는 데 사용)
+        stack = []
+        row_tag = None
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                if row_tag is None and self.total is None and elem.attrib:
+                    total = elem.get('TOTAL') or elem.get('Total')
+                    if total and total.isdigit():
+                        self.total = int(total)
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            tag = elem.tag
+            if tag not in XML_ROW_TAGS or (row_tag is not None and tag != row_tag):
+                continue
+            row_tag = tag
+
+            cells = elem.findall('.//TD') or elem.findall('.//Cell')
+            # IBSheet 컬럼 구조: C1=순번, C2=TYPE, C3=ISSUE_TIME, C4=LOCATION, C5=NOTAM_NO, ...
+            if len(cells) >= 10:
+                notam = NOTAMRecord(*[cell.text or '' for cell in cells[1:10]])
+                # NOTAM NO가 있는 경우만
+                if notam.notam_no.strip():
+                    self.row_count += 1
+                    yield notam
+
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
 
 class NOTAMCrawlerAPI:
     """NOTAM API 직접 호출 크롤러 - 고성능 버전"""
 
-    def __init__(self, db_name='notam_realtime.db'):
+    def __init__(self, db_name='notam_realtime.db', max_concurrency: int = 4,
+                 watermark_overlap_minutes: int = 10,
+                 rate_limit: float = 5.0,
+                 min_rate: float = 0.5,
+                 max_rate: float = 20.0,
+                 archive_dir: Optional[str] = None,
+                 base_url: Optional[str] = None):
         """
         초기화
 
         Args:
             db_name (str): SQLite 데이터베이스 파일명
+            max_concurrency (int): 페이지 동시 요청 최대 개수
+            watermark_overlap_minutes (int): 증분 크롤링 시 워터마크 이전으로 겹쳐 요청할 시간 (분)
+            rate_limit (float): 초기 초당 요청 수 (응답 상태에 따라 자동 조정)
+            min_rate (float): 최소 초당 요청 수
+            max_rate (float): 최대 초당 요청 수
+            archive_dir (str, optional): 지정 시 페이지 응답 원문을 압축 보관 (재처리용)
+            base_url (str, optional): AIM 서버 주소 (기본: NOTAM_API_BASE_URL 환경변수 또는 aim.koca.go.kr)
         """
-        self.base_url = 'https://aim.koca.go.kr'
+        self.base_url = (base_url or os.environ.get('NOTAM_API_BASE_URL') or
+                         'https://aim.koca.go.kr').rstrip('/')
         self.search_endpoint = f'{self.base_url}/xNotam/searchAllNotam.do'
         self.db_name = db_name
 
+        # 페이지네이션 설정 (ibsheetRowPerPage)
+        self.page_size = 100
+        self.max_concurrency = max(1, int(max_concurrency))
+
+        # 증분 크롤링 워터마크 겹침 구간
+        self.watermark_overlap = timedelta(minutes=watermark_overlap_minutes)
+
+        # 인스턴스의 모든 요청이 공유하는 적응형 속도 제한 (고정 sleep/백오프 대체)
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=rate_limit,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            burst=self.max_concurrency
+        )
+
         # 한국 공항 코드 + FIR 코드 (19개)
         # RKRR = 인천 FIR (E/D 시리즈 NOTAM 포함)
         self.airports = [
@@ -78,6 +362,20 @@ class NOTAMCrawlerAPI:
             'Connection': 'keep-alive'
         })
 
+        # 동시 페이지 요청 수만큼 연결 풀 확보 (국내/국제 병렬 크롤링 고려해 2배)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency * 2)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # 국내/국제 병렬 크롤링 시 SQLite 쓰기 직렬화
+        self.db_lock = threading.Lock()
+
+        # 원본 응답 보관소 (선택)
+        self.archive = RawResponseArchive(archive_dir) if archive_dir else None
+
+        # 프로세스 공용 연결 관리 (변경 감지/모니터와 같은 연결 재사용)
+        self.db = get_connection_manager(db_name)
+
         # 데이터베이스 초기화
         self.setup_database()
 
@@ -86,8 +384,11 @@ class NOTAMCrawlerAPI:
         logger.info(f"[INFO] SERIES 타입: {', '.join(self.series_types)}")
 
     def setup_database(self):
-        """SQLite 데이터베이스 초기화 (기존 구조와 호환)"""
-        conn = sqlite3.connect(self.db_name)
+        """SQLite 데이터베이스 초기화 (기존 구조와 호환, 프로세스당 한 번)"""
+        self.db.init_schema('notam_records', self._create_schema)
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        """notam_records / crawl_logs 테이블, 인덱스 생성 및 마이그레이션"""
         cursor = conn.cursor()
 
         # Monitor and change-detection code expects the same local schema
@@ -96,6 +397,7 @@ class NOTAMCrawlerAPI:
             CREATE TABLE IF NOT EXISTS notam_records (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 crawl_timestamp TEXT,
+                last_seen TEXT,
                 data_source TEXT,
                 notam_type TEXT,
                 issue_time TEXT,
@@ -106,15 +408,40 @@ class NOTAMCrawlerAPI:
                 end_time TEXT,
                 full_text TEXT,
                 full_text_detail TEXT,
+                content_hash TEXT,
+                parsed_data TEXT,
+                parsed_version INTEGER,
+                issue_ts INTEGER,
+                start_ts INTEGER,
+                end_ts INTEGER,
+                end_perm INTEGER,
+                end_est INTEGER,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
 
+        # 변경 없는 NOTAM 쓰기 생략용 내용 해시 (기존 DB 마이그레이션)
+        ensure_content_hash_column(conn)
+        # 마지막 수집 시각 (변경 없는 NOTAM은 이 컬럼만 갱신, 기존 DB 마이그레이션)
+        ensure_last_seen_column(conn)
+        # Q) 행/항목 파싱 결과 (기존 DB 마이그레이션, 파서 버전이 바뀌면 다시 파싱)
+        ensure_parsed_data_column(conn)
+        # UTC epoch 시각 + PERM/EST 플래그 (기존 DB 마이그레이션)
+        ensure_epoch_columns(conn)
+
         # 인덱스 생성
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_location ON notam_records(location)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_issue_time ON notam_records(issue_time)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_end_time ON notam_records(end_time)')
+        # 유효 구간 조회 (end_ts 범위 + start_ts 인덱스 내 필터), 발행 시각 범위 조회
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_active ON notam_records(end_ts, start_ts)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_issue_ts ON notam_records(issue_ts)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_qcode ON notam_records(qcode)')
+        # 변경 감지 배치 조회 (소스별 NOTAM 번호)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_source ON notam_records(data_source, notam_no)')
+        # 삭제 판정 후보 범위 조회 (소스 + 발행 시각 구간, 공항/SERIES는 인덱스 안에서 필터)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notam_records_scope '
+                       'ON notam_records(data_source, issue_time, location, notam_type)')
 
         # 크롤링 로그 테이블
         cursor.execute('''
@@ -131,8 +458,14 @@ class NOTAMCrawlerAPI:
             )
         ''')
 
-        conn.commit()
-        conn.close()
+        # 증분 크롤링 워터마크용 검색 구간 컬럼 (UTC ISO 문자열, 기존 DB 마이그레이션)
+        cursor.execute('PRAGMA table_info(crawl_logs)')
+        crawl_log_columns = {row[1] for row in cursor.fetchall()}
+        for column in ('window_start', 'window_end'):
+            if column not in crawl_log_columns:
+                cursor.execute(f'ALTER TABLE crawl_logs ADD COLUMN {column} TEXT')
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_crawl_logs_source ON crawl_logs(data_source, id)')
 
     def get_utc_time(self) -> datetime:
         """현재 UTC 시간 반환"""
@@ -141,7 +474,9 @@ class NOTAMCrawlerAPI:
     def get_search_payload(self, data_source: str = 'domestic',
                           hours_back: int = 2,
                           start_date: datetime = None,
-                          end_date: datetime = None) -> Dict[str, str]:
+                          end_date: datetime = None,
+                          airports: Optional[List[str]] = None,
+                          series: Optional[List[str]] = None) -> Dict[str, str]:
         """
         검색 API 요청 페이로드 생성
 
@@ -150,6 +485,8 @@ class NOTAMCrawlerAPI:
             hours_back (int): 과거 몇 시간부터 검색할지 (start_date가 없을 때)
             start_date (datetime): 명시적 시작 날짜 (선택)
             end_date (datetime): 명시적 종료 날짜 (선택)
+            airports (List[str], optional): 검색 공항 (기본: 전체 공항)
+            series (List[str], optional): 검색 SERIES (기본: 전체 SERIES, SNOWTAM 포함 가능)
 
         Returns:
             Dict[str, str]: API 요청 파라미터
@@ -165,11 +502,12 @@ class NOTAMCrawlerAPI:
         # 국내/국제 구분 ('D' 또는 'I')
         inorout = 'D' if data_source == 'domestic' else 'I'
 
-        # 모든 공항을 ,로 구분하여 전달
-        airport_str = ','.join(self.airports)
+        # 공항을 ,로 구분하여 전달
+        airport_str = ','.join(airports or self.airports)
 
         # SERIES 타입 (SNOWTAM 제외하고 전달)
-        series_str = ','.join([s for s in self.series_types if s != 'SNOWTAM'])
+        series = series or self.series_types
+        series_str = ','.join([s for s in series if s != 'SNOWTAM'])
 
         payload = {
             'sch_inorout': inorout,
@@ -179,7 +517,7 @@ class NOTAMCrawlerAPI:
             'sch_to_date': utc_now.strftime('%Y-%m-%d'),
             'sch_to_time': utc_now.strftime('%H%M'),
             'sch_series': series_str,
-            'sch_snow_series': 'SNOWTAM',  # 설빙고시보 별도 필드
+            'sch_snow_series': 'SNOWTAM' if 'SNOWTAM' in series else '',  # 설빙고시보 별도 필드
             'sch_notam_no': '',
             'sch_elevation_min': '',
             'sch_elevation_max': '',
@@ -222,50 +560,52 @@ class NOTAMCrawlerAPI:
 
         return notam_list
 
+    def parse_response_body(self, body: bytes) -> Tuple[List[Dict[str, str]], Optional[int]]:
+        """
+        응답 본문 파싱 (JSON / XML은 단일 패스 스트리밍, 그 외는 parse_ibsheet_response)
+
+        Args:
+            body (bytes): 응답 본문 바이트
+
+        Returns:
+            Tuple[List[Dict[str, str]], Optional[int]]: (NOTAM 리스트, Total 값)
+        """
+        # UTF-8 BOM이 있으면 첫 글자로 형식을 판별할 수 없음
+        if body.startswith(b'\xef\xbb\xbf'):
+            body = body[3:]
+
+        if body.lstrip()[:1] in (b'{', b'['):
+            stream = IBSheetJSONStream(body)
+            try:
+                return list(stream), stream.total
+            except ValueError as e:
+                logger.debug(f"[DEBUG] JSON 스트리밍 파싱 실패, 기존 방식 사용: {e}")
+
+        elif b'<TR>' in body or b'<Data>' in body:
+            stream = IBSheetXMLStream(body)
+            try:
+                return list(stream), stream.total
+            except ET.ParseError as e:
+                logger.debug(f"[DEBUG] XML 스트리밍 파싱 실패, 기존 방식 사용: {e}")
+
+        # 스트리밍 파싱 실패 시 기존 방식 사용
+        text = body.decode('utf-8', 'replace')
+        return self.parse_ibsheet_response(text), None
+
     def _parse_xml_response(self, xml_text: str) -> List[Dict[str, str]]:
         """
-        XML 형식 IBSheet 응답 파싱
+        XML 형식 IBSheet 응답 파싱 (IBSheetXMLStream)
 
         Args:
             xml_text (str): XML 응답 텍스트
 
         Returns:
-            List[Dict[str, str]]: NOTAM 데이터 리스트
+            List[Dict[str, str]]: NOTAM 데이터 리스트 (XML 오류 시 빈 리스트)
         """
         notam_list = []
 
         try:
-            import xml.etree.ElementTree as ET
-
-            # XML 파싱
-            root = ET.fromstring(xml_text)
-
-            # <TR> 또는 <Row> 태그 찾기
-            rows = root.findall('.//TR') or root.findall('.//Row')
-
-            for row in rows:
-                cells = row.findall('.//TD') or row.findall('.//Cell')
-
-                if len(cells) < 10:
-                    continue
-
-                # IBSheet 컬럼 구조에 맞춰 데이터 추출
-                # C2=TYPE, C3=ISSUE_TIME, C4=LOCATION, C5=NOTAM_NO, etc.
-                notam = {
-                    'notam_type': cells[1].text or '' if len(cells) > 1 else '',
-                    'issue_time': cells[2].text or '' if len(cells) > 2 else '',
-                    'location': cells[3].text or '' if len(cells) > 3 else '',
-                    'notam_no': cells[4].text or '' if len(cells) > 4 else '',
-                    'qcode': cells[5].text or '' if len(cells) > 5 else '',
-                    'start_time': cells[6].text or '' if len(cells) > 6 else '',
-                    'end_time': cells[7].text or '' if len(cells) > 7 else '',
-                    'full_text': cells[8].text or '' if len(cells) > 8 else '',
-                    'full_text_detail': cells[9].text or '' if len(cells) > 9 else ''
-                }
-
-                # NOTAM NO가 있는 경우만 추가
-                if notam['notam_no'] and notam['notam_no'].strip():
-                    notam_list.append(notam)
+            notam_list = list(IBSheetXMLStream(xml_text))
 
         except Exception as e:
             logger.error(f"[ERROR] XML 파싱 오류: {e}")
@@ -293,38 +633,14 @@ class NOTAMCrawlerAPI:
                 items = data
             elif isinstance(data, dict):
                 # 가능한 키: 'DATA', 'data', 'items', 'rows', 'records' 등
-                items = (data.get('DATA') or data.get('data') or
-                        data.get('items') or data.get('rows') or
-                        data.get('records') or [])
+                items = next((data[key] for key in JSON_ROW_KEYS if data.get(key)), [])
             else:
                 items = []
 
             for item in items:
                 if isinstance(item, dict):
-                    # API 응답 필드명 매핑
-                    # AIS_TYPE: NOTAM 타입 (A, C, D, E, G, Z 등)
-                    # ISSUE_TIME: 발행 시간
-                    # LOCATION: 공항 코드
-                    # NOTAM_NO: NOTAM 번호
-                    # QCODE: Q 코드
-                    # EFFECTIVESTART: 시작 시간
-                    # EFFECTIVEEND: 종료 시간
-                    # ECODE: E 코드 (간략 설명)
-                    # FULL_TEXT: 전체 텍스트
-
-                    notam = {
-                        'notam_type': item.get('AIS_TYPE') or item.get('SERIES') or '',
-                        'issue_time': item.get('ISSUE_TIME') or '',
-                        'location': item.get('LOCATION') or '',
-                        'notam_no': item.get('NOTAM_NO') or '',
-                        'qcode': item.get('QCODE') or '',
-                        'start_time': item.get('EFFECTIVESTART') or '',
-                        'end_time': item.get('EFFECTIVEEND') or '',
-                        'full_text': item.get('ECODE') or '',
-                        'full_text_detail': item.get('FULL_TEXT') or ''
-                    }
-
-                    if notam['notam_no'] and notam['notam_no'].strip():
+                    notam = normalize_json_row(item)
+                    if notam is not None:
                         notam_list.append(notam)
 
         except Exception as e:
@@ -332,172 +648,561 @@ class NOTAMCrawlerAPI:
 
         return notam_list
 
+    def _fetch_page(self, payload: Dict[str, str], page: int,
+                    archive_ctx: Optional[Dict] = None) -> Tuple[List[Dict[str, str]], Optional[int], float]:
+        """
+        단일 페이지 요청 및 파싱
+
+        Args:
+            payload (Dict[str, str]): 검색 페이로드 (페이지 파라미터 제외)
+            page (int): ibsheetPageNo
+            archive_ctx (Dict, optional): 원문 보관 키 {'crawl_timestamp', 'data_source', 'shard'}
+
+        Returns:
+            Tuple[List[Dict[str, str]], Optional[int], float]: (NOTAM 리스트, Total 값, 응답 지연(초))
+        """
+        # 스레드 간 공유되지 않도록 페이지별 페이로드 복사
+        page_payload = dict(payload)
+        page_payload['ibsheetPageNo'] = str(page)
+        page_payload['ibsheetRowPerPage'] = str(self.page_size)
+
+        self.rate_limiter.acquire()
+
+        started = time.perf_counter()
+        try:
+            response = self.session.post(
+                self.search_endpoint,
+                data=page_payload,
+                timeout=30,
+                allow_redirects=True
+            )
+        except requests.exceptions.Timeout:
+            self.rate_limiter.record_timeout()
+            raise
+        except requests.exceptions.RequestException:
+            self.rate_limiter.record_error()
+            raise
+        latency = time.perf_counter() - started
+
+        # 2xx만 정상 응답으로 속도를 올림 (403/404/400 등은 속도 유지, 2xx는 본문 해석 후 기록)
+        if response.status_code == 429:
+            self.rate_limiter.record_throttle(self._parse_retry_after(response))
+        elif response.status_code >= 500:
+            self.rate_limiter.record_server_error()
+        elif not 200 <= response.status_code < 300:
+            self.rate_limiter.record_client_error()
+
+        response.raise_for_status()
+
+        logger.debug(f"[API] 페이지 {page} 응답 코드: {response.status_code} ({latency:.3f}초)")
+
+        body = response.content
+        if self.archive and archive_ctx:
+            try:
+                self.archive.store(
+                    body, archive_ctx['crawl_timestamp'], archive_ctx['data_source'], page,
+                    shard=archive_ctx.get('shard', 0),
+                    window_start=f"{payload['sch_from_date']} {payload['sch_from_time']}",
+                    window_end=f"{payload['sch_to_date']} {payload['sch_to_time']}")
+            except OSError as e:
+                logger.warning(f"[WARN] 응답 원문 보관 실패 (페이지 {page}): {e}")
+
+        try:
+            notams, total_records = self.parse_response_body(body)
+        except Exception:
+            self.rate_limiter.record_invalid_response()
+            raise
+        self.rate_limiter.record_success(latency)
+        return notams, total_records, latency
+
+    @staticmethod
+    def _parse_retry_after(response) -> Optional[float]:
+        """Retry-After 헤더 (초 단위만 지원)"""
+        value = response.headers.get('Retry-After')
+        try:
+            return float(value) if value else None
+        except ValueError:
+            return None
+
+    def _fetch_page_with_retry(self, payload: Dict[str, str], page: int,
+                               max_retries: int,
+                               retried_pages: Dict[int, int],
+                               archive_ctx: Optional[Dict] = None) -> Tuple[List[Dict[str, str]], Optional[int], float]:
+        """
+        페이지 단위 재시도 (페이지별 독립 백오프)
+
+        Args:
+            payload (Dict[str, str]): 검색 페이로드
+            page (int): ibsheetPageNo
+            max_retries (int): 페이지당 최대 시도 횟수
+            retried_pages (Dict[int, int]): 재시도한 페이지 기록 {페이지: 시도 횟수}
+            archive_ctx (Dict, optional): 원문 보관 키
+
+        Returns:
+            Tuple[List[Dict[str, str]], Optional[int], float]: _fetch_page() 결과
+
+        Raises:
+            requests.exceptions.RequestException: 재시도 횟수 초과
+            Exception: 응답 해석 실패 등 (재시도하지 않음)
+        """
+        for attempt in range(1, max_retries + 1):
+            try:
+                result = self._fetch_page(payload, page, archive_ctx)
+                if attempt > 1:
+                    retried_pages[page] = attempt
+                return result
+
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"[WARN] 페이지 {page} 요청 실패 (시도 {attempt}/{max_retries}): {e}")
+
+                if attempt >= max_retries:
+                    retried_pages[page] = attempt
+                    e.notam_page = page
+                    raise
+
+                # 대기 시간은 현재 허용 속도 기준 (서버 상태가 나쁠수록 길어짐)
+                wait_time = self.rate_limiter.retry_delay(attempt)
+                logger.info(f"[INFO] 페이지 {page}: {wait_time:.1f}초 후 재시도 "
+                            f"(허용 속도 {self.rate_limiter.rate:.2f}회/초)")
+                time.sleep(wait_time)
+
+            except Exception as e:
+                # 재시도해도 같은 결과이므로 바로 실패 처리 (실패 페이지는 fetch_notam_data 통계에 기록)
+                retried_pages[page] = attempt
+                e.notam_page = page
+                raise
+
+    def _fetch_pages_concurrently(self, payload: Dict[str, str], pages: List[int],
+                                  page_timings: List[Dict], max_retries: int,
+                                  retried_pages: Dict[int, int],
+                                  archive_ctx: Optional[Dict] = None,
+                                  page_executor: Optional[ThreadPoolExecutor] = None) -> Dict[int, List[Dict[str, str]]]:
+        """
+        나머지 페이지 동시 요청 (max_concurrency 제한)
+
+        Args:
+            payload (Dict[str, str]): 검색 페이로드
+            pages (List[int]): 요청할 페이지 번호 목록
+            page_timings (List[Dict]): 페이지별 지연 기록 (결과 추가)
+            max_retries (int): 페이지당 최대 시도 횟수
+            retried_pages (Dict[int, int]): 재시도한 페이지 기록
+            archive_ctx (Dict, optional): 원문 보관 키
+            page_executor (ThreadPoolExecutor, optional): 공유 페이지 실행기 (없으면 이 호출 전용 풀 생성)
+
+        Returns:
+            Dict[int, List[Dict[str, str]]]: {페이지 번호: NOTAM 리스트}
+        """
+        results = {}
+        own_executor = page_executor is None
+        executor = page_executor or ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(pages)), thread_name_prefix='notam-page')
+
+        futures = {}
+        try:
+            for page in pages:
+                futures[executor.submit(self._fetch_page_with_retry, payload, page, max_retries,
+                                        retried_pages, archive_ctx)] = page
+
+            for future in as_completed(futures):
+                page = futures[future]
+                notams, _, latency = future.result()
+                results[page] = notams
+                page_timings.append({'page': page, 'records': len(notams), 'latency': latency})
+                logger.info(f"[API] 페이지 {page}: {len(notams)}개 NOTAM 추출 ({latency:.2f}초)")
+        except Exception:
+            # 한 페이지가 최종 실패하면 대기 중인 페이지는 요청하지 않음
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True)
+
+        return results
+
     def fetch_notam_data(self, data_source: str = 'domestic',
                         hours_back: int = 2,
                         start_date: datetime = None,
                         end_date: datetime = None,
-                        max_retries: int = 3) -> Tuple[List[Dict[str, str]], Optional[str]]:
+                        max_retries: int = 3,
+                        stats: Optional[Dict] = None,
+                        airports: Optional[List[str]] = None,
+                        series: Optional[List[str]] = None,
+                        crawl_timestamp: Optional[str] = None,
+                        shard: int = 0,
+                        page_executor: Optional[ThreadPoolExecutor] = None) -> Tuple[List[Dict[str, str]], Optional[str]]:
         """
         NOTAM 데이터 API 호출 및 가져오기
 
+        첫 페이지의 Total 값으로 전체 페이지 수를 계산한 뒤 나머지 페이지는
+        max_concurrency 범위 내에서 동시에 요청하고, 페이지 순서대로 병합한다.
+        재시도는 페이지 단위로 이루어지므로 실패한 페이지만 다시 요청한다.
+
         Args:
             data_source (str): 'domestic' 또는 'international'
             hours_back (int): 과거 몇 시간부터 검색 (start_date가 없을 때)
             start_date (datetime): 명시적 시작 날짜 (선택)
             end_date (datetime): 명시적 종료 날짜 (선택)
-            max_retries (int): 최대 재시도 횟수
+            max_retries (int): 페이지당 최대 시도 횟수
+            stats (Dict, optional): 전달 시 페이지별 지연/재시도/전체 수집 시간 기록
+            airports (List[str], optional): 검색 공항 (기본: 전체 공항)
+            series (List[str], optional): 검색 SERIES (기본: 전체 SERIES)
+            crawl_timestamp (str, optional): 원문 보관 시 실행 키 (archive_dir 설정 시)
+            shard (int): 원문 보관 시 샤드 번호
+            page_executor (ThreadPoolExecutor, optional): 모든 페이지 요청(1페이지 포함)을 보낼 공유 실행기.
+                샤드 수집에서 샤드 전체의 동시 요청 수를 max_concurrency로 묶는 데 사용
 
         Returns:
             Tuple[List[Dict[str, str]], Optional[str]]: (NOTAM 리스트, 에러 메시지)
         """
-        payload = self.get_search_payload(data_source, hours_back, start_date, end_date)
+        if page_executor is None:
+            fetch_page = self._fetch_page_with_retry
+        else:
+            def fetch_page(*args):
+                return page_executor.submit(self._fetch_page_with_retry, *args).result()
+
+        archive_ctx = None
+        if self.archive and crawl_timestamp:
+            archive_ctx = {'crawl_timestamp': crawl_timestamp, 'data_source': data_source, 'shard': shard}
+
+        payload = self.get_search_payload(data_source, hours_back, start_date, end_date,
+                                          airports, series)
 
         logger.info(f"[API] {data_source.upper()} NOTAM 요청 중...")
         logger.debug(f"페이로드: {payload}")
 
-        for attempt in range(1, max_retries + 1):
-            try:
-                # API 요청 (페이지네이션 처리)
-                all_notams = []
-                page = 1
-                total_records = None
-
-                while True:
-                    # 페이지 파라미터 추가
-                    payload['ibsheetPageNo'] = str(page)
-                    payload['ibsheetRowPerPage'] = '100'
-
-                    response = self.session.post(
-                        self.search_endpoint,
-                        data=payload,
-                        timeout=30,
-                        allow_redirects=True
-                    )
-
-                    response.raise_for_status()
-
-                    logger.debug(f"[API] 페이지 {page} 응답 코드: {response.status_code}")
-
-                    # JSON 응답 파싱
-                    try:
-                        json_data = response.json()
-                        # 필드 매핑을 위해 _parse_json_response 호출
-                        notams = self._parse_json_response(response.text)
-
-                        # Total 값 확인 (첫 페이지에서만)
-                        if page == 1 and 'Total' in json_data:
-                            total_records = json_data['Total']
-                            expected_pages = (total_records + 99) // 100
-                            logger.info(f"[API] 전체 {total_records}개, 예상 페이지: {expected_pages}개")
-                    except:
-                        # JSON 파싱 실패 시 기존 방식 사용
-                        notams = self.parse_ibsheet_response(response.text)
+        fetch_started = time.perf_counter()
+        page_timings = []
+        retried_pages = {}
+        total_records = None
+
+        try:
+            # 1페이지: 데이터 + Total 확인
+            first_page, total_records, latency = fetch_page(
+                payload, 1, max_retries, retried_pages, archive_ctx)
+            page_timings.append({'page': 1, 'records': len(first_page), 'latency': latency})
+            pages = {1: first_page}
+            logger.info(f"[API] 페이지 1: {len(first_page)}개 NOTAM 추출 ({latency:.2f}초)")
+
+            if not first_page:
+                logger.info(f"[API] 페이지 1: 데이터 없음 - 수집 완료")
+
+            elif total_records is not None:
+                expected_pages = (total_records + self.page_size - 1) // self.page_size
+                logger.info(f"[API] 전체 {total_records}개, 예상 페이지: {expected_pages}개")
 
+                if expected_pages > 1:
+                    pages.update(self._fetch_pages_concurrently(
+                        payload, list(range(2, expected_pages + 1)), page_timings,
+                        max_retries, retried_pages, archive_ctx, page_executor))
+
+            else:
+                # Total 값이 없으면 페이지 수를 알 수 없으므로 순차 수집
+                page = 1
+                notams = first_page
+                while len(notams) >= self.page_size:
+                    page += 1
+                    notams, _, latency = fetch_page(
+                        payload, page, max_retries, retried_pages, archive_ctx)
+                    page_timings.append({'page': page, 'records': len(notams), 'latency': latency})
                     if not notams:
                         logger.info(f"[API] 페이지 {page}: 데이터 없음 - 수집 완료")
                         break
+                    pages[page] = notams
+                    logger.info(f"[API] 페이지 {page}: {len(notams)}개 NOTAM 추출 ({latency:.2f}초)")
 
-                    all_notams.extend(notams)
-                    logger.info(f"[API] 페이지 {page}: {len(notams)}개 NOTAM 추출 (누적: {len(all_notams)}개)")
+        except requests.exceptions.RequestException as e:
+            failed_page = getattr(e, 'notam_page', None)
+            error_msg = f"API 요청 실패 (페이지 {failed_page}, 시도 {max_retries}/{max_retries}): {e}"
+            logger.error(f"[ERROR] {error_msg}")
+            self._update_fetch_stats(stats, page_timings, retried_pages, total_records,
+                                     time.perf_counter() - fetch_started)
+            return [], error_msg
 
-                    # Total 값과 비교하여 완료 확인
-                    if total_records and len(all_notams) >= total_records:
-                        logger.info(f"[API] 전체 데이터 수집 완료 ({len(all_notams)}/{total_records})")
-                        break
+        except Exception as e:
+            failed_page = getattr(e, 'notam_page', None)
+            error_msg = f"예상치 못한 오류 (페이지 {failed_page}): {e}"
+            logger.error(f"[ERROR] {error_msg}")
+            self._update_fetch_stats(stats, page_timings, retried_pages, total_records,
+                                     time.perf_counter() - fetch_started)
+            return [], error_msg
+
+        # 페이지 순서대로 병합
+        all_notams = []
+        for page in sorted(pages):
+            all_notams.extend(pages[page])
+
+        fetch_time = time.perf_counter() - fetch_started
+        self._update_fetch_stats(stats, page_timings, retried_pages, total_records, fetch_time)
+
+        if retried_pages:
+            logger.info(f"[API] 재시도한 페이지: {dict(sorted(retried_pages.items()))}")
+
+        logger.info(f"[API] 총 {len(all_notams)}개 NOTAM 가져오기 성공 "
+                    f"({len(page_timings)}페이지, {fetch_time:.2f}초)")
+        return all_notams, None
+
+    def _update_fetch_stats(self, stats: Optional[Dict], page_timings: List[Dict],
+                            retried_pages: Dict[int, int], total_records: Optional[int],
+                            fetch_time: float):
+        """fetch_notam_data() 수집 통계 기록"""
+        if stats is None:
+            return
+
+        page_timings.sort(key=lambda t: t['page'])
+        stats.update({
+            'pages': len(page_timings),
+            'total_records': total_records,
+            'page_timings': page_timings,
+            'page_latency_sum': sum(t['latency'] for t in page_timings),
+            'retried_pages': dict(sorted(retried_pages.items())),
+            'fetch_time': fetch_time,
+            'max_concurrency': self.max_concurrency
+        })
 
-                    # 100개 미만이면 마지막 페이지로 판단
-                    if len(notams) < 100:
-                        logger.info(f"[API] 마지막 페이지 도달 (페이지 {page})")
-                        break
+    def get_location_volumes(self, data_source: str) -> Dict[str, Dict[str, int]]:
+        """
+        notam_records 기준 공항별/SERIES별 과거 NOTAM 건수
 
-                    # 다음 페이지로
-                    page += 1
-                    time.sleep(0.5)  # API 부하 방지
+        Args:
+            data_source (str): 'domestic' 또는 'international'
 
-                logger.info(f"[API] 총 {len(all_notams)}개 NOTAM 가져오기 성공")
-                return all_notams, None
+        Returns:
+            Dict[str, Dict[str, int]]: {공항: {SERIES: 건수}}
+        """
+        cursor = self.db.get().cursor()
 
-            except requests.exceptions.RequestException as e:
-                error_msg = f"API 요청 실패 (시도 {attempt}/{max_retries}): {e}"
-                logger.warning(f"[WARN] {error_msg}")
+        cursor.execute('''
+            SELECT location, notam_type, COUNT(*) FROM notam_records
+            WHERE data_source = ?
+            GROUP BY location, notam_type
+        ''', (data_source,))
 
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt  # 지수 백오프
-                    logger.info(f"[INFO] {wait_time}초 후 재시도...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"[ERROR] 최대 재시도 횟수 초과")
-                    return [], error_msg
+        volumes = {}
+        for location, notam_type, count in cursor.fetchall():
+            volumes.setdefault(location, {})[notam_type or ''] = count
 
-            except Exception as e:
-                error_msg = f"예상치 못한 오류: {e}"
-                logger.error(f"[ERROR] {error_msg}")
-                return [], error_msg
+        return volumes
+
+    def plan_shards(self, data_source: str = 'domestic',
+                    max_shards: Optional[int] = None,
+                    split_series: bool = True) -> List[Dict]:
+        """
+        과거 공항별 건수로 샤드 구성 (공항 그룹 및 SERIES 분할)
+
+        공항을 건수 내림차순으로 가장 가벼운 샤드에 배정(LPT)해 샤드 간 부하를 맞춘다.
+        한 공항의 건수가 샤드 평균보다 크면 그 공항은 SERIES 그룹 단위로 다시 나눈다.
 
-        return [], "알 수 없는 오류"
+        Args:
+            data_source (str): 'domestic' 또는 'international'
+            max_shards (int, optional): 최대 샤드 수 (기본: max_concurrency)
+            split_series (bool): 건수가 큰 공항의 SERIES 분할 허용 여부
+
+        Returns:
+            List[Dict]: [{'airports': [...], 'series': [...] 또는 None, 'expected_rows': N}]
+        """
+        max_shards = max(1, max_shards or self.max_concurrency)
+        volumes = self.get_location_volumes(data_source)
+
+        # 과거 데이터가 없는 공항은 1건으로 가정 (이력이 전혀 없으면 공항 수로 균등 분할)
+        airport_volumes = {a: sum(volumes.get(a, {}).values()) or 1 for a in self.airports}
+
+        total_volume = sum(airport_volumes.values())
+        shard_target = total_volume / max_shards
+
+        # 건수가 큰 공항은 SERIES 그룹별 단독 샤드
+        series_shards = []
+        grouped_airports = []
+        for airport, volume in sorted(airport_volumes.items(), key=lambda item: -item[1]):
+            # 나머지 공항용으로 최소 한 샤드는 남겨 둠
+            budget = max_shards - len(series_shards) - 1
+            if split_series and budget >= 2 and volume > shard_target:
+                by_series = volumes.get(airport, {})
+                parts = min(budget, len(self.series_types) - 1, max(2, round(volume / shard_target)))
+                for series_group in self._split_series(by_series, parts):
+                    series_shards.append({
+                        'airports': [airport],
+                        'series': series_group,
+                        'expected_rows': sum(by_series.get(x, 0) for x in series_group)
+                    })
+            else:
+                grouped_airports.append((airport, volume))
+
+        # 나머지 공항은 LPT 방식으로 샤드 배정
+        group_count = max(1, min(max_shards - len(series_shards), len(grouped_airports)))
+        groups = [{'airports': [], 'series': None, 'expected_rows': 0} for _ in range(group_count)]
+        for airport, volume in grouped_airports:
+            lightest = min(groups, key=lambda g: g['expected_rows'])
+            lightest['airports'].append(airport)
+            lightest['expected_rows'] += volume
+
+        return series_shards + [g for g in groups if g['airports']]
+
+    def _split_series(self, series_volumes: Dict[str, int], parts: int) -> List[List[str]]:
+        """
+        SERIES를 건수 기준으로 parts개 그룹으로 분할
+
+        SNOWTAM은 별도 요청 필드(sch_snow_series)이므로 단독 그룹이 되지 않도록
+        마지막 그룹에 붙인다.
+        """
+        regular = [s for s in self.series_types if s != 'SNOWTAM']
+        groups = [[] for _ in range(max(1, min(parts, len(regular))))]
+        loads = [0] * len(groups)
+
+        for series in sorted(regular, key=lambda x: -series_volumes.get(x, 0)):
+            idx = loads.index(min(loads))
+            groups[idx].append(series)
+            loads[idx] += series_volumes.get(series, 0)
+
+        if 'SNOWTAM' in self.series_types:
+            groups[-1].append('SNOWTAM')
+
+        return groups
+
+    def fetch_notam_data_sharded(self, data_source: str = 'domestic',
+                                 hours_back: int = 2,
+                                 start_date: datetime = None,
+                                 end_date: datetime = None,
+                                 max_retries: int = 3,
+                                 stats: Optional[Dict] = None,
+                                 shards: Optional[List[Dict]] = None,
+                                 crawl_timestamp: Optional[str] = None) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """
+        공항/SERIES 샤드별 동시 요청 후 notam_no 기준 병합 (중복 제거)
+
+        각 샤드는 fetch_notam_data()로 수집하고, 모든 샤드의 페이지 요청은 max_concurrency 크기의
+        공유 페이지 실행기 하나에서 실행된다. 샤드 스레드는 조율만 하므로 동시 요청 수가
+        max_concurrency를 넘지 않고 세션 연결 풀 안에 머문다.
+
+        Args:
+            data_source (str): 'domestic' 또는 'international'
+            hours_back (int): 과거 몇 시간부터 검색 (start_date가 없을 때)
+            start_date (datetime): 명시적 시작 날짜 (선택)
+            end_date (datetime): 명시적 종료 날짜 (선택)
+            max_retries (int): 페이지당 최대 시도 횟수
+            stats (Dict, optional): 전달 시 샤드별 소요 시간/건수 기록
+            shards (List[Dict], optional): 샤드 구성 (기본: plan_shards())
+            crawl_timestamp (str, optional): 원문 보관 시 실행 키
+
+        Returns:
+            Tuple[List[Dict[str, str]], Optional[str]]: (NOTAM 리스트, 에러 메시지)
+        """
+        # 샤드마다 같은 검색 구간을 쓰도록 시각 고정
+        if not (start_date and end_date):
+            end_date = self.get_utc_time()
+            start_date = end_date - timedelta(hours=hours_back)
+
+        shards = shards or self.plan_shards(data_source)
+        logger.info(f"[API] {data_source.upper()} 샤드 {len(shards)}개로 분할 요청")
+
+        fetch_started = time.perf_counter()
+        shard_results = [None] * len(shards)
+        shard_timings = []
+
+        def run_shard(index: int, shard: Dict):
+            shard_stats = {}
+            started = time.perf_counter()
+            notams, error = self.fetch_notam_data(
+                data_source, hours_back, start_date, end_date, max_retries,
+                stats=shard_stats, airports=shard['airports'], series=shard.get('series'),
+                crawl_timestamp=crawl_timestamp, shard=index, page_executor=page_executor)
+            return index, notams, error, time.perf_counter() - started, shard_stats
+
+        errors = []
+        page_executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='notam-page')
+        with page_executor, ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(shards)),
+                                               thread_name_prefix='notam-shard') as executor:
+            futures = [executor.submit(run_shard, i, shard) for i, shard in enumerate(shards)]
+
+            for future in as_completed(futures):
+                index, notams, error, elapsed, shard_stats = future.result()
+                shard = shards[index]
+                label = ','.join(shard['airports']) + (f" [{','.join(shard['series'])}]" if shard.get('series') else '')
+
+                shard_timings.append({
+                    'shard': index,
+                    'airports': shard['airports'],
+                    'series': shard.get('series'),
+                    'records': len(notams),
+                    'pages': shard_stats.get('pages', 0),
+                    'elapsed': elapsed,
+                    'error': error
+                })
+
+                if error:
+                    errors.append(f"샤드 {index} ({label}): {error}")
+                    logger.warning(f"[WARN] 샤드 {index} 실패 ({label}, {elapsed:.2f}초): {error}")
+                else:
+                    shard_results[index] = notams
+                    logger.info(f"[API] 샤드 {index}: {len(notams)}개 ({label}, {elapsed:.2f}초)")
+
+        shard_timings.sort(key=lambda t: t['shard'])
+        fetch_time = time.perf_counter() - fetch_started
+
+        if stats is not None:
+            stats.update({
+                'shards': len(shards),
+                'shard_timings': shard_timings,
+                'fetch_time': fetch_time,
+                'pages': sum(t['pages'] for t in shard_timings),
+                'page_latency_sum': sum(t['elapsed'] for t in shard_timings)
+            })
+
+        if errors:
+            return [], '; '.join(errors)
+
+        # 샤드 순서대로 병합, notam_no 중복 제거 (먼저 나온 행 유지)
+        merged = {}
+        fetched = 0
+        for notams in shard_results:
+            fetched += len(notams)
+            for notam in notams:
+                merged.setdefault(notam['notam_no'], notam)
+
+        if stats is not None:
+            stats['duplicates'] = fetched - len(merged)
+
+        logger.info(f"[API] 샤드 병합: {fetched}개 → 중복 제거 후 {len(merged)}개 ({fetch_time:.2f}초)")
+        return list(merged.values()), None
 
     def save_to_database(self, notam_list: List[Dict[str, str]],
                         data_source: str,
-                        crawl_timestamp: str) -> int:
+                        crawl_timestamp: str,
+                        stats: Optional[Dict] = None) -> int:
         """
-        NOTAM 데이터를 DB에 저장
+        NOTAM 데이터를 DB에 저장 (executemany 단일 트랜잭션, 실패 시 전체 롤백)
+
+        내용 해시가 같은 NOTAM은 기록하지 않는다.
 
         Args:
             notam_list (List[Dict[str, str]]): NOTAM 데이터 리스트
             data_source (str): 'domestic' 또는 'international'
             crawl_timestamp (str): 크롤링 타임스탬프
+            stats (Dict, optional): 전달 시 'inserted', 'updated', 'unchanged' 기록
 
         Returns:
-            int: 저장된 레코드 수
+            int: 저장된 레코드 수 (신규 + 변경)
         """
         if not notam_list:
             return 0
 
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
-        saved_count = 0
+        rows = build_record_rows(notam_list, data_source, crawl_timestamp)
 
-        for notam in notam_list:
+        with self.db_lock:
             try:
-                # 필수 필드 체크
-                notam_no = notam.get('notam_no')
-                if not notam_no:
-                    logger.warning(f"[WARN] NOTAM 번호 없음 - 건너뜀: {notam.get('location', 'Unknown')}")
-                    continue
-
-                cursor.execute('''
-                    INSERT OR REPLACE INTO notam_records
-                    (crawl_timestamp, data_source, notam_type, issue_time, location,
-                     notam_no, qcode, start_time, end_time, full_text,
-                     full_text_detail)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    crawl_timestamp,
-                    data_source,
-                    notam.get('notam_type', ''),
-                    notam.get('issue_time', ''),
-                    notam.get('location', ''),
-                    notam_no,
-                    notam.get('qcode', ''),
-                    notam.get('start_time', ''),
-                    notam.get('end_time', ''),
-                    notam.get('full_text', ''),
-                    notam.get('full_text_detail', '')
-                ))
-                if cursor.rowcount > 0:
-                    saved_count += 1
+                saved_count = bulk_upsert_notams(self.db.get(), rows, stats)
             except Exception as e:
-                logger.error(f"[ERROR] DB 저장 오류: {e} - NOTAM: {notam.get('notam_no', 'Unknown')}")
-
-        conn.commit()
-        conn.close()
+                logger.error(f"[ERROR] DB 저장 오류 ({len(rows)}개 롤백): {e}")
+                raise
 
         return saved_count
 
     def log_crawl(self, crawl_timestamp: str, data_source: str,
                   status: str, records_found: int, records_saved: int,
                   error_message: Optional[str] = None,
-                  execution_time: float = 0):
+                  execution_time: float = 0,
+                  window_start: Optional[datetime] = None,
+                  window_end: Optional[datetime] = None):
         """
         크롤링 로그 저장
 
@@ -509,25 +1214,128 @@ class NOTAMCrawlerAPI:
             records_saved (int): 저장된 레코드 수
             error_message (Optional[str]): 에러 메시지
             execution_time (float): 실행 시간 (초)
+            window_start (datetime, optional): 요청한 검색 구간 시작 (UTC)
+            window_end (datetime, optional): 요청한 검색 구간 종료 (UTC, 다음 증분 크롤링의 워터마크)
         """
-        conn = sqlite3.connect(self.db_name)
-        cursor = conn.cursor()
+        with self.db_lock:
+            conn = self.db.get()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT INTO crawl_logs
+                (crawl_timestamp, data_source, status, records_found, records_saved,
+                 error_message, execution_time, window_start, window_end)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (crawl_timestamp, data_source, status, records_found,
+                  records_saved, error_message, execution_time,
+                  window_start.isoformat() if window_start else None,
+                  window_end.isoformat() if window_end else None))
+
+            conn.commit()
+
+    def get_watermark(self, data_source: str) -> Optional[datetime]:
+        """
+        마지막 성공 크롤링의 검색 구간 종료 시각 (증분 크롤링 워터마크)
+
+        가장 최근 크롤링이 실패했거나 구간 정보가 없으면 None을 반환해
+        전체 구간으로 다시 요청하도록 한다.
+
+        Args:
+            data_source (str): 'domestic' 또는 'international'
+
+        Returns:
+            Optional[datetime]: 워터마크 (UTC)
+        """
+        cursor = self.db.get().cursor()
 
         cursor.execute('''
-            INSERT INTO crawl_logs
-            (crawl_timestamp, data_source, status, records_found, records_saved,
-             error_message, execution_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (crawl_timestamp, data_source, status, records_found,
-              records_saved, error_message, execution_time))
+            SELECT status, window_end FROM crawl_logs
+            WHERE data_source = ?
+            ORDER BY id DESC LIMIT 1
+        ''', (data_source,))
+        row = cursor.fetchone()
+
+        if not row or row[0] != 'SUCCESS' or not row[1]:
+            return None
+
+        watermark = datetime.fromisoformat(row[1])
+        if watermark.tzinfo is None:
+            watermark = pytz.utc.localize(watermark)
+        return watermark
+
+    def plan_crawl_window(self, data_source: str, hours_back: int,
+                          incremental: bool) -> Dict:
+        """
+        크롤링 검색 구간 결정 (증분/전체)
 
-        conn.commit()
-        conn.close()
+        Args:
+            data_source (str): 'domestic' 또는 'international'
+            hours_back (int): 전체 구간 길이 (시간)
+            incremental (bool): 워터마크 기반 증분 크롤링 여부
+
+        Returns:
+            Dict: {'mode', 'window_start', 'window_end', 'full_window_start'}
+        """
+        window_end = self.get_utc_time()
+        full_window_start = window_end - timedelta(hours=hours_back)
+        plan = {
+            'mode': 'full',
+            'window_start': full_window_start,
+            'window_end': window_end,
+            'full_window_start': full_window_start
+        }
+
+        if not incremental:
+            return plan
+
+        watermark = self.get_watermark(data_source)
+        if watermark is None:
+            logger.info(f"[INFO] 워터마크 없음 (최근 실패 또는 첫 실행) - 전체 {hours_back}시간 구간 요청")
+            return plan
+
+        incremental_start = watermark - self.watermark_overlap
+        if incremental_start <= full_window_start:
+            logger.info(f"[INFO] 워터마크가 전체 구간보다 오래됨 - 전체 {hours_back}시간 구간 요청")
+            return plan
+
+        plan.update({'mode': 'incremental', 'window_start': incremental_start})
+        logger.info(f"[INFO] 증분 크롤링: 워터마크 {watermark.strftime('%Y-%m-%d %H:%M')} UTC "
+                    f"(겹침 {int(self.watermark_overlap.total_seconds() // 60)}분)")
+        return plan
+
+    def count_rows_in_window(self, data_source: str,
+                             window_start: datetime, window_end: datetime) -> int:
+        """
+        저장된 NOTAM 중 발행 시각이 구간 안에 있는 레코드 수
+
+        증분 크롤링이 전체 구간 요청 대비 다시 받지 않은 행 수를 추정하는 데 사용한다.
+        issue_time은 'YYMMDDHHMM' 문자열이므로 같은 형식으로 비교한다.
+
+        Args:
+            data_source (str): 'domestic' 또는 'international'
+            window_start (datetime): 구간 시작 (UTC, 포함)
+            window_end (datetime): 구간 종료 (UTC, 제외)
+
+        Returns:
+            int: 레코드 수
+        """
+        cursor = self.db.get().cursor()
+
+        cursor.execute('''
+            SELECT COUNT(*) FROM notam_records
+            WHERE data_source = ? AND issue_time >= ? AND issue_time < ?
+        ''', (data_source, window_start.strftime('%y%m%d%H%M'), window_end.strftime('%y%m%d%H%M')))
+        count = cursor.fetchone()[0]
+
+        return count
 
     def crawl_notam_api(self, data_source: str = 'domestic',
                        hours_back: int = 2,
                        start_date: datetime = None,
-                       end_date: datetime = None) -> Dict:
+                       end_date: datetime = None,
+                       incremental: bool = False,
+                       sharded: bool = False,
+                       persist: Optional[Callable[..., int]] = None) -> Dict:
         """
         NOTAM API 크롤링 실행 (메인 메서드)
 
@@ -536,42 +1344,83 @@ class NOTAMCrawlerAPI:
             hours_back (int): 과거 몇 시간부터 검색 (start_date가 없을 때)
             start_date (datetime): 명시적 시작 날짜 (선택)
             end_date (datetime): 명시적 종료 날짜 (선택)
+            incremental (bool): 마지막 성공 크롤링 워터마크 이후 구간만 요청 (명시적 날짜가 없을 때)
+            sharded (bool): 공항 그룹/SERIES 샤드로 나눠 동시 요청 (plan_shards())
+            persist (Callable, optional): save_to_database 대신 사용할 저장 함수
+                (notam_list, data_source, crawl_timestamp, stats, scope=...) -> 저장 수
+                scope는 이번 요청이 실제로 조회한 범위 (window_start, window_end, airports, series)
 
         Returns:
             Dict: 크롤링 결과
         """
         start_time = time.time()
         crawl_timestamp = datetime.now().isoformat()
+        window = None
 
         try:
             logger.info(f"\n{'='*70}")
             logger.info(f"[START] [{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {data_source.upper()} NOTAM API 크롤링 시작")
             logger.info(f"{'='*70}")
 
+            # 검색 구간 결정 (명시적 날짜가 없을 때만 워터마크 사용)
+            if not (start_date and end_date):
+                window = self.plan_crawl_window(data_source, hours_back, incremental)
+                start_date, end_date = window['window_start'], window['window_end']
+
+            # 전체 구간 요청 대비 다시 받지 않는 행 수 (저장된 레코드 기준 추정)
+            rows_avoided = 0
+            if window and window['mode'] == 'incremental':
+                rows_avoided = self.count_rows_in_window(
+                    data_source, window['full_window_start'], window['window_start'])
+                logger.info(f"[INFO] 증분 크롤링: 전체 구간 대비 약 {rows_avoided}개 행 재수집 생략")
+
             # API 호출
-            notam_list, error = self.fetch_notam_data(data_source, hours_back, start_date, end_date)
+            fetch_stats = {}
+            fetch = self.fetch_notam_data_sharded if sharded else self.fetch_notam_data
+            notam_list, error = fetch(data_source, hours_back, start_date, end_date,
+                                      stats=fetch_stats, crawl_timestamp=crawl_timestamp)
 
             if error:
                 execution_time = time.time() - start_time
                 self.log_crawl(crawl_timestamp, data_source, 'FAILED',
-                              0, 0, error, execution_time)
+                              0, 0, error, execution_time, start_date, end_date)
+                if self.archive:
+                    self.archive.mark_run(crawl_timestamp, data_source, 'FAILED')
 
                 return {
                     'status': 'FAILED',
                     'error': error,
-                    'execution_time': execution_time
+                    'execution_time': execution_time,
+                    'retried_pages': fetch_stats.get('retried_pages', {}),
+                    'rate_limiter': self.rate_limiter.get_stats()
                 }
 
-            # DB 저장
-            saved_count = self.save_to_database(notam_list, data_source, crawl_timestamp)
-            logger.info(f"[INFO] DB 저장 완료: {saved_count}개")
+            # DB 저장 (변경 없는 NOTAM은 쓰기 생략)
+            save_stats = {}
+            if persist:
+                # 변경 감지가 삭제 판정을 조회 범위 안으로 한정하도록 범위 전달
+                scope = {
+                    'window_start': start_date,
+                    'window_end': end_date,
+                    'airports': list(self.airports),
+                    'series': list(self.series_types)
+                }
+                saved_count = persist(notam_list, data_source, crawl_timestamp, save_stats, scope=scope)
+            else:
+                saved_count = self.save_to_database(notam_list, data_source, crawl_timestamp, save_stats)
+            logger.info(f"[INFO] DB 저장 완료: {saved_count}개 "
+                        f"(신규 {save_stats.get('inserted', 0)}, 변경 {save_stats.get('updated', 0)}, "
+                        f"변경 없음 {save_stats.get('unchanged', 0)})")
 
             # 실행 시간
             execution_time = time.time() - start_time
 
-            # 로그 저장
+            # 로그 저장 (window_end가 다음 증분 크롤링의 워터마크)
             self.log_crawl(crawl_timestamp, data_source, 'SUCCESS',
-                          len(notam_list), saved_count, None, execution_time)
+                          len(notam_list), saved_count, None, execution_time,
+                          start_date, end_date)
+            if self.archive:
+                self.archive.mark_run(crawl_timestamp, data_source, 'SUCCESS', len(notam_list))
 
             # 샘플 데이터 출력
             if notam_list:
@@ -580,13 +1429,29 @@ class NOTAMCrawlerAPI:
                     logger.info(f"  {i}. {notam['notam_no']} - {notam['location']} ({notam['notam_type']})")
                     logger.info(f"     시작: {notam['start_time']}, 종료: {notam['end_time']}")
 
+            if fetch_stats.get('pages', 0) > 1:
+                logger.info(f"[INFO] 페이지 수집: {fetch_stats['pages']}페이지, "
+                            f"{fetch_stats['fetch_time']:.2f}초 (순차 기준 {fetch_stats['page_latency_sum']:.2f}초)")
+
             logger.info(f"\n[OK] API 크롤링 완료 - 실행시간: {execution_time:.2f}초")
 
             return {
                 'status': 'SUCCESS',
                 'records_found': len(notam_list),
                 'records_saved': saved_count,
-                'execution_time': execution_time
+                'records_inserted': save_stats.get('inserted', 0),
+                'records_updated': save_stats.get('updated', 0),
+                'records_unchanged': save_stats.get('unchanged', 0),
+                'execution_time': execution_time,
+                'fetch_time': fetch_stats.get('fetch_time', 0),
+                'page_timings': fetch_stats.get('page_timings', []),
+                'retried_pages': fetch_stats.get('retried_pages', {}),
+                'crawl_mode': window['mode'] if window else 'explicit',
+                'window_start': start_date.isoformat() if start_date else None,
+                'window_end': end_date.isoformat() if end_date else None,
+                'rows_avoided': rows_avoided,
+                'shard_timings': fetch_stats.get('shard_timings', []),
+                'rate_limiter': self.rate_limiter.get_stats()
             }
 
         except Exception as e:
@@ -594,7 +1459,7 @@ class NOTAMCrawlerAPI:
             error_msg = str(e)
             logger.error(f"[ERROR] 크롤링 실패: {error_msg}")
 
-            # 에러 로그 저장
+            # 에러 로그 저장 (다음 증분 크롤링은 전체 구간으로 복구)
             self.log_crawl(crawl_timestamp, data_source, 'FAILED',
                           0, 0, error_msg, execution_time)
 
@@ -604,35 +1469,133 @@ class NOTAMCrawlerAPI:
                 'execution_time': execution_time
             }
 
-    def test_crawl(self) -> Dict:
+    def test_crawl(self, parallel: bool = True) -> Dict:
         """
         테스트 크롤링 실행 (국내 + 국제)
 
+        두 데이터 소스는 서로 독립적인 요청이므로 기본적으로 동시에 크롤링한다.
+
+        Args:
+            parallel (bool): 국내/국제 동시 크롤링 여부
+
         Returns:
-            Dict: 크롤링 결과
+            Dict: 크롤링 결과 ({'domestic', 'international', 'wall_time'})
         """
         logger.info("[TEST] 테스트 크롤링 시작...")
+        started = time.time()
+        data_sources = ('domestic', 'international')
+
+        if parallel:
+            with ThreadPoolExecutor(max_workers=len(data_sources), thread_name_prefix='notam-source') as executor:
+                futures = {source: executor.submit(self.crawl_notam_api, source) for source in data_sources}
+                results = {source: future.result() for source, future in futures.items()}
+        else:
+            results = {source: self.crawl_notam_api(source) for source in data_sources}
+
+        results['wall_time'] = time.time() - started
+        return results
 
-        # 국내 NOTAM
-        domestic_result = self.crawl_notam_api('domestic')
+    def replay_archive(self, archive_dir: Optional[str] = None,
+                       data_source: Optional[str] = None,
+                       since: Optional[str] = None,
+                       until: Optional[str] = None) -> Dict:
+        """
+        보관된 응답 원문으로 notam_records 재구성 (네트워크 사용 없음)
 
-        # 국제 NOTAM
-        international_result = self.crawl_notam_api('international')
+        성공한 크롤링 실행을 crawl_timestamp 순서로 다시 파싱해 저장한다.
+        파서를 고친 뒤 과거 수집분을 다시 처리할 때 사용한다. 저장된 행이 재처리 실행보다
+        최근 크롤링에서 기록됐으면 덮어쓰지 않고, last_seen도 뒤로 돌리지 않는다 (UPSERT_NOTAM_SQL).
+
+        Args:
+            archive_dir (str, optional): 보관소 디렉터리 (기본: 인스턴스 archive_dir)
+            data_source (str, optional): 'domestic' 또는 'international'만 재처리
+            since (str, optional): 이 crawl_timestamp 이후 실행만 (포함)
+            until (str, optional): 이 crawl_timestamp 이전 실행만 (미포함)
+
+        Returns:
+            Dict: 재처리 결과
+        """
+        archive = RawResponseArchive(archive_dir) if archive_dir else self.archive
+        if archive is None:
+            raise ValueError("archive_dir가 지정되지 않았습니다")
+
+        started = time.time()
+        runs = archive.iter_runs(data_source, since, until)
+        logger.info(f"[REPLAY] 재처리 대상 실행: {len(runs)}개")
+
+        pages = 0
+        records = 0
+        saved = 0
+        raw_bytes = 0
+
+        for run in runs:
+            # 샤드 간 중복은 notam_no 기준 제거 (먼저 나온 행 유지)
+            merged = {}
+            for body in archive.iter_pages(run['crawl_timestamp'], run['data_source']):
+                pages += 1
+                raw_bytes += len(body)
+                notams, _ = self.parse_response_body(body)
+                for notam in notams:
+                    merged.setdefault(notam['notam_no'], notam)
+
+            notam_list = list(merged.values())
+            records += len(notam_list)
+            saved += self.save_to_database(notam_list, run['data_source'], run['crawl_timestamp'])
+
+        execution_time = time.time() - started
+        if archive is not self.archive:
+            archive.close()
+
+        logger.info(f"[REPLAY] 완료: 실행 {len(runs)}개, 페이지 {pages}개, NOTAM {records}개, "
+                    f"{execution_time:.2f}초 ({raw_bytes / 1024 / 1024 / max(execution_time, 1e-9):.1f} MiB/초)")
 
         return {
-            'domestic': domestic_result,
-            'international': international_result
+            'status': 'SUCCESS',
+            'runs': len(runs),
+            'pages': pages,
+            'records_found': records,
+            'records_saved': saved,
+            'raw_bytes': raw_bytes,
+            'execution_time': execution_time
         }
 
     def close(self):
-        """세션 종료"""
+        """세션 및 DB 연결 종료"""
         if self.session:
             self.session.close()
 
+        if self.archive:
+            self.archive.close()
+
+        self.db.close()
+
 
 def main():
     """메인 실행 함수"""
-    crawler = NOTAMCrawlerAPI()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='NOTAM API 크롤러')
+    parser.add_argument('--db', default='notam_realtime.db', help='SQLite 데이터베이스 파일')
+    parser.add_argument('--archive-dir', help='응답 원문 보관 디렉터리')
+    parser.add_argument('--replay', action='store_true',
+                        help='--archive-dir 보관분으로 notam_records 재구성 (네트워크 사용 없음)')
+    parser.add_argument('--since', help='재처리 시작 crawl_timestamp (포함)')
+    parser.add_argument('--until', help='재처리 종료 crawl_timestamp (미포함)')
+    args = parser.parse_args()
+
+    if args.replay and not args.archive_dir:
+        parser.error('--replay에는 --archive-dir가 필요합니다')
+
+    crawler = NOTAMCrawlerAPI(db_name=args.db, archive_dir=args.archive_dir)
+
+    if args.replay:
+        try:
+            result = crawler.replay_archive(since=args.since, until=args.until)
+            print(f"\n[REPLAY] 실행 {result['runs']}개, 페이지 {result['pages']}개, "
+                  f"NOTAM {result['records_found']}개 재처리 ({result['execution_time']:.2f}초)")
+        finally:
+            crawler.close()
+        return
 
     try:
         # 테스트 실행
@@ -643,20 +1606,21 @@ def main():
         print("[SUMMARY] API 크롤링 결과 요약")
         print("="*70)
 
-        total_time = 0
+        total_time = results['wall_time']
         total_records = 0
 
-        for data_source, result in results.items():
+        for data_source in ('domestic', 'international'):
+            result = results[data_source]
             print(f"\n[TEST] {data_source.upper()} NOTAM:")
             if result['status'] == 'SUCCESS':
                 print(f"  [OK] 성공 - {result['records_found']}개 발견, {result['records_saved']}개 저장")
                 print(f"  [TIME] 실행시간: {result['execution_time']:.2f}초")
-                total_time += result['execution_time']
                 total_records += result['records_found']
             else:
                 print(f"  [FAIL] 실패 - {result['error']}")
                 print(f"  [TIME] 실행시간: {result['execution_time']:.2f}초")
 
+        # 국내/국제를 동시에 수집하므로 전체 시간은 벽시계 기준
         print(f"\n[TOTAL] 전체 실행시간: {total_time:.2f}초")
         print(f"[TOTAL] 전체 레코드: {total_records}개")
 
@@ -0,0 +1,568 @@
+"""
+NOTAM SQLite 공통 쓰기 경로
+작성일: 2026-10-17
+기능:
+  - 연결 pragma 튜닝 (WAL, synchronous, cache_size, temp_store)
+  - notam_records 대량 upsert (executemany + 단일 트랜잭션)
+  - 내용 해시(content_hash) 비교로 바뀌지 않은 NOTAM은 쓰기 생략 (마지막 수집 시각 last_seen만 일괄 갱신)
+  - 프로세스 공용 연결 관리 (스레드별 연결 재사용, prepared statement 캐시, 스키마 초기화 1회)
+  - 수집 시 Q) 행/항목 파싱 결과를 parsed_data(JSON)로 저장 (파서 버전이 바뀌면 시작 시 다시 파싱)
+  - 발행/시작/종료 시각 UTC epoch 컬럼 (PERM/EST 플래그) 및 유효 구간 조회
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from notam_parser import PARSER_VERSION, parsed_data_json
+from notam_time import EPOCH_COLUMNS, epoch_columns, to_epoch
+
+logger = logging.getLogger(__name__)
+
+# 연결마다 적용하는 pragma
+# - WAL: 쓰기 중에도 모니터/변경 감지의 읽기가 막히지 않음
+# - synchronous=NORMAL: WAL에서는 커밋마다 fsync하지 않아도 DB 손상 없음 (정전 시 마지막 트랜잭션만 유실 가능)
+# - cache_size 음수는 KiB 단위 (약 64MB)
+# - temp_store=MEMORY: 정렬/인덱스 임시 데이터를 메모리에서 처리
+PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', '-65536'),
+    ('temp_store', 'MEMORY'),
+    ('busy_timeout', '5000')
+)
+
+# 내용 해시 대상 필드 (NOTAMChangeDetector.compare_notams 비교 필드와 동일)
+CONTENT_HASH_FIELDS = (
+    'issue_time', 'location', 'notam_type', 'qcode',
+    'start_time', 'end_time', 'full_text', 'full_text_detail'
+)
+
+# notam_records 쓰기 컬럼 순서 (build_record_rows 튜플 순서와 동일)
+# crawl_timestamp는 마지막으로 기록(신규/변경)된 크롤링, last_seen은 마지막으로 수집된 크롤링
+NOTAM_RECORD_COLUMNS = (
+    'crawl_timestamp', 'last_seen', 'data_source', 'notam_type', 'issue_time', 'location',
+    'notam_no', 'qcode', 'start_time', 'end_time', 'full_text', 'full_text_detail',
+    'content_hash', 'parsed_data', 'parsed_version'
+) + EPOCH_COLUMNS
+
+_NOTAM_NO_INDEX = NOTAM_RECORD_COLUMNS.index('notam_no')
+_DATA_SOURCE_INDEX = NOTAM_RECORD_COLUMNS.index('data_source')
+_CONTENT_HASH_INDEX = NOTAM_RECORD_COLUMNS.index('content_hash')
+_LAST_SEEN_INDEX = NOTAM_RECORD_COLUMNS.index('last_seen')
+_CRAWL_TIMESTAMP_INDEX = NOTAM_RECORD_COLUMNS.index('crawl_timestamp')
+
+# last_seen은 뒤로 가지 않음 (과거 실행 재처리 시에도 더 최근 수집 시각 유지)
+_LAST_SEEN_SQL = "MAX(COALESCE(notam_records.last_seen, ''), excluded.last_seen)"
+
+# 내용이나 데이터 소스가 바뀐 경우에만 갱신 (행 id/created_at 유지, 인덱스 재작성 없음)
+# 저장된 행이 더 최근 크롤링에서 기록됐으면 갱신하지 않음 (보관 응답 재처리가 새 내용을 덮어쓰지 않도록)
+UPSERT_NOTAM_SQL = f'''
+    INSERT INTO notam_records
+    ({', '.join(NOTAM_RECORD_COLUMNS)})
+    VALUES ({', '.join('?' * len(NOTAM_RECORD_COLUMNS))})
+    ON CONFLICT(notam_no) DO UPDATE SET
+    {', '.join(f'{c} = {_LAST_SEEN_SQL if c == "last_seen" else "excluded." + c}'
+               for c in NOTAM_RECORD_COLUMNS if c != 'notam_no')}
+    WHERE (notam_records.content_hash IS NOT excluded.content_hash
+           OR notam_records.data_source IS NOT excluded.data_source)
+      AND (notam_records.crawl_timestamp IS NULL
+           OR notam_records.crawl_timestamp <= excluded.crawl_timestamp)
+'''
+
+# 연결별 prepared statement 캐시 크기 (sqlite3 기본값 128)
+CACHED_STATEMENTS = 256
+
+# SQLite 바인딩 변수 개수 제한 (구버전 999) 이내로 IN 조회 분할
+_LOOKUP_CHUNK = 500
+
+
+def connect(db_name: str, **kwargs) -> sqlite3.Connection:
+    """
+    pragma를 적용한 SQLite 연결
+
+    Args:
+        db_name (str): 데이터베이스 파일
+        **kwargs: sqlite3.connect 추가 인자 (check_same_thread 등)
+
+    Returns:
+        sqlite3.Connection: 연결
+    """
+    conn = sqlite3.connect(db_name, **kwargs)
+    for name, value in PRAGMAS:
+        conn.execute(f'PRAGMA {name}={value}')
+    return conn
+
+
+class ConnectionManager:
+    """
+    데이터베이스 파일 하나에 대한 프로세스 공용 연결 관리
+
+    - 스레드마다 연결을 하나 만들어 계속 재사용 (sqlite3 연결은 스레드 간 동시 사용 불가)
+    - 같은 SQL 문자열은 연결의 statement 캐시에서 재사용되어 다시 파싱하지 않음
+    - 스키마 초기화 함수는 이름별로 한 번만 실행
+
+    get_connection_manager()로 얻은 인스턴스를 크롤러/변경 감지/모니터가 공유한다.
+    연결은 커밋 후에도 열어 두므로 쓰기 후에는 반드시 commit()해야 한다.
+    """
+
+    def __init__(self, db_name: str, cached_statements: int = CACHED_STATEMENTS):
+        """
+        초기화
+
+        Args:
+            db_name (str): 데이터베이스 파일
+            cached_statements (int): 연결별 prepared statement 캐시 크기
+        """
+        self.db_name = db_name
+        self.cached_statements = cached_statements
+
+        self._lock = threading.Lock()
+        self._schema_lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = {}  # threading.Thread -> sqlite3.Connection
+        self._generation = 0
+        self._schemas = set()
+
+        self.stats = {'connections_opened': 0, 'schema_inits': 0}
+
+    def get(self) -> sqlite3.Connection:
+        """
+        현재 스레드의 연결 (없거나 close() 이후면 새로 연결)
+
+        Returns:
+            sqlite3.Connection: 연결
+        """
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is not None and local.generation == self._generation:
+            return conn
+
+        # close_all()에서 다른 스레드가 닫을 수 있도록 check_same_thread=False
+        # (사용은 항상 만든 스레드에서만)
+        conn = connect(self.db_name, check_same_thread=False,
+                       cached_statements=self.cached_statements)
+
+        with self._lock:
+            self._close_dead_threads()
+            self._connections[threading.current_thread()] = conn
+            self.stats['connections_opened'] += 1
+            local.conn = conn
+            local.generation = self._generation
+
+        return conn
+
+    def init_schema(self, name: str, setup: Callable[[sqlite3.Connection], None]) -> bool:
+        """
+        스키마 초기화 함수를 이름별로 한 번만 실행
+
+        Args:
+            name (str): 스키마 이름 (같은 이름은 다시 실행하지 않음)
+            setup (Callable): 연결을 받아 DDL/마이그레이션을 수행하는 함수
+
+        Returns:
+            bool: 이번 호출에서 실행했으면 True
+        """
+        if name in self._schemas:
+            return False
+
+        with self._schema_lock:
+            if name in self._schemas:
+                return False
+
+            conn = self.get()
+            setup(conn)
+            conn.commit()
+            self._schemas.add(name)
+            self.stats['schema_inits'] += 1
+            return True
+
+    def _close_dead_threads(self):
+        """종료된 스레드(스레드 풀 등)의 연결 정리 (lock 보유 상태에서 호출)"""
+        for thread in [t for t in self._connections if not t.is_alive()]:
+            self._connections.pop(thread).close()
+
+    def close(self):
+        """모든 스레드의 연결 종료 (이후 get() 호출 시 다시 연결)"""
+        with self._lock:
+            self._generation += 1
+            for conn in self._connections.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(db_name: str) -> ConnectionManager:
+    """
+    데이터베이스 파일별 프로세스 공용 ConnectionManager
+
+    Args:
+        db_name (str): 데이터베이스 파일 (같은 파일은 경로 표기가 달라도 같은 인스턴스)
+
+    Returns:
+        ConnectionManager: 연결 관리자
+    """
+    key = db_name if db_name == ':memory:' else os.path.abspath(db_name)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = _managers[key] = ConnectionManager(db_name)
+        return manager
+
+
+def content_hash(notam: Dict) -> str:
+    """
+    비교 필드 내용 해시 (None과 빈 문자열은 같은 값으로 취급)
+
+    Args:
+        notam (Dict): NOTAM 데이터 (notam_records 행 또는 파싱 결과)
+
+    Returns:
+        str: 32자리 hex 해시
+    """
+    text = '\x1f'.join(str(notam.get(field) or '') for field in CONTENT_HASH_FIELDS)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def ensure_content_hash_column(conn: sqlite3.Connection, batch_size: int = 5000) -> int:
+    """
+    notam_records.content_hash 컬럼 추가 및 기존 행 해시 채우기 (기존 DB 마이그레이션)
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        batch_size (int): 한 번에 갱신할 행 수
+
+    Returns:
+        int: 해시를 채운 행 수
+    """
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(notam_records)')}
+    if 'content_hash' not in columns:
+        conn.execute('ALTER TABLE notam_records ADD COLUMN content_hash TEXT')
+
+    select_sql = (f"SELECT id, {', '.join(CONTENT_HASH_FIELDS)} FROM notam_records "
+                  f"WHERE content_hash IS NULL LIMIT {int(batch_size)}")
+    migrated = 0
+    while True:
+        rows = conn.execute(select_sql).fetchall()
+        if not rows:
+            break
+        conn.executemany('UPDATE notam_records SET content_hash = ? WHERE id = ?', [
+            (content_hash(dict(zip(CONTENT_HASH_FIELDS, row[1:]))), row[0]) for row in rows
+        ])
+        conn.commit()
+        migrated += len(rows)
+
+    if migrated:
+        logger.info(f"[INFO] notam_records 내용 해시 마이그레이션: {migrated}개")
+
+    return migrated
+
+
+def ensure_last_seen_column(conn: sqlite3.Connection) -> int:
+    """
+    notam_records.last_seen 컬럼 추가 및 기존 행을 crawl_timestamp로 채우기 (기존 DB 마이그레이션)
+
+    Args:
+        conn (sqlite3.Connection): 연결
+
+    Returns:
+        int: 채운 행 수
+    """
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(notam_records)')}
+    if 'last_seen' not in columns:
+        conn.execute('ALTER TABLE notam_records ADD COLUMN last_seen TEXT')
+
+    migrated = conn.execute(
+        'UPDATE notam_records SET last_seen = crawl_timestamp WHERE last_seen IS NULL').rowcount
+    conn.commit()
+
+    if migrated:
+        logger.info(f"[INFO] notam_records last_seen 마이그레이션: {migrated}개")
+
+    return migrated
+
+
+def mark_seen(conn: sqlite3.Connection, notam_nos: Iterable[str], seen_at: str) -> int:
+    """
+    바뀌지 않은 NOTAM의 last_seen 일괄 갱신 (트랜잭션은 호출자가 관리)
+
+    last_seen에는 인덱스가 없으므로 행 내용만 바뀌고 인덱스는 다시 쓰지 않는다.
+    이미 더 최근 시각이면 그대로 둔다 (보관 응답 재처리).
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        notam_nos (Iterable[str]): NOTAM 번호
+        seen_at (str): 크롤링 타임스탬프
+
+    Returns:
+        int: 갱신한 행 수
+    """
+    notam_nos = list(notam_nos)
+    updated = 0
+    for i in range(0, len(notam_nos), _LOOKUP_CHUNK):
+        chunk = notam_nos[i:i + _LOOKUP_CHUNK]
+        updated += conn.execute(
+            f"UPDATE notam_records SET last_seen = ? "
+            f"WHERE notam_no IN ({','.join('?' * len(chunk))}) AND COALESCE(last_seen, '') < ?",
+            [seen_at] + chunk + [seen_at]).rowcount
+    return updated
+
+
+def ensure_parsed_data_column(conn: sqlite3.Connection, batch_size: int = 5000) -> int:
+    """
+    notam_records.parsed_data / parsed_version 컬럼 추가 및 파싱 결과 채우기 (시작 시마다 실행)
+
+    현재 PARSER_VERSION으로 파싱되지 않은 행 (컬럼이 이미 있던 DB의 빈 값, 이전 파서 버전)을
+    다시 파싱한다. 파싱할 내용이 없는 행도 버전을 기록하므로 다음 시작 때는 건너뛴다.
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        batch_size (int): 한 번에 갱신할 행 수
+
+    Returns:
+        int: 파싱 결과를 채운 행 수 (파싱할 내용이 없는 행 포함)
+    """
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(notam_records)')}
+    if 'parsed_data' not in columns:
+        conn.execute('ALTER TABLE notam_records ADD COLUMN parsed_data TEXT')
+    if 'parsed_version' not in columns:
+        conn.execute('ALTER TABLE notam_records ADD COLUMN parsed_version INTEGER')
+
+    migrated = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            'SELECT id, full_text, full_text_detail FROM notam_records '
+            'WHERE id > ? AND parsed_version IS NOT ? ORDER BY id LIMIT ?',
+            (last_id, PARSER_VERSION, int(batch_size))).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        conn.executemany('UPDATE notam_records SET parsed_data = ?, parsed_version = ? WHERE id = ?', [
+            (parsed_data_json({'full_text': full_text, 'full_text_detail': detail}), PARSER_VERSION, row_id)
+            for row_id, full_text, detail in rows
+        ])
+        conn.commit()
+        migrated += len(rows)
+
+    if migrated:
+        logger.info(f"[INFO] notam_records parsed_data 파싱 (파서 버전 {PARSER_VERSION}): {migrated}개")
+
+    return migrated
+
+
+def ensure_epoch_columns(conn: sqlite3.Connection, batch_size: int = 5000) -> int:
+    """
+    notam_records epoch 컬럼 (issue_ts, start_ts, end_ts, end_perm, end_est) 추가 및
+    변환되지 않은 행 변환 (시작 시마다 실행)
+
+    변환된 행은 end_ts가 NULL이 아니므로 (종료 시각이 없으면 PERM_EPOCH, epoch_columns 참고)
+    end_ts IS NULL인 행만 변환한다. 컬럼이 이미 있던 DB, 중단된 마이그레이션, 이전 버전에서
+    종료 시각 없이 변환된 행이 대상이며, 한 번 변환한 행은 다시 읽지 않는다
+    (idx_notam_records_active 범위 조회). 발행/시작 시각을 해석할 수 없는 행은 그 컬럼만 NULL로 남는다.
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        batch_size (int): 한 번에 갱신할 행 수
+
+    Returns:
+        int: 변환한 행 수
+    """
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(notam_records)')}
+    for column in EPOCH_COLUMNS:
+        if column not in columns:
+            conn.execute(f'ALTER TABLE notam_records ADD COLUMN {column} INTEGER')
+
+    migrated = 0
+    last_id = 0
+    update_sql = (f"UPDATE notam_records SET {', '.join(f'{c} = ?' for c in EPOCH_COLUMNS)} "
+                  f"WHERE id = ?")
+    while True:
+        rows = conn.execute(
+            'SELECT id, issue_time, start_time, end_time FROM notam_records '
+            'WHERE end_ts IS NULL AND id > ? ORDER BY id LIMIT ?',
+            (last_id, int(batch_size))).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        times = epoch_columns({'issue_time': issue, 'start_time': start, 'end_time': end}
+                              for _, issue, start, end in rows)
+        conn.executemany(update_sql, [values + (row[0],) for values, row in zip(times, rows)])
+        conn.commit()
+        migrated += len(rows)
+
+    if migrated:
+        logger.info(f"[INFO] notam_records epoch 시각 마이그레이션: {migrated}개")
+
+    return migrated
+
+
+def build_record_rows(notam_list: Iterable[Dict[str, str]],
+                      data_source: str,
+                      crawl_timestamp: str) -> List[Tuple]:
+    """
+    NOTAM 딕셔너리를 notam_records 삽입용 튜플로 변환 (NOTAM 번호 없는 항목 제외)
+
+    본문 구조화(parsed_data)는 여기서 한 번만 수행하며, 같은 본문은 파서 메모에서 재사용한다.
+    epoch 시각 컬럼은 배치 전체를 한 번에 변환한다 (고유 시각 문자열만 변환).
+
+    Args:
+        notam_list (Iterable[Dict[str, str]]): NOTAM 데이터
+        data_source (str): 'domestic' 또는 'international'
+        crawl_timestamp (str): 크롤링 타임스탬프
+
+    Returns:
+        List[Tuple]: NOTAM_RECORD_COLUMNS 순서의 튜플 목록
+    """
+    notams = []
+    for notam in notam_list:
+        if not notam.get('notam_no'):
+            logger.warning(f"[WARN] NOTAM 번호 없음 - 건너뜀: {notam.get('location', 'Unknown')}")
+            continue
+        notams.append(notam)
+
+    rows = []
+    for notam, times in zip(notams, epoch_columns(notams)):
+        rows.append((
+            crawl_timestamp,
+            crawl_timestamp,
+            data_source,
+            notam.get('notam_type', ''),
+            notam.get('issue_time', ''),
+            notam.get('location', ''),
+            notam['notam_no'],
+            notam.get('qcode', ''),
+            notam.get('start_time', ''),
+            notam.get('end_time', ''),
+            notam.get('full_text', ''),
+            notam.get('full_text_detail', ''),
+            content_hash(notam),
+            parsed_data_json(notam),
+            PARSER_VERSION
+        ) + times)
+
+    return rows
+
+
+def _load_existing(conn: sqlite3.Connection, notam_nos: List[str]) -> Dict[str, Tuple[str, str, str]]:
+    """배치에 포함된 NOTAM 번호의 기존 (content_hash, data_source, crawl_timestamp)"""
+    existing = {}
+    for i in range(0, len(notam_nos), _LOOKUP_CHUNK):
+        chunk = notam_nos[i:i + _LOOKUP_CHUNK]
+        cursor = conn.execute(
+            f"SELECT notam_no, content_hash, data_source, crawl_timestamp FROM notam_records "
+            f"WHERE notam_no IN ({','.join('?' * len(chunk))})", chunk)
+        for notam_no, hash_value, data_source, crawl_timestamp in cursor:
+            existing[notam_no] = (hash_value, data_source, crawl_timestamp)
+    return existing
+
+
+def bulk_upsert_notams(conn: sqlite3.Connection, rows: List[Tuple],
+                       stats: Optional[Dict] = None) -> int:
+    """
+    notam_records 대량 upsert (단일 트랜잭션, 실패 시 전체 롤백)
+
+    배치의 기존 해시를 먼저 읽어 신규/변경 행만 기록한다. 바뀌지 않은 NOTAM은 행을 다시 쓰지 않고
+    last_seen만 일괄 갱신하므로, crawl_timestamp는 마지막 변경 시점이고 마지막 수집 시점은 last_seen이다.
+    저장된 행보다 오래된 crawl_timestamp의 행 (보관 응답 재처리)은 내용이 달라도 기록하지 않고
+    'unchanged'로 센다. last_seen은 뒤로 가지 않는다.
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        rows (List[Tuple]): build_record_rows() 결과
+        stats (Dict, optional): 전달 시 'inserted', 'updated', 'unchanged' 기록
+
+    Returns:
+        int: 기록된 레코드 수 (신규 + 변경)
+    """
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+    if rows:
+        # 공유 연결에 열린 암묵적 트랜잭션이 있으면 먼저 마무리
+        if conn.in_transaction:
+            conn.commit()
+
+        try:
+            # 읽기 후 쓰기 사이에 다른 프로세스가 끼어들지 않도록 시작부터 쓰기 잠금
+            conn.execute('BEGIN IMMEDIATE')
+            existing = _load_existing(conn, list({row[_NOTAM_NO_INDEX] for row in rows}))
+
+            changed_rows = []
+            seen = {}  # last_seen -> 바뀌지 않은 NOTAM 번호
+            for row in rows:
+                notam_no = row[_NOTAM_NO_INDEX]
+                crawl_timestamp = row[_CRAWL_TIMESTAMP_INDEX]
+                current = (row[_CONTENT_HASH_INDEX], row[_DATA_SOURCE_INDEX], crawl_timestamp)
+                previous = existing.get(notam_no)
+
+                if previous is None:
+                    counts['inserted'] += 1
+                elif previous[:2] != current[:2] and (previous[2] is None or previous[2] <= crawl_timestamp):
+                    counts['updated'] += 1
+                else:
+                    counts['unchanged'] += 1
+                    seen.setdefault(row[_LAST_SEEN_INDEX], []).append(notam_no)
+                    continue
+
+                # 같은 배치 안의 중복 NOTAM 번호도 마지막 값 기준으로 판정
+                existing[notam_no] = current
+                changed_rows.append(row)
+
+            if changed_rows:
+                conn.executemany(UPSERT_NOTAM_SQL, changed_rows)
+            for seen_at, notam_nos in seen.items():
+                mark_seen(conn, notam_nos, seen_at)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    if stats is not None:
+        stats.update(counts)
+
+    return counts['inserted'] + counts['updated']
+
+
+def find_active_notams(conn: sqlite3.Connection, window_start: datetime, window_end: datetime,
+                       data_source: Optional[str] = None,
+                       location: Optional[str] = None) -> List[Dict]:
+    """
+    구간 [window_start, window_end]에 유효한 NOTAM 조회 (idx_notam_records_active 범위 조회)
+
+    PERM은 end_ts가 최댓값이므로 항상 포함되고, 종료 시각이 EST인 NOTAM은 예상 종료 시각으로 판정한다.
+    종료 시각이 없거나 해석할 수 없는 NOTAM도 end_ts가 최댓값이므로 (end_perm=0) 시작 후 항상 포함된다.
+
+    Args:
+        conn (sqlite3.Connection): 연결
+        window_start (datetime): 구간 시작 (tzinfo가 없으면 UTC)
+        window_end (datetime): 구간 끝 (tzinfo가 없으면 UTC)
+        data_source (str, optional): 데이터 소스 필터
+        location (str, optional): 공항 필터
+
+    Returns:
+        List[Dict]: notam_records 행 (시작 시각 순)
+    """
+    query = 'SELECT * FROM notam_records WHERE end_ts >= ? AND start_ts <= ?'
+    params = [to_epoch(window_start), to_epoch(window_end)]
+    if data_source:
+        # 소스는 두 값뿐이라 선택도가 낮으므로 단항 +로 idx_notam_records_scope 선택을 막고 end_ts 범위 조회 유지
+        query += ' AND +data_source = ?'
+        params.append(data_source)
+    if location:
+        query += ' AND location = ?'
+        params.append(location)
+    query += ' ORDER BY start_ts'
+
+    cursor = conn.execute(query, params)
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
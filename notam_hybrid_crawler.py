@@ -7,7 +7,8 @@ NOTAM 하이브리드 크롤러 - API 우선, Selenium 백업
 import logging
 import sys
 import os
-from typing import Dict, Optional
+import threading
+from typing import Callable, Dict, Optional
 from datetime import datetime
 
 # Windows 한국어 환경 인코딩 설정
@@ -50,40 +51,47 @@ class NOTAMHybridCrawler:
         self.api_crawler = None
         self.selenium_crawler = None
 
+        # 국내/국제 병렬 크롤링 시 lazy loading 중복 방지
+        self._init_lock = threading.Lock()
+
         logger.info("[OK] NOTAM 하이브리드 크롤러 초기화")
 
     def _init_api_crawler(self):
         """API 크롤러 초기화 (lazy loading)"""
-        if self.api_crawler is None:
-            try:
-                from notam_crawler_api import NOTAMCrawlerAPI
-                self.api_crawler = NOTAMCrawlerAPI(db_name=self.db_name)
-                logger.info("[OK] API 크롤러 로드 완료")
-            except Exception as e:
-                logger.error(f"[ERROR] API 크롤러 로드 실패: {e}")
-                raise
+        with self._init_lock:
+            if self.api_crawler is None:
+                try:
+                    from notam_crawler_api import NOTAMCrawlerAPI
+                    self.api_crawler = NOTAMCrawlerAPI(db_name=self.db_name)
+                    logger.info("[OK] API 크롤러 로드 완료")
+                except Exception as e:
+                    logger.error(f"[ERROR] API 크롤러 로드 실패: {e}")
+                    raise
 
         return self.api_crawler
 
     def _init_selenium_crawler(self):
         """Selenium 크롤러 초기화 (lazy loading)"""
-        if self.selenium_crawler is None:
-            try:
-                from notam_crawler import NOTAMCrawler
-                self.selenium_crawler = NOTAMCrawler(
-                    db_name=self.db_name,
-                    headless=True  # 프로덕션에서는 헤드리스 모드
-                )
-                logger.info("[OK] Selenium 크롤러 로드 완료")
-            except Exception as e:
-                logger.error(f"[ERROR] Selenium 크롤러 로드 실패: {e}")
-                raise
+        with self._init_lock:
+            if self.selenium_crawler is None:
+                try:
+                    from notam_crawler import NOTAMCrawler
+                    self.selenium_crawler = NOTAMCrawler(
+                        db_name=self.db_name,
+                        headless=True  # 프로덕션에서는 헤드리스 모드
+                    )
+                    logger.info("[OK] Selenium 크롤러 로드 완료")
+                except Exception as e:
+                    logger.error(f"[ERROR] Selenium 크롤러 로드 실패: {e}")
+                    raise
 
         return self.selenium_crawler
 
     def crawl_notam(self, data_source: str = 'domestic',
                    hours_back: int = 24,
-                   force_selenium: bool = False) -> Dict:
+                   force_selenium: bool = False,
+                   incremental: bool = False,
+                   persist: Optional[Callable[..., int]] = None) -> Dict:
         """
         NOTAM 크롤링 실행 (하이브리드)
 
@@ -91,6 +99,8 @@ class NOTAMHybridCrawler:
             data_source (str): 'domestic' 또는 'international'
             hours_back (int): 과거 몇 시간부터 검색
             force_selenium (bool): True이면 Selenium 강제 사용
+            incremental (bool): API 크롤러 워터마크 기반 증분 크롤링 (Selenium은 항상 전체 구간)
+            persist (Callable, optional): 크롤러의 save_to_database 대신 사용할 저장 함수
 
         Returns:
             Dict: 크롤링 결과
@@ -112,23 +122,21 @@ class NOTAMHybridCrawler:
         # Selenium 강제 모드
         if force_selenium:
             logger.info("[MODE] Selenium 강제 모드")
-            return self._crawl_with_selenium(data_source, hours_back, result)
+            return self._crawl_with_selenium(data_source, hours_back, result, persist)
 
         # 우선순위 1: API 크롤러 시도
         logger.info("[ATTEMPT 1] API 크롤러 시도...")
         try:
             api_crawler = self._init_api_crawler()
-            api_result = api_crawler.crawl_notam_api(data_source, hours_back)
+            api_result = api_crawler.crawl_notam_api(data_source, hours_back,
+                                                     incremental=incremental,
+                                                     persist=persist)
 
             # API 성공
             if api_result.get('status') == 'SUCCESS':
-                result.update({
-                    'status': 'SUCCESS',
-                    'method': 'API',
-                    'records_found': api_result.get('records_found', 0),
-                    'records_saved': api_result.get('records_saved', 0),
-                    'execution_time': api_result.get('execution_time', 0)
-                })
+                # 삽입/갱신 건수, 페이지/샤드 타이밍 등 API 결과 항목을 모두 전달
+                result.update({k: v for k, v in api_result.items() if k != 'status'})
+                result.update({'status': 'SUCCESS', 'method': 'API'})
                 logger.info(f"[SUCCESS] API 크롤링 성공: {result['records_found']}개 발견")
                 return result
 
@@ -141,9 +149,10 @@ class NOTAMHybridCrawler:
             logger.info("[ATTEMPT 2] Selenium 크롤러로 fallback...")
 
         # 우선순위 2: Selenium 크롤러 시도
-        return self._crawl_with_selenium(data_source, hours_back, result)
+        return self._crawl_with_selenium(data_source, hours_back, result, persist)
 
-    def _crawl_with_selenium(self, data_source: str, hours_back: int, result: Dict) -> Dict:
+    def _crawl_with_selenium(self, data_source: str, hours_back: int, result: Dict,
+                             persist: Optional[Callable[..., int]] = None) -> Dict:
         """
         Selenium 크롤러로 크롤링 실행
 
@@ -151,13 +160,14 @@ class NOTAMHybridCrawler:
             data_source (str): 'domestic' 또는 'international'
             hours_back (int): 과거 몇 시간부터 검색
             result (Dict): 결과 딕셔너리
+            persist (Callable, optional): save_to_database 대신 사용할 저장 함수
 
         Returns:
             Dict: 업데이트된 결과
         """
         try:
             selenium_crawler = self._init_selenium_crawler()
-            selenium_result = selenium_crawler.crawl_notam(data_source, hours_back)
+            selenium_result = selenium_crawler.crawl_notam(data_source, hours_back, persist=persist)
 
             # Selenium 성공
             if selenium_result.get('status') == 'SUCCESS':
@@ -0,0 +1,453 @@
+"""
+로컬 AIM 대역 서버 - /xNotam/searchAllNotam.do 에뮬레이션
+작성일: 2026-10-17
+기능:
+  - IBSheet JSON / XML 응답 형식 및 페이지네이션 (ibsheetPageNo, ibsheetRowPerPage, Total)
+  - 공항 / SERIES / 발행 시각 구간 필터 (샤드/증분 크롤링 검증용)
+  - 데이터셋 크기, 응답 지연 분포, 오류/타임아웃 주입, 요청 속도 제한 (429)
+  - /stats 엔드포인트로 요청 카운터 조회
+
+실행 예:
+  python notam_mock_server.py --port 8080 --size 20000 --latency-dist lognormal --latency-ms 80
+  NOTAM_API_BASE_URL=http://127.0.0.1:8080 python notam_monitor.py
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PATH = '/xNotam/searchAllNotam.do'
+
+# 공항 코드, 좌표 (Q) 라인 생성용), 상대 빈도
+AIRPORTS = [
+    ('RKRR', '3730N12700E', 12), ('RKSI', '3728N12626E', 20), ('RKSS', '3733N12648E', 10),
+    ('RKPK', '3511N12856E', 8), ('RKPC', '3331N12629E', 8), ('RKPS', '3505N12805E', 3),
+    ('RKPU', '3535N12921E', 3), ('RKSM', '3727N12707E', 3), ('RKTH', '3559N12926E', 2),
+    ('RKPD', '3308N12647E', 2), ('RKTL', '3659N12926E', 2), ('RKNW', '3726N12758E', 2),
+    ('RKJK', '3554N12636E', 2), ('RKJB', '3452N12622E', 3), ('RKJY', '3450N12737E', 2),
+    ('RKJJ', '3508N12649E', 2), ('RKTN', '3553N12839E', 3), ('RKTU', '3642N12730E', 3),
+    ('RKNY', '3805N12840E', 2)
+]
+
+SERIES = [('A', 30), ('C', 10), ('D', 15), ('E', 10), ('G', 5), ('Z', 25), ('SNOWTAM', 5)]
+
+# 국제 데이터셋 NOTAM 번호 시작값 (notam_no UNIQUE 키에서 국내 번호와 겹치지 않도록 별도 구간)
+INTL_NUMBER_OFFSET = 500000
+
+QCODES = ['QMRLC', 'QFAXX', 'QMXLC', 'QOBCE', 'QRTCA', 'QWULW', 'QNVAS', 'QSTAH', 'QICAS', 'QPICH']
+
+TEXTS = [
+    'RWY {rwy} CLSD DUE TO MAINT',
+    'TWY {twy} CLSD',
+    'OBST CRANE ERECTED HGT 150FT AGL',
+    'TEMPO RESTRICTED AREA ACT',
+    'ILS RWY {rwy} U/S',
+    'APRON STAND {stand} CLSD',
+    'UAS OPS WILL TAKE PLACE',
+    '활주로 {rwy} 보수 공사로 폐쇄'
+]
+
+
+class MockDataset:
+    """합성 NOTAM 데이터셋 (국내/국제 각각 고정 시드로 생성)"""
+
+    def __init__(self, size: int, span_hours: int = 72, seed: int = 1,
+                 now: Optional[datetime] = None, number_offset: int = 0):
+        """
+        Args:
+            size (int): NOTAM 개수
+            span_hours (int): 발행 시각 분포 구간 (현재 시각 기준 과거 몇 시간)
+            seed (int): 난수 시드
+            now (datetime, optional): 기준 시각 (UTC)
+            number_offset (int): NOTAM 번호 시작값 (데이터셋끼리 번호가 겹치지 않게 할 때)
+        """
+        rng = random.Random(seed)
+        now = (now or datetime.now(timezone.utc)).replace(second=0, microsecond=0, tzinfo=None)
+
+        airport_codes = [a[0] for a in AIRPORTS]
+        airport_weights = [a[2] for a in AIRPORTS]
+        coords = {a[0]: a[1] for a in AIRPORTS}
+        series_codes = [s[0] for s in SERIES]
+        series_weights = [s[1] for s in SERIES]
+
+        self.rows = []
+        for i in range(size):
+            location = rng.choices(airport_codes, airport_weights)[0]
+            series = rng.choices(series_codes, series_weights)[0]
+            issue = now - timedelta(minutes=rng.randrange(span_hours * 60))
+            start = issue + timedelta(minutes=rng.choice([0, 30, 60, 120]))
+
+            roll = rng.random()
+            if roll < 0.05:
+                end_str = 'PERM'
+            else:
+                end = start + timedelta(hours=rng.randint(1, 24 * 30))
+                end_str = end.strftime('%y%m%d%H%M') + ('EST' if roll < 0.15 else '')
+
+            prefix = 'S' if series == 'SNOWTAM' else series
+            notam_no = f'{prefix}{number_offset + i:04d}/{issue.strftime("%y")}'
+
+            qcode = rng.choice(QCODES)
+            lower = rng.choice([0, 0, 0, 10, 50])
+            upper = rng.choice([999, 999, 100, 200, 50]) if lower < 50 else 999
+            text = rng.choice(TEXTS).format(
+                rwy=rng.choice(['15L/33R', '15R/33L', '16/34', '07/25']),
+                twy=rng.choice(['A', 'B', 'C1', 'G']),
+                stand=rng.randint(1, 120))
+            q_line = (f'Q) RKRR/{qcode}/IV/NBO/A /{lower:03d}/{upper:03d}/'
+                      f'{coords[location]}{rng.choice([5, 5, 10, 25]):03d}')
+
+            self.rows.append({
+                'AIS_TYPE': series,
+                'ISSUE_TIME': issue.strftime('%y%m%d%H%M'),
+                'LOCATION': location,
+                'NOTAM_NO': notam_no,
+                'QCODE': qcode,
+                'EFFECTIVESTART': start.strftime('%y%m%d%H%M'),
+                'EFFECTIVEEND': end_str,
+                'ECODE': text,
+                'FULL_TEXT': (f'{q_line} A) {location} B) {start.strftime("%y%m%d%H%M")} '
+                              f'C) {end_str} E) {text}'),
+                '_issue': issue
+            })
+
+        # 실제 화면과 같이 발행 시각 내림차순
+        self.rows.sort(key=lambda r: r['_issue'], reverse=True)
+
+    def search(self, params: Dict[str, str]) -> List[Dict]:
+        """검색 파라미터로 필터링"""
+        airports = set(filter(None, params.get('sch_airport', '').split(',')))
+        series = set(filter(None, params.get('sch_series', '').split(',')))
+        if params.get('sch_snow_series'):
+            series.add('SNOWTAM')
+
+        window_start = _parse_window(params.get('sch_from_date'), params.get('sch_from_time'))
+        window_end = _parse_window(params.get('sch_to_date'), params.get('sch_to_time'))
+
+        result = []
+        for row in self.rows:
+            if airports and row['LOCATION'] not in airports:
+                continue
+            if series and row['AIS_TYPE'] not in series:
+                continue
+            if window_start and row['_issue'] < window_start:
+                continue
+            if window_end and row['_issue'] > window_end:
+                continue
+            result.append(row)
+
+        return result
+
+
+def _parse_window(date_str: Optional[str], time_str: Optional[str]) -> Optional[datetime]:
+    """sch_*_date (YYYY-MM-DD) + sch_*_time (HHMM) 파싱"""
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(f'{date_str} {time_str or "0000"}', '%Y-%m-%d %H%M')
+    except ValueError:
+        return None
+
+
+class MockConfig:
+    """대역 서버 동작 설정"""
+
+    def __init__(self, size: int = 2000,
+                 intl_size: Optional[int] = None,
+                 span_hours: int = 72,
+                 response_format: str = 'json',
+                 latency_dist: str = 'fixed',
+                 latency_ms: float = 50.0,
+                 latency_jitter_ms: float = 20.0,
+                 error_rate: float = 0.0,
+                 timeout_rate: float = 0.0,
+                 timeout_s: float = 35.0,
+                 rate_limit: float = 0.0,
+                 retry_after: float = 1.0,
+                 seed: int = 1):
+        """
+        Args:
+            size (int): 국내 데이터셋 NOTAM 수
+            intl_size (int, optional): 국제 데이터셋 NOTAM 수 (기본: size와 동일)
+            span_hours (int): 발행 시각 분포 구간 (시간)
+            response_format (str): 'json' 또는 'xml'
+            latency_dist (str): 'fixed', 'uniform', 'lognormal'
+            latency_ms (float): 평균(기준) 응답 지연 (ms)
+            latency_jitter_ms (float): uniform은 ±폭, lognormal은 표준편차 (ms)
+            error_rate (float): 500 응답 비율 (0~1)
+            timeout_rate (float): 응답 지연 주입 비율 (0~1, timeout_s 동안 대기)
+            timeout_s (float): 타임아웃 주입 시 대기 시간 (초)
+            rate_limit (float): 초당 허용 요청 수 (0이면 제한 없음, 초과 시 429)
+            retry_after (float): 429 응답의 Retry-After (초)
+            seed (int): 데이터셋 난수 시드
+        """
+        self.size = size
+        self.intl_size = size if intl_size is None else intl_size
+        self.span_hours = span_hours
+        self.response_format = response_format
+        self.latency_dist = latency_dist
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_s = timeout_s
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.seed = seed
+
+
+class MockAIMServer:
+    """
+    searchAllNotam.do 대역 HTTP 서버
+
+    사용 예:
+        server = MockAIMServer(MockConfig(size=20000, latency_dist='lognormal'))
+        base_url = server.start()
+        crawler = NOTAMCrawlerAPI(base_url=base_url)
+        ...
+        server.stop()
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            config (MockConfig, optional): 동작 설정
+            host (str): 바인딩 주소
+            port (int): 포트 (0이면 자동 할당)
+        """
+        self.config = config or MockConfig()
+        self.datasets = {
+            'D': MockDataset(self.config.size, self.config.span_hours, self.config.seed),
+            'I': MockDataset(self.config.intl_size, self.config.span_hours, self.config.seed + 1,
+                             number_offset=INTL_NUMBER_OFFSET)
+        }
+
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._tokens = max(1.0, self.config.rate_limit)
+        self._token_updated = time.monotonic()
+        self.counters = {
+            'requests': 0, 'ok': 0, 'errors': 0, 'timeouts': 0, 'throttled': 0, 'rows_served': 0
+        }
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> str:
+        """백그라운드 스레드로 시작하고 base_url 반환"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """서버 종료"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def get_stats(self) -> Dict:
+        """요청 카운터 스냅샷"""
+        with self._lock:
+            return dict(self.counters)
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.counters[key] += amount
+
+    def _take_token(self) -> bool:
+        """요청 속도 제한 토큰 획득 (rate_limit=0이면 항상 허용)"""
+        rate = self.config.rate_limit
+        if rate <= 0:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(max(1.0, rate), self._tokens + (now - self._token_updated) * rate)
+            self._token_updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def _sample_latency(self) -> float:
+        """설정된 분포에서 응답 지연 (초) 추출"""
+        cfg = self.config
+        with self._lock:
+            if cfg.latency_dist == 'uniform':
+                ms = self._rng.uniform(cfg.latency_ms - cfg.latency_jitter_ms,
+                                       cfg.latency_ms + cfg.latency_jitter_ms)
+            elif cfg.latency_dist == 'lognormal' and cfg.latency_ms > 0:
+                # 평균 latency_ms, 표준편차 latency_jitter_ms인 로그정규 분포
+                variance = math.log(1 + (cfg.latency_jitter_ms / cfg.latency_ms) ** 2)
+                ms = self._rng.lognormvariate(math.log(cfg.latency_ms) - variance / 2, math.sqrt(variance))
+            else:
+                ms = cfg.latency_ms
+        return max(0.0, ms) / 1000
+
+    def _roll(self, probability: float) -> bool:
+        if probability <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < probability
+
+    def render_page(self, params: Dict[str, str]) -> Tuple[bytes, str]:
+        """검색 결과 페이지 응답 본문 생성"""
+        dataset = self.datasets['I' if params.get('sch_inorout') == 'I' else 'D']
+        rows = dataset.search(params)
+
+        try:
+            page = max(1, int(params.get('ibsheetPageNo') or 1))
+            per_page = max(1, int(params.get('ibsheetRowPerPage') or 100))
+        except ValueError:
+            page, per_page = 1, 100
+
+        page_rows = rows[(page - 1) * per_page:page * per_page]
+        self._count('rows_served', len(page_rows))
+        response_format = params.get('format') or self.config.response_format
+
+        if response_format == 'xml':
+            parts = [f'<?xml version="1.0" encoding="UTF-8"?><SHEET><DATA TOTAL="{len(rows)}">']
+            for idx, row in enumerate(page_rows, (page - 1) * per_page + 1):
+                cells = [str(idx), row['AIS_TYPE'], row['ISSUE_TIME'], row['LOCATION'], row['NOTAM_NO'],
+                         row['QCODE'], row['EFFECTIVESTART'], row['EFFECTIVEEND'], row['ECODE'],
+                         row['FULL_TEXT']]
+                parts.append('<TR>' + ''.join(f'<TD>{escape(c)}</TD>' for c in cells) + '</TR>')
+            parts.append('</DATA></SHEET>')
+            return ''.join(parts).encode('utf-8'), 'text/xml; charset=UTF-8'
+
+        data = [{k: v for k, v in row.items() if not k.startswith('_')} for row in page_rows]
+        body = json.dumps({'Total': len(rows), 'DATA': data}, ensure_ascii=False)
+        return body.encode('utf-8'), 'application/json; charset=UTF-8'
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, fmt, *args):
+                logger.debug(fmt % args)
+
+            def _send(self, status: int, body: bytes, content_type: str = 'text/plain',
+                      headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self, params: Dict[str, str]):
+                path = urlparse(self.path).path
+
+                if path == '/stats':
+                    self._send(200, json.dumps(server.get_stats()).encode(), 'application/json')
+                    return
+                if path != SEARCH_PATH:
+                    self._send(404, b'not found')
+                    return
+
+                server._count('requests')
+
+                if not server._take_token():
+                    server._count('throttled')
+                    self._send(429, b'too many requests',
+                               headers={'Retry-After': str(server.config.retry_after)})
+                    return
+
+                if server._roll(server.config.timeout_rate):
+                    server._count('timeouts')
+                    time.sleep(server.config.timeout_s)
+                    self.close_connection = True
+                    return
+
+                time.sleep(server._sample_latency())
+
+                if server._roll(server.config.error_rate):
+                    server._count('errors')
+                    self._send(500, b'internal server error')
+                    return
+
+                body, content_type = server.render_page(params)
+                server._count('ok')
+                self._send(200, body, content_type)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length).decode('utf-8', 'replace')
+                params = {k: v[0] for k, v in parse_qs(raw, keep_blank_values=True).items()}
+                self._handle(params)
+
+            def do_GET(self):
+                query = urlparse(self.path).query
+                params = {k: v[0] for k, v in parse_qs(query, keep_blank_values=True).items()}
+                self._handle(params)
+
+        return Handler
+
+
+def main():
+    """대역 서버 실행"""
+    parser = argparse.ArgumentParser(description='로컬 AIM searchAllNotam.do 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--size', type=int, default=2000, help='국내 NOTAM 수')
+    parser.add_argument('--intl-size', type=int, help='국제 NOTAM 수 (기본: --size)')
+    parser.add_argument('--span-hours', type=int, default=72, help='발행 시각 분포 구간 (시간)')
+    parser.add_argument('--format', dest='response_format', choices=['json', 'xml'], default='json')
+    parser.add_argument('--latency-dist', choices=['fixed', 'uniform', 'lognormal'], default='fixed')
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--latency-jitter-ms', type=float, default=20.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500 응답 비율 (0~1)')
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help='무응답 주입 비율 (0~1)')
+    parser.add_argument('--timeout-s', type=float, default=35.0)
+    parser.add_argument('--rate-limit', type=float, default=0.0, help='초당 허용 요청 수 (0: 무제한)')
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler(sys.stdout)])
+
+    config = MockConfig(
+        size=args.size, intl_size=args.intl_size, span_hours=args.span_hours,
+        response_format=args.response_format, latency_dist=args.latency_dist,
+        latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate, timeout_rate=args.timeout_rate, timeout_s=args.timeout_s,
+        rate_limit=args.rate_limit, retry_after=args.retry_after, seed=args.seed)
+
+    server = MockAIMServer(config, args.host, args.port)
+    logger.info(f"[OK] AIM 대역 서버 시작: {server.base_url}{SEARCH_PATH}")
+    logger.info(f"[INFO] 국내 {config.size}개 / 국제 {config.intl_size}개, 형식 {config.response_format}, "
+                f"지연 {config.latency_dist} {config.latency_ms}ms")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        logger.info(f"[INFO] 요청 통계: {server.get_stats()}")
+
+
+if __name__ == '__main__':
+    main()
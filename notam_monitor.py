@@ -11,9 +11,15 @@ NOTAM 모니터링 시스템 - 크롤링 + 변경 감지 통합
 import logging
 import sys
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Optional
 
+from notam_db import get_connection_manager
+from notam_record import RECORD_FIELDS, NOTAMRecord
+
 # Windows 한국어 환경 인코딩 설정
 if sys.platform == 'win32':
     try:
@@ -42,17 +48,28 @@ class NOTAMMonitor:
     - 크롤링 + 변경 감지 + 알림
     """
 
-    def __init__(self, db_name='notam_realtime.db'):
+    def __init__(self, db_name='notam_realtime.db', pipeline: bool = False, snapshot=None):
         """
         초기화
 
         Args:
             db_name (str): SQLite 데이터베이스 파일명
+            pipeline (bool): 수집 배치를 저장 전에 비교하고 행 기록 + 변경 로그를
+                한 트랜잭션으로 반영 (변경 감지 활성화 시)
+            snapshot (NOTAMSnapshot, optional): 감지한 변경을 반영할 유효 NOTAM 스냅샷
         """
         self.db_name = db_name
+        self.pipeline = pipeline
+        self.snapshot = snapshot
         self.crawler = None
         self.detector = None
 
+        # 프로세스 공용 연결 관리 (크롤러/변경 감지와 같은 연결 재사용)
+        self.db = get_connection_manager(db_name)
+
+        # 국내/국제 병렬 모니터링 시 lazy loading 중복 방지
+        self._init_lock = threading.Lock()
+
         logger.info("\n" + "="*70)
         logger.info("NOTAM 통합 모니터링 시스템")
         logger.info("="*70)
@@ -60,23 +77,26 @@ class NOTAMMonitor:
 
     def _init_crawler(self):
         """크롤러 초기화 (lazy loading)"""
-        if self.crawler is None:
-            from notam_hybrid_crawler import NOTAMHybridCrawler
-            self.crawler = NOTAMHybridCrawler(db_name=self.db_name)
+        with self._init_lock:
+            if self.crawler is None:
+                from notam_hybrid_crawler import NOTAMHybridCrawler
+                self.crawler = NOTAMHybridCrawler(db_name=self.db_name)
 
         return self.crawler
 
     def _init_detector(self):
         """변경 감지기 초기화 (lazy loading)"""
-        if self.detector is None:
-            from notam_change_detector import NOTAMChangeDetector
-            self.detector = NOTAMChangeDetector(db_name=self.db_name)
+        with self._init_lock:
+            if self.detector is None:
+                from notam_change_detector import NOTAMChangeDetector
+                self.detector = NOTAMChangeDetector(db_name=self.db_name)
 
         return self.detector
 
     def monitor_single(self, data_source: str = 'domestic',
                       hours_back: int = 24,
-                      enable_change_detection: bool = True) -> Dict:
+                      enable_change_detection: bool = True,
+                      incremental: bool = False) -> Dict:
         """
         단일 데이터 소스 모니터링
 
@@ -84,32 +104,39 @@ class NOTAMMonitor:
             data_source (str): 'domestic' 또는 'international'
             hours_back (int): 과거 몇 시간부터 검색
             enable_change_detection (bool): 변경 감지 활성화 여부
+            incremental (bool): 마지막 성공 크롤링 이후 구간만 요청 (실패 후에는 전체 구간)
 
         Returns:
             Dict: 모니터링 결과
         """
         logger.info(f"\n{'='*70}")
         logger.info(f"[START] {data_source.upper()} NOTAM 모니터링")
-        logger.info(f"[INFO] 검색 범위: 최근 {hours_back}시간")
+        logger.info(f"[INFO] 검색 범위: 최근 {hours_back}시간{' (증분)' if incremental else ''}")
         logger.info(f"[INFO] 변경 감지: {'활성화' if enable_change_detection else '비활성화'}")
         logger.info(f"{'='*70}\n")
 
+        if self.pipeline and enable_change_detection:
+            return self._monitor_pipeline(data_source, hours_back, incremental)
+
+        started = time.time()
         result = {
             'data_source': data_source,
             'status': 'FAILED',
             'crawl_result': None,
             'change_result': None,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat(),
+            'elapsed': 0
         }
 
         # 1. 크롤링 실행
         try:
             crawler = self._init_crawler()
-            crawl_result = crawler.crawl_notam(data_source, hours_back)
+            crawl_result = crawler.crawl_notam(data_source, hours_back, incremental=incremental)
             result['crawl_result'] = crawl_result
 
             if crawl_result['status'] != 'SUCCESS':
                 logger.error(f"[ERROR] 크롤링 실패: {crawl_result.get('error', 'Unknown')}")
+                result['elapsed'] = time.time() - started
                 return result
 
             logger.info(f"[OK] 크롤링 완료: {crawl_result['records_found']}개 발견\n")
@@ -117,6 +144,7 @@ class NOTAMMonitor:
         except Exception as e:
             logger.error(f"[ERROR] 크롤링 오류: {e}")
             result['error'] = str(e)
+            result['elapsed'] = time.time() - started
             return result
 
         # 2. 변경 감지 (옵션)
@@ -128,15 +156,19 @@ class NOTAMMonitor:
                 if current_notams:
                     detector = self._init_detector()
 
-                    # 변경 감지
-                    changes = detector.detect_changes(current_notams, data_source)
+                    # 감지기 연결은 국내/국제가 공유하므로 감지 + 로그 저장을 직렬화
+                    with detector.lock:
+                        # 변경 감지
+                        changes = detector.detect_changes(current_notams, data_source)
+
+                        # 변경 로그 저장
+                        change_result = detector.process_changes(
+                            changes,
+                            data_source=data_source,
+                            crawl_batch_id=None
+                        )
 
-                    # 변경 로그 저장
-                    change_result = detector.process_changes(
-                        changes,
-                        data_source=data_source,
-                        crawl_batch_id=None
-                    )
+                    self._refresh_snapshot(changes, data_source)
 
                     result['change_result'] = {
                         'status': change_result['status'],
@@ -157,34 +189,126 @@ class NOTAMMonitor:
                 result['change_result'] = {'status': 'FAILED', 'error': str(e)}
 
         result['status'] = 'SUCCESS'
+        result['elapsed'] = time.time() - started
         return result
 
-    def _get_current_notams(self, data_source: str):
-        """현재 DB의 NOTAM 데이터 가져오기"""
-        import sqlite3
+    def _monitor_pipeline(self, data_source: str, hours_back: int, incremental: bool) -> Dict:
+        """
+        파이프라인 모드 단일 소스 모니터링
+
+        크롤러의 저장 단계를 NOTAMChangeDetector.apply_batch()로 대체해, 수집 배치를
+        저장된 상태와 비교한 결과로 행 기록과 변경 로그를 한 트랜잭션에서 처리한다.
+        저장 후 테이블을 다시 읽어 자기 자신과 비교하지 않는다.
+
+        Args:
+            data_source (str): 'domestic' 또는 'international'
+            hours_back (int): 과거 몇 시간부터 검색
+            incremental (bool): 워터마크 기반 증분 크롤링 여부
+
+        Returns:
+            Dict: monitor_single()과 같은 형식의 결과
+        """
+        started = time.time()
+        result = {
+            'data_source': data_source,
+            'status': 'FAILED',
+            'crawl_result': None,
+            'change_result': None,
+            'timestamp': datetime.now().isoformat(),
+            'elapsed': 0
+        }
+
+        detector = self._init_detector()
+        applied = {}
+
+        def persist(notam_list, source, crawl_timestamp, stats, scope=None):
+            # 빈 배치는 비교하지 않음 (조회 범위 전체가 삭제로 판정되는 것 방지)
+            if not notam_list:
+                stats.update({'inserted': 0, 'updated': 0, 'unchanged': 0})
+                return 0
+            # 삭제 판정은 크롤러가 실제로 조회한 범위 안으로 한정
+            applied['changes'] = detector.apply_batch(notam_list, source, crawl_timestamp,
+                                                      stats=stats, scope=scope)
+            applied['logs_saved'] = stats['logs_saved']
+            return stats['inserted'] + stats['updated']
 
-        conn = sqlite3.connect(self.db_name)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        try:
+            crawler = self._init_crawler()
+            crawl_result = crawler.crawl_notam(data_source, hours_back, incremental=incremental,
+                                               persist=persist)
+            result['crawl_result'] = crawl_result
+
+            if crawl_result['status'] != 'SUCCESS':
+                logger.error(f"[ERROR] 크롤링 실패: {crawl_result.get('error', 'Unknown')}")
+                result['elapsed'] = time.time() - started
+                return result
+
+            logger.info(f"[OK] 크롤링 + 변경 반영 완료: {crawl_result['records_found']}개 발견\n")
+
+        except Exception as e:
+            logger.error(f"[ERROR] 크롤링 오류: {e}")
+            result['error'] = str(e)
+            result['elapsed'] = time.time() - started
+            return result
+
+        changes = applied.get('changes')
+        if changes is not None:
+            self._refresh_snapshot(changes, data_source)
+            result['change_result'] = {
+                'status': 'SUCCESS',
+                'new': len(changes['new']),
+                'updated': len(changes['updated']),
+                'deleted': len(changes['deleted']),
+                'unchanged': changes['unchanged'],
+                'logs_saved': applied['logs_saved']
+            }
+
+            logger.info(f"[OK] 변경 감지 완료")
+            logger.info(f"  신규: {len(changes['new'])}개")
+            logger.info(f"  업데이트: {len(changes['updated'])}개")
+            logger.info(f"  삭제: {len(changes['deleted'])}개\n")
+
+        result['status'] = 'SUCCESS'
+        result['elapsed'] = time.time() - started
+        return result
+
+    def _refresh_snapshot(self, changes: Dict, data_source: str):
+        """감지한 변경을 스냅샷에 반영 (실패해도 모니터링 결과에는 영향 없음)"""
+        if self.snapshot is None:
+            return
+        try:
+            self.snapshot.apply_changes(changes, data_source)
+        except Exception as e:
+            logger.error(f"[ERROR] 스냅샷 갱신 오류: {e}")
+
+    def _get_current_notams(self, data_source: str):
+        """현재 DB의 NOTAM 데이터 가져오기 (NOTAMRecord, 행 딕셔너리 복사 없음)"""
+        cursor = self.db.get().cursor()
 
         cursor.execute(
-            "SELECT * FROM notam_records WHERE data_source = ?",
+            f"SELECT {', '.join(RECORD_FIELDS)} FROM notam_records WHERE data_source = ?",
             (data_source,)
         )
 
-        notams = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        notams = [NOTAMRecord(*row) for row in cursor]
 
         return notams
 
     def monitor_all(self, hours_back: int = 24,
-                   enable_change_detection: bool = True) -> Dict:
+                   enable_change_detection: bool = True,
+                   incremental: bool = False,
+                   parallel: bool = True) -> Dict:
         """
         전체 모니터링 (국내 + 국제)
 
+        국내/국제는 서로 독립적인 요청이므로 기본적으로 크롤링과 변경 감지를
+        동시에 실행한다. SQLite 쓰기는 크롤러/감지기 lock으로 직렬화된다.
+
         Args:
             hours_back (int): 과거 몇 시간부터 검색
             enable_change_detection (bool): 변경 감지 활성화 여부
+            incremental (bool): 워터마크 기반 증분 크롤링 여부
+            parallel (bool): 국내/국제 동시 모니터링 여부
 
         Returns:
             Dict: 전체 모니터링 결과
@@ -193,11 +317,31 @@ class NOTAMMonitor:
         logger.info("[START] 전체 NOTAM 모니터링 (국내 + 국제)")
         logger.info("="*70 + "\n")
 
-        # 국내 모니터링
-        domestic_result = self.monitor_single('domestic', hours_back, enable_change_detection)
+        started = time.time()
+        data_sources = ('domestic', 'international')
+
+        if parallel:
+            # 스레드 시작 전에 공유 객체 생성
+            self._init_crawler()
+            if enable_change_detection:
+                self._init_detector()
+
+            with ThreadPoolExecutor(max_workers=len(data_sources), thread_name_prefix='notam-monitor') as executor:
+                futures = {
+                    source: executor.submit(self.monitor_single, source, hours_back,
+                                            enable_change_detection, incremental)
+                    for source in data_sources
+                }
+                results = {source: future.result() for source, future in futures.items()}
+        else:
+            results = {
+                source: self.monitor_single(source, hours_back, enable_change_detection, incremental)
+                for source in data_sources
+            }
 
-        # 국제 모니터링
-        international_result = self.monitor_single('international', hours_back, enable_change_detection)
+        wall_time = time.time() - started
+        domestic_result = results['domestic']
+        international_result = results['international']
 
         # 통합 결과
         logger.info("\n" + "="*70)
@@ -205,7 +349,7 @@ class NOTAMMonitor:
         logger.info("="*70)
 
         # 국내 요약
-        logger.info(f"\n국내 NOTAM:")
+        logger.info(f"\n국내 NOTAM: (소요 {domestic_result['elapsed']:.2f}초)")
         if domestic_result['crawl_result']:
             cr = domestic_result['crawl_result']
             logger.info(f"  크롤링: {cr['records_found']}개 발견 (방법: {cr['method']})")
@@ -215,7 +359,7 @@ class NOTAMMonitor:
             logger.info(f"  변경: 신규 {ch['new']}개, 업데이트 {ch['updated']}개, 삭제 {ch['deleted']}개")
 
         # 국제 요약
-        logger.info(f"\n국제 NOTAM:")
+        logger.info(f"\n국제 NOTAM: (소요 {international_result['elapsed']:.2f}초)")
         if international_result['crawl_result']:
             cr = international_result['crawl_result']
             logger.info(f"  크롤링: {cr['records_found']}개 발견 (방법: {cr['method']})")
@@ -224,11 +368,13 @@ class NOTAMMonitor:
             ch = international_result['change_result']
             logger.info(f"  변경: 신규 {ch['new']}개, 업데이트 {ch['updated']}개, 삭제 {ch['deleted']}개")
 
+        logger.info(f"\n전체 소요: {wall_time:.2f}초 ({'병렬' if parallel else '순차'})")
         logger.info("\n" + "="*70 + "\n")
 
         return {
             'domestic': domestic_result,
             'international': international_result,
+            'wall_time': wall_time,
             'timestamp': datetime.now().isoformat()
         }
 
@@ -0,0 +1,179 @@
+"""
+NOTAM ICAO 본문 파서
+작성일: 2026-10-17
+기능:
+  - Q) 행 파싱: FIR, Q-code (대상/상태), 교통 유형, 목적, 범위, 하한/상한 고도, 중심 좌표/반경
+  - A) ~ G) 항목 분리
+  - 같은 본문은 LRU 메모에서 재사용 (재크롤링 시 대부분 같은 본문, 키는 본문 해시)
+  - 수집 시 notam_records.parsed_data(JSON)로 한 번만 파싱
+"""
+
+import hashlib
+import json
+import re
+from collections import OrderedDict, namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Q) RKRR/QMRLC/IV/NBO/A /000/999/3747N12627E005
+Q_LINE_PATTERN = re.compile(
+    r'Q\)\s*(?P<fir>[A-Z]{4})\s*/\s*(?P<qcode>Q[A-Z]{4})\s*/\s*(?P<traffic>[A-Z]{0,2})\s*/'
+    r'\s*(?P<purpose>[A-Z]{0,3})\s*/\s*(?P<scope>[A-Z]{0,2})\s*/\s*(?P<lower>\d{3})\s*/\s*(?P<upper>\d{3})'
+    r'(?:\s*/\s*(?P<lat>\d{4}[NS])\s*(?P<lon>\d{5}[EW])\s*(?P<radius>\d{3})?)?'
+)
+
+# 항목 표시 "A)" ~ "G)" (행 시작 또는 공백/닫는 괄호 뒤만, 본문의 "(E)" 등은 제외. 뒤 공백은 값에서 strip)
+ITEM_PATTERN = re.compile(r'(?:^|(?<=[\s)]))([A-G])\)', re.MULTILINE)
+
+# 메모 크기 (활성 NOTAM 수보다 충분히 크게, 항목당 파싱 결과 + JSON만 보관)
+MEMO_SIZE = 32768
+
+# 파싱 규칙/결과 형식을 바꾸면 올린다 (저장된 parsed_data는 시작 시 다시 파싱됨, notam_db.ensure_parsed_data_column)
+PARSER_VERSION = 2
+
+MemoInfo = namedtuple('MemoInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+# (PARSER_VERSION, 본문 blake2b) -> (파싱 결과, parsed_data JSON). 본문 자체는 보관하지 않는다
+_memo: 'OrderedDict[Tuple[int, bytes], Tuple[Optional[Dict], Optional[str]]]' = OrderedDict()
+_memo_stats = {'hits': 0, 'misses': 0}
+
+
+def _coordinate(value: Optional[str], degree_digits: int) -> Optional[float]:
+    """'3747N' / '12627E' -> 십진 도"""
+    if not value:
+        return None
+    degrees = int(value[:degree_digits]) + int(value[degree_digits:-1]) / 60
+    return round(-degrees if value[-1] in 'SW' else degrees, 4)
+
+
+def _parse_items(text: str) -> Dict[str, str]:
+    """
+    A) ~ G) 항목 분리
+
+    본문 안의 "A)" 같은 문자열이 항목으로 잘리지 않도록 알파벳 순서가 증가하는 표시만 항목으로 보고,
+    나머지는 앞 항목 값에 그대로 이어 붙인다.
+    """
+    parts = ITEM_PATTERN.split(text)
+    items = {}
+    last = ''
+    for i in range(1, len(parts), 2):
+        letter, value = parts[i], parts[i + 1]
+        if letter > last:
+            items[letter] = value
+            last = letter
+        elif last:
+            items[last] += letter + ')' + value
+    return {letter.lower(): value.strip() for letter, value in items.items()}
+
+
+def _parse_uncached(text: str) -> Optional[Dict]:
+    """본문 파싱 (메모 없음)"""
+    q_match = Q_LINE_PATTERN.search(text)
+    items = _parse_items(text[q_match.end():] if q_match else text)
+    if not q_match:
+        return items or None
+
+    fir, qcode, traffic, purpose, scope, lower, upper, lat, lon, radius = q_match.groups()
+    parsed = {
+        'fir': fir,
+        'qcode': qcode,
+        'subject': qcode[1:3],
+        'condition': qcode[3:5],
+        'traffic': traffic or None,
+        'purpose': purpose or None,
+        'scope': scope or None,
+        'lower': int(lower),
+        'upper': int(upper),
+        'lat': _coordinate(lat, 2),
+        'lon': _coordinate(lon, 3),
+        'radius': int(radius) if radius else None,
+    }
+    parsed.update(items)
+    return parsed
+
+
+def _parse_memo(text: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    메모를 거친 본문 파싱
+
+    키는 본문 전체가 아닌 (PARSER_VERSION, blake2b 16바이트)라서 메모가 긴 본문을 붙잡아 두지 않는다.
+
+    Returns:
+        Tuple[Optional[Dict], Optional[str]]: (파싱 결과, parsed_data JSON)
+    """
+    key = (PARSER_VERSION, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest())
+    entry = _memo.get(key)
+    if entry is not None:
+        _memo.move_to_end(key)
+        _memo_stats['hits'] += 1
+        return entry
+
+    _memo_stats['misses'] += 1
+    parsed = _parse_uncached(text)
+    entry = (parsed, json.dumps(parsed, ensure_ascii=False, separators=(',', ':')) if parsed else None)
+    _memo[key] = entry
+    if len(_memo) > MEMO_SIZE:
+        _memo.popitem(last=False)
+    return entry
+
+
+def notam_text(notam: Dict) -> str:
+    """파싱 대상 본문 (Q) 행이 있는 full_text_detail 우선)"""
+    detail = notam.get('full_text_detail') or ''
+    if 'Q)' in detail or not notam.get('full_text'):
+        return detail
+    return notam.get('full_text') or ''
+
+
+def parsed_data_json(notam: Dict) -> Optional[str]:
+    """
+    notam_records.parsed_data 값
+
+    Args:
+        notam (Dict): NOTAM 데이터
+
+    Returns:
+        Optional[str]: 파싱 결과 JSON (Q) 행도 항목도 없으면 None)
+    """
+    text = notam_text(notam)
+    return _parse_memo(text)[1] if text else None
+
+
+def parse_notam(notam: Dict) -> Optional[Dict]:
+    """
+    NOTAM 본문 구조화
+
+    Args:
+        notam (Dict): NOTAM 데이터 (full_text_detail / full_text)
+
+    Returns:
+        Optional[Dict]: fir, qcode, subject, condition, traffic, purpose, scope, lower, upper,
+            lat, lon, radius (Q) 행이 있을 때) + 항목 a ~ g. 파싱할 내용이 없으면 None
+    """
+    text = notam_text(notam)
+    parsed = _parse_memo(text)[0] if text else None
+    # 메모의 딕셔너리는 공유되므로 복사본 반환 (값은 모두 불변)
+    return dict(parsed) if parsed else None
+
+
+def parse_notams(notams: Iterable[Dict]) -> List[Optional[Dict]]:
+    """
+    NOTAM 목록 일괄 구조화
+
+    Args:
+        notams (Iterable[Dict]): NOTAM 데이터
+
+    Returns:
+        List[Optional[Dict]]: parse_notam() 결과 목록
+    """
+    return [parse_notam(notam) for notam in notams]
+
+
+def memo_info() -> MemoInfo:
+    """파싱 메모 적중/미스 통계 (functools.lru_cache cache_info와 같은 필드)"""
+    return MemoInfo(_memo_stats['hits'], _memo_stats['misses'], MEMO_SIZE, len(_memo))
+
+
+def clear_memo():
+    """메모 비우기"""
+    _memo.clear()
+    _memo_stats['hits'] = _memo_stats['misses'] = 0
@@ -0,0 +1,224 @@
+"""
+NOTAM API 적응형 요청 속도 제한기
+작성일: 2026-10-17
+기능:
+  - 토큰 버킷 방식 요청 속도 제한 (크롤러 인스턴스 전체 공유)
+  - AIMD 조정: 정상 응답 시 선형 증가, 지연/429/5xx/타임아웃 시 배수 감소
+  - Retry-After 존중, 최소/최대 속도 범위
+  - 모니터링용 카운터 제공
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+
+class AdaptiveRateLimiter:
+    """
+    토큰 버킷 + AIMD 요청 속도 제한기
+
+    rate는 초당 허용 요청 수이며, 응답 결과에 따라 min_rate~max_rate 범위에서 조정된다.
+    - 정상 응답 (지연 < latency_target): rate += additive_increase / rate
+      (초당 약 additive_increase 만큼 증가)
+    - 느린 응답 (지연 >= latency_target): rate *= slow_decrease
+    - 429 / 5xx / 타임아웃: rate *= multiplicative_decrease
+    - 그 밖의 4xx, 2xx이지만 본문을 해석할 수 없는 응답: 속도 유지 (카운터만 기록)
+    감소는 decrease_cooldown 간격으로 한 번만 적용해, 동시에 실패한 요청들이
+    속도를 연쇄적으로 떨어뜨리지 않도록 한다.
+    """
+
+    def __init__(self, rate: float = 5.0,
+                 min_rate: float = 0.5,
+                 max_rate: float = 20.0,
+                 burst: float = 4.0,
+                 additive_increase: float = 1.0,
+                 multiplicative_decrease: float = 0.5,
+                 slow_decrease: float = 0.8,
+                 latency_target: float = 2.0,
+                 decrease_cooldown: float = 1.0,
+                 max_retry_delay: float = 30.0):
+        """
+        초기화
+
+        Args:
+            rate (float): 초기 초당 요청 수
+            min_rate (float): 최소 초당 요청 수 (floor)
+            max_rate (float): 최대 초당 요청 수 (ceiling)
+            burst (float): 버킷 용량 (동시에 보낼 수 있는 최대 요청 수)
+            additive_increase (float): 정상 응답 시 초당 증가량
+            multiplicative_decrease (float): 429/5xx/타임아웃 시 감소 배수
+            slow_decrease (float): 지연 목표 초과 시 감소 배수
+            latency_target (float): 정상으로 판단하는 응답 지연 상한 (초)
+            decrease_cooldown (float): 연속 감소 최소 간격 (초)
+            max_retry_delay (float): 재시도 대기 상한 (초)
+        """
+        if min_rate <= 0 or min_rate > max_rate:
+            raise ValueError(f"잘못된 속도 범위: min_rate={min_rate}, max_rate={max_rate}")
+
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1.0, burst)
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.slow_decrease = slow_decrease
+        self.latency_target = latency_target
+        self.decrease_cooldown = decrease_cooldown
+        self.max_retry_delay = max_retry_delay
+
+        self._lock = threading.Lock()
+        self._rate = min(max(rate, min_rate), max_rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+
+        self._counters = {
+            'requests': 0,
+            'successes': 0,
+            'slow_responses': 0,
+            'throttled': 0,
+            'server_errors': 0,
+            'client_errors': 0,
+            'invalid_responses': 0,
+            'timeouts': 0,
+            'errors': 0,
+            'increases': 0,
+            'decreases': 0,
+            'wait_time': 0.0
+        }
+
+    @property
+    def rate(self) -> float:
+        """현재 초당 허용 요청 수"""
+        return self._rate
+
+    def _refill(self, now: float):
+        """경과 시간만큼 토큰 보충 (lock 보유 상태에서 호출)"""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+            self._updated = now
+
+    def acquire(self) -> float:
+        """
+        요청 1건 분량의 토큰 획득 (부족하면 대기)
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self._counters['requests'] += 1
+                    self._counters['wait_time'] += waited
+                    return waited
+                else:
+                    delay = (1.0 - self._tokens) / self._rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def record_success(self, latency: float):
+        """정상 응답 기록 (지연에 따라 증가 또는 완만한 감소)"""
+        with self._lock:
+            if latency >= self.latency_target:
+                self._counters['slow_responses'] += 1
+                self._decrease(self.slow_decrease)
+            else:
+                self._counters['successes'] += 1
+                self._increase()
+
+    def record_throttle(self, retry_after: Optional[float] = None):
+        """429 응답 기록 (Retry-After 동안 전체 요청 중단)"""
+        with self._lock:
+            self._counters['throttled'] += 1
+            self._decrease(self.multiplicative_decrease)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def record_server_error(self):
+        """5xx 응답 기록"""
+        with self._lock:
+            self._counters['server_errors'] += 1
+            self._decrease(self.multiplicative_decrease)
+
+    def record_client_error(self):
+        """429 외 4xx 응답 기록 (서버 부하 신호가 아니므로 속도 유지)"""
+        with self._lock:
+            self._counters['client_errors'] += 1
+
+    def record_invalid_response(self):
+        """2xx이지만 본문을 해석할 수 없는 응답 기록 (속도 유지)"""
+        with self._lock:
+            self._counters['invalid_responses'] += 1
+
+    def record_timeout(self):
+        """요청 타임아웃 기록"""
+        with self._lock:
+            self._counters['timeouts'] += 1
+            self._decrease(self.multiplicative_decrease)
+
+    def record_error(self):
+        """기타 연결 오류 기록"""
+        with self._lock:
+            self._counters['errors'] += 1
+            self._decrease(self.multiplicative_decrease)
+
+    def retry_delay(self, attempt: int) -> float:
+        """
+        재시도 전 대기 시간 (현재 속도 기준, 지터 포함)
+
+        서버가 정상일 때는 짧게, 속도가 떨어진 상태에서는 길게 기다린다.
+
+        Args:
+            attempt (int): 실패한 시도 번호 (1부터)
+
+        Returns:
+            float: 대기 시간 (초)
+        """
+        base = attempt / self._rate
+        return min(self.max_retry_delay, base * random.uniform(0.5, 1.5))
+
+    def _increase(self):
+        new_rate = min(self.max_rate, self._rate + self.additive_increase / self._rate)
+        if new_rate > self._rate:
+            self._refill(time.monotonic())
+            self._rate = new_rate
+            self._counters['increases'] += 1
+
+    def _decrease(self, factor: float):
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+
+        new_rate = max(self.min_rate, self._rate * factor)
+        if new_rate < self._rate:
+            self._refill(now)
+            self._rate = new_rate
+            self._counters['decreases'] += 1
+        self._last_decrease = now
+
+    def get_stats(self) -> Dict:
+        """
+        모니터링용 카운터 스냅샷
+
+        Returns:
+            Dict: 현재 속도 및 누적 카운터
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                'rate': round(self._rate, 3),
+                'min_rate': self.min_rate,
+                'max_rate': self.max_rate
+            })
+            return stats
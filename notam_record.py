@@ -0,0 +1,133 @@
+"""
+NOTAM 레코드 공용 타입
+작성일: 2026-10-17
+기능:
+  - __slots__ 기반 NOTAMRecord (NOTAM당 딕셔너리 대신 고정 필드 9개)
+  - location / qcode / notam_type 문자열 intern (같은 값은 한 객체 공유)
+  - 매핑 조회 API (notam['notam_no'], notam.get(...), dict(notam)) 로 기존 딕셔너리 소비 코드와 호환
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional
+
+# NOTAM 필드 (크롤러 출력 딕셔너리 키와 동일)
+RECORD_FIELDS = (
+    'notam_type', 'issue_time', 'location', 'notam_no', 'qcode',
+    'start_time', 'end_time', 'full_text', 'full_text_detail'
+)
+
+_FIELD_SET = frozenset(RECORD_FIELDS)
+
+_intern = sys.intern
+
+
+def _text(value) -> str:
+    """필드 값을 문자열로 (None/빈 값은 '', 숫자 셀 등 문자열이 아닌 값은 str())"""
+    if value.__class__ is str:
+        return value
+    return str(value) if value else ''
+
+
+class NOTAMRecord:
+    """
+    NOTAM 한 건
+
+    파서가 만들고 저장(build_record_rows) / 변경 감지(detect_changes) API가 그대로 받는다.
+    값은 항상 문자열이며 None 대신 빈 문자열로 둔다. 매핑 API에는 항목 대입이 없지만 속성 대입은
+    막지 않는다 (생성 비용 때문). 레코드는 여러 곳에서 공유되므로 수정본은
+    from_mapping({**notam.to_dict(), ...})로 새로 만든다.
+    """
+
+    __slots__ = RECORD_FIELDS
+
+    def __init__(self, notam_type: str = '', issue_time: str = '', location: str = '',
+                 notam_no: str = '', qcode: str = '', start_time: str = '', end_time: str = '',
+                 full_text: str = '', full_text_detail: str = ''):
+        # 공항/Q-code/SERIES는 종류가 적으므로 intern해서 레코드끼리 공유
+        # 값은 거의 항상 문자열이므로 _text()는 문자열이 아닐 때만 호출 (생성 비용)
+        self.notam_type = _intern(notam_type if notam_type.__class__ is str else _text(notam_type))
+        self.issue_time = issue_time if issue_time.__class__ is str else _text(issue_time)
+        self.location = _intern(location if location.__class__ is str else _text(location))
+        self.notam_no = notam_no if notam_no.__class__ is str else _text(notam_no)
+        self.qcode = _intern(qcode if qcode.__class__ is str else _text(qcode))
+        self.start_time = start_time if start_time.__class__ is str else _text(start_time)
+        self.end_time = end_time if end_time.__class__ is str else _text(end_time)
+        self.full_text = full_text if full_text.__class__ is str else _text(full_text)
+        self.full_text_detail = full_text_detail if full_text_detail.__class__ is str else _text(full_text_detail)
+
+    @classmethod
+    def from_mapping(cls, notam) -> 'NOTAMRecord':
+        """
+        딕셔너리 / sqlite3.Row 등에서 생성 (RECORD_FIELDS 외의 키는 버림)
+
+        Args:
+            notam: NOTAM 필드를 키로 가진 매핑
+
+        Returns:
+            NOTAMRecord: 레코드 (이미 NOTAMRecord이면 그대로 반환)
+        """
+        if isinstance(notam, cls):
+            return notam
+        keys = notam.keys()
+        return cls(*[notam[field] if field in keys else '' for field in RECORD_FIELDS])
+
+    # 매핑 조회 API
+    def __getitem__(self, key: str):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        if key not in _FIELD_SET:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in _FIELD_SET
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RECORD_FIELDS)
+
+    def __len__(self) -> int:
+        return len(RECORD_FIELDS)
+
+    def keys(self):
+        return RECORD_FIELDS
+
+    def values(self):
+        return [getattr(self, field) for field in RECORD_FIELDS]
+
+    def items(self):
+        return [(field, getattr(self, field)) for field in RECORD_FIELDS]
+
+    def to_dict(self) -> Dict[str, str]:
+        """JSON 직렬화 등에 쓰는 딕셔너리 사본"""
+        return {field: getattr(self, field) for field in RECORD_FIELDS}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, NOTAMRecord):
+            return all(getattr(self, field) == getattr(other, field) for field in RECORD_FIELDS)
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'NOTAMRecord(notam_no={self.notam_no!r}, location={self.location!r}, qcode={self.qcode!r})'
+
+    def __getstate__(self):
+        return self.values()
+
+    def __setstate__(self, state):
+        # 복원 시에도 문자열 변환/intern 적용
+        self.__init__(*state)
+
+
+Mapping.register(NOTAMRecord)
+
+
+def as_plain_dict(notam) -> Optional[Dict]:
+    """변경 로그 등 JSON으로 저장할 값 (NOTAMRecord는 딕셔너리로 변환, 나머지는 그대로)"""
+    return notam.to_dict() if isinstance(notam, NOTAMRecord) else notam
@@ -0,0 +1,413 @@
+"""
+유효 NOTAM 메모리 스냅샷 (NumPy 컬럼 배열)
+작성일: 2026-10-17
+기능:
+  - notam_records에서 아직 끝나지 않은 NOTAM을 읽어 컬럼 배열로 보관
+    (시작/종료 epoch, 중심 좌표, 고도 범위(FL), 공항/소스 ID)
+  - 변경 감지 결과(detect_changes / apply_batch)로 증분 갱신
+  - 벡터화 필터: 유효 시각, 공항, 고도 범위, 거리(NM)
+  - 예: "지금 RKSI에서 FL100 아래, 반경 10 NM 안에 유효한 NOTAM"
+
+numpy는 선택 의존성이다 (pip install -r requirements-snapshot.txt).
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # 스냅샷을 쓰지 않으면 numpy 없이 동작
+    np = None
+
+from notam_parser import parse_notam
+from notam_time import epoch_columns, to_epoch
+
+logger = logging.getLogger(__name__)
+
+# 컬럼 이름, dtype
+COLUMNS = (
+    ('notam_no', 'O'),       # NOTAM 번호 (object 배열: 결과 행 번호 -> 번호 목록을 한 번에 변환)
+    ('start_ts', 'i8'),      # 시작 UTC epoch
+    ('end_ts', 'i8'),        # 종료 UTC epoch (PERM은 PERM_EPOCH)
+    ('location_id', 'i4'),   # 공항 ID (locations 인덱스)
+    ('source_id', 'i1'),     # 데이터 소스 ID (sources 인덱스)
+    ('lower', 'i2'),         # 하한 고도 (FL)
+    ('upper', 'i2'),         # 상한 고도 (FL)
+    ('lat', 'f8'),           # 중심 위도 (라디안, 없으면 NaN)
+    ('lon', 'f8'),           # 중심 경도 (라디안, 없으면 NaN)
+    ('cos_lat', 'f8'),       # cos(위도), 거리 계산용
+    ('radius', 'f4'),        # 반경 (NM, 없으면 0)
+    ('valid', '?'),          # False면 삭제된 행 (압축 전까지 자리만 차지)
+)
+
+# 스냅샷에 쓰는 parsed_data 값 (notam_parser 키)
+PARSED_FIELDS = ('lower', 'upper', 'lat', 'lon', 'radius')
+
+# Q) 행이 없는 NOTAM의 고도 범위: 알 수 없으므로 전 고도로 보고 필터에서 빠지지 않게 함
+DEFAULT_LOWER = 0
+DEFAULT_UPPER = 999
+
+# 지구 반경 (NM)
+EARTH_RADIUS_NM = 3440.065
+
+# 초기 용량 / 삭제된 행이 이 비율을 넘으면 압축
+INITIAL_CAPACITY = 1024
+COMPACT_RATIO = 0.25
+
+TimeValue = Union[datetime, int, float, None]
+
+
+def _epoch(value: TimeValue) -> int:
+    """datetime / epoch 초 / None(현재) -> epoch 초"""
+    if value is None:
+        return int(time.time())
+    if isinstance(value, datetime):
+        return to_epoch(value)
+    return int(value)
+
+
+class NOTAMSnapshot:
+    """
+    유효 NOTAM 컬럼 스냅샷
+
+    행 하나가 NOTAM 하나이고 컬럼은 용량을 두 배씩 늘리는 NumPy 배열이다. 삭제는 valid만
+    내리고 삭제 행이 COMPACT_RATIO를 넘으면 한 번에 압축한다. 필터는 모두 길이 len(self)의
+    불리언 마스크를 돌려주므로 & / | 로 조합한 뒤 notam_nos()로 NOTAM 번호를 얻는다.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("NOTAMSnapshot에는 numpy가 필요합니다: pip install -r requirements-snapshot.txt")
+
+        self._size = 0
+        self._deleted = 0
+        self._columns = {name: np.zeros(INITIAL_CAPACITY, dtype=dtype) for name, dtype in COLUMNS}
+        self._rows: Dict[str, int] = {}
+
+        # 공항 / 소스 문자열 <-> 정수 ID
+        self.locations: List[str] = []
+        self._location_ids: Dict[str, int] = {}
+        self.sources: List[str] = []
+        self._source_ids: Dict[str, int] = {}
+
+        # 갱신(쓰기)과 조회가 다른 스레드에서 일어날 수 있으므로 배열 교체를 직렬화
+        self.lock = threading.RLock()
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, data_source: Optional[str] = None,
+             now: TimeValue = None) -> 'NOTAMSnapshot':
+        """
+        notam_records에서 스냅샷 생성
+
+        종료 시각이 now 이후인 NOTAM (현재 유효 + 시작 예정)만 읽는다 (idx_notam_records_active 범위 조회).
+        시각이 형식에 맞지 않아 epoch가 없는 행은 제외한다.
+
+        Args:
+            conn (sqlite3.Connection): 연결
+            data_source (str, optional): 데이터 소스 필터
+            now (datetime | int, optional): 기준 시각 (기본: 현재)
+
+        Returns:
+            NOTAMSnapshot: 스냅샷
+        """
+        # 필요한 파싱 값만 SQLite JSON 함수로 꺼냄 (행마다 json.loads 하지 않음)
+        fields = ', '.join(f"json_extract(parsed_data, '$.{field}')" for field in PARSED_FIELDS)
+        query = (f'SELECT notam_no, data_source, location, start_ts, end_ts, {fields} '
+                 'FROM notam_records WHERE end_ts >= ? AND start_ts IS NOT NULL')
+        params = [_epoch(now)]
+        if data_source:
+            query += ' AND +data_source = ?'
+            params.append(data_source)
+
+        snapshot = cls()
+        snapshot._upsert(conn.execute(query, params).fetchall())
+        logger.info(f"[OK] NOTAM 스냅샷 로드: {len(snapshot)}개")
+        return snapshot
+
+    def __len__(self) -> int:
+        return self._size - self._deleted
+
+    @property
+    def size(self) -> int:
+        """마스크 길이 (삭제된 행 포함)"""
+        return self._size
+
+    def column(self, name: str):
+        """컬럼 배열 (길이 size, 읽기 전용 뷰)"""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    # ----- 갱신 -----
+
+    def _intern_id(self, value: str, ids: Dict[str, int], values: List[str]) -> int:
+        """문자열 -> 정수 ID (처음 보는 값이면 추가)"""
+        value = value or ''
+        found = ids.get(value)
+        if found is None:
+            found = ids[value] = len(values)
+            values.append(value)
+        return found
+
+    def _reserve(self, extra: int):
+        """extra 행을 더 넣을 수 있도록 용량 확보 (두 배씩 증가)"""
+        needed = self._size + extra
+        capacity = len(self._columns['valid'])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, array in self._columns.items():
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._columns[name] = grown
+
+    def _upsert(self, rows: Sequence[Tuple]) -> int:
+        """
+        (notam_no, data_source, location, start_ts, end_ts, lower, upper, lat, lon, radius) 행 반영
+
+        이미 있는 NOTAM은 제자리에서 덮어쓰고 새 NOTAM은 끝에 추가한다.
+        """
+        if not rows:
+            return 0
+
+        with self.lock:
+            self._reserve(len(rows))
+            positions = []
+            values = []
+            for notam_no, source, location, start_ts, end_ts, lower, upper, lat, lon, radius in rows:
+                row = self._rows.get(notam_no)
+                if row is None:
+                    row = self._rows[notam_no] = self._size
+                    self._size += 1
+
+                no_position = lat is None or lon is None
+                positions.append(row)
+                values.append((
+                    notam_no, start_ts, end_ts,
+                    self._intern_id(location, self._location_ids, self.locations),
+                    self._intern_id(source, self._source_ids, self.sources),
+                    DEFAULT_LOWER if lower is None else lower,
+                    DEFAULT_UPPER if upper is None else upper,
+                    np.nan if no_position else lat,
+                    np.nan if no_position else lon,
+                    radius or 0,
+                ))
+
+            # 컬럼별로 한 번에 대입 (행마다 배열 12개를 건드리지 않음)
+            positions = np.array(positions, dtype=np.int64)
+            columns = list(zip(*values))
+            c = self._columns
+            c['notam_no'][positions] = columns[0]
+            c['start_ts'][positions] = columns[1]
+            c['end_ts'][positions] = columns[2]
+            c['location_id'][positions] = columns[3]
+            c['source_id'][positions] = columns[4]
+            c['lower'][positions] = columns[5]
+            c['upper'][positions] = columns[6]
+            lat = np.radians(np.array(columns[7], dtype=np.float64))
+            c['lat'][positions] = lat
+            c['lon'][positions] = np.radians(np.array(columns[8], dtype=np.float64))
+            c['cos_lat'][positions] = np.cos(lat)
+            c['radius'][positions] = columns[9]
+            c['valid'][positions] = True
+            return len(rows)
+
+    def remove(self, notam_nos: Iterable[str]) -> int:
+        """
+        NOTAM 제거
+
+        Args:
+            notam_nos (Iterable[str]): NOTAM 번호
+
+        Returns:
+            int: 제거한 행 수 (스냅샷에 없던 번호는 무시)
+        """
+        with self.lock:
+            rows = []
+            for notam_no in notam_nos:
+                row = self._rows.pop(notam_no, None)
+                if row is not None:
+                    rows.append(row)
+            if rows:
+                self._columns['valid'][rows] = False
+                self._columns['notam_no'][rows] = None
+                self._deleted += len(rows)
+                if self._deleted > self._size * COMPACT_RATIO:
+                    self.compact()
+            return len(rows)
+
+    def apply_changes(self, changes: Dict, data_source: str, now: TimeValue = None) -> Dict[str, int]:
+        """
+        변경 감지 결과로 증분 갱신
+
+        new / updated는 스냅샷에 반영하고 deleted는 제거한다. 이미 끝난 NOTAM은 넣지 않고,
+        시각 epoch가 없는 NOTAM은 제거한다.
+
+        Args:
+            changes (Dict): detect_changes() / apply_batch() 결과
+            data_source (str): 'domestic' 또는 'international'
+            now (datetime | int, optional): 만료 판정 기준 시각 (기본: 현재)
+
+        Returns:
+            Dict[str, int]: 'upserted', 'removed' 행 수
+        """
+        notams = list(changes.get('new', ())) + [update['current'] for update in changes.get('updated', ())]
+        cutoff = _epoch(now)
+
+        rows = []
+        dropped = [notam['notam_no'] for notam in changes.get('deleted', ())]
+        for notam, (_, start_ts, end_ts, _, _) in zip(notams, epoch_columns(notams)):
+            if start_ts is None or end_ts is None or end_ts < cutoff:
+                dropped.append(notam['notam_no'])
+                continue
+            parsed = parse_notam(notam) or {}
+            rows.append((notam['notam_no'], data_source, notam.get('location') or '', start_ts, end_ts)
+                        + tuple(parsed.get(field) for field in PARSED_FIELDS))
+
+        with self.lock:
+            result = {'upserted': self._upsert(rows), 'removed': self.remove(dropped)}
+        logger.info(f"[OK] NOTAM 스냅샷 갱신: 반영 {result['upserted']}개, 제거 {result['removed']}개")
+        return result
+
+    def prune(self, now: TimeValue = None) -> int:
+        """
+        끝난 NOTAM 제거 후 압축
+
+        Args:
+            now (datetime | int, optional): 기준 시각 (기본: 현재)
+
+        Returns:
+            int: 제거한 행 수
+        """
+        with self.lock:
+            expired = np.flatnonzero(self.column('valid') & (self.column('end_ts') < _epoch(now)))
+            removed = self.remove(self._columns['notam_no'][expired].tolist())
+            if self._deleted:
+                self.compact()
+            return removed
+
+    def compact(self):
+        """삭제된 행을 빼고 배열을 다시 채움 (행 번호가 바뀌므로 이전 마스크는 무효)"""
+        with self.lock:
+            keep = np.flatnonzero(self._columns['valid'][:self._size])
+            capacity = max(INITIAL_CAPACITY, len(self._columns['valid']))
+            for name, array in self._columns.items():
+                packed = np.zeros(capacity, dtype=array.dtype)
+                packed[:len(keep)] = array[keep]
+                self._columns[name] = packed
+            self._size = len(keep)
+            self._rows = {notam_no: row for row, notam_no in enumerate(self._columns['notam_no'][:self._size].tolist())}
+            self._deleted = 0
+
+    # ----- 필터 (불리언 마스크) -----
+
+    def active_mask(self, at: TimeValue = None):
+        """시각 at에 유효 (start_ts <= at <= end_ts)"""
+        moment = _epoch(at)
+        return self.column('valid') & (self.column('start_ts') <= moment) & (self.column('end_ts') >= moment)
+
+    def window_mask(self, start: TimeValue, end: TimeValue):
+        """구간 [start, end]와 겹침"""
+        return (self.column('valid') & (self.column('start_ts') <= _epoch(end))
+                & (self.column('end_ts') >= _epoch(start)))
+
+    def location_mask(self, locations: Union[str, Iterable[str]]):
+        """공항 코드 (하나 또는 여러 개)"""
+        if isinstance(locations, str):
+            locations = (locations,)
+        ids = [self._location_ids[code] for code in locations if code in self._location_ids]
+        if len(ids) == 1:
+            return self.column('location_id') == ids[0]
+        return np.isin(self.column('location_id'), ids)
+
+    def source_mask(self, data_source: str):
+        """데이터 소스"""
+        source_id = self._source_ids.get(data_source)
+        if source_id is None:
+            return np.zeros(self._size, dtype=bool)
+        return self.column('source_id') == source_id
+
+    def altitude_mask(self, floor: Optional[int] = None, ceiling: Optional[int] = None):
+        """
+        고도 범위 [floor, ceiling] (FL)와 겹침
+
+        예: FL100 아래 -> altitude_mask(ceiling=100). Q) 행이 없는 NOTAM은 전 고도로 본다.
+        """
+        mask = self.column('valid').copy()
+        if floor is not None:
+            mask = mask & (self.column('upper') >= floor)
+        if ceiling is not None:
+            mask = mask & (self.column('lower') <= ceiling)
+        return mask
+
+    def distance_nm(self, lat: float, lon: float, rows=None):
+        """
+        지점에서 각 NOTAM 중심까지 거리 (NM, haversine). 좌표가 없는 행은 NaN
+
+        Args:
+            lat (float): 위도 (도)
+            lon (float): 경도 (도)
+            rows (ndarray, optional): 계산할 행 번호 (기본: 전체)
+        """
+        lat0, lon0 = np.radians(lat), np.radians(lon)
+        c = self._columns
+        size = self._size
+        lats = c['lat'][:size] if rows is None else c['lat'][rows]
+        lons = c['lon'][:size] if rows is None else c['lon'][rows]
+        cos_lats = c['cos_lat'][:size] if rows is None else c['cos_lat'][rows]
+        a = np.sin((lats - lat0) / 2) ** 2 + np.cos(lat0) * cos_lats * np.sin((lons - lon0) / 2) ** 2
+        return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+    def distance_mask(self, lat: float, lon: float, radius_nm: float):
+        """지점 반경 radius_nm 안에 NOTAM 영역(중심 + 반경)이 걸침. 좌표 없는 행은 제외"""
+        with np.errstate(invalid='ignore'):
+            return self.column('valid') & (self.distance_nm(lat, lon) <= radius_nm + self.column('radius'))
+
+    # ----- 조회 -----
+
+    def notam_nos(self, mask) -> List[str]:
+        """마스크가 True인 행의 NOTAM 번호"""
+        return self._columns['notam_no'][:self._size][mask].tolist()
+
+    def query(self, at: TimeValue = None, location: Union[str, Iterable[str], None] = None,
+              data_source: Optional[str] = None, floor: Optional[int] = None,
+              ceiling: Optional[int] = None,
+              near: Optional[Tuple[float, float, float]] = None) -> List[str]:
+        """
+        조건에 맞는 유효 NOTAM 번호 조회
+
+        거리 계산은 다른 조건을 통과한 행에만 한다.
+
+        Args:
+            at (datetime | int, optional): 유효 시각 (기본: 현재)
+            location (str | Iterable[str], optional): 공항 코드
+            data_source (str, optional): 데이터 소스
+            floor (int, optional): 고도 하한 (FL)
+            ceiling (int, optional): 고도 상한 (FL)
+            near (Tuple[float, float, float], optional): (위도, 경도, 반경 NM)
+
+        Returns:
+            List[str]: NOTAM 번호 (스냅샷 행 순서)
+        """
+        with self.lock:
+            mask = self.active_mask(at)
+            if location is not None:
+                mask &= self.location_mask(location)
+            if data_source is not None:
+                mask &= self.source_mask(data_source)
+            if floor is not None or ceiling is not None:
+                mask &= self.altitude_mask(floor, ceiling)
+
+            rows = np.flatnonzero(mask)
+            if near is not None and len(rows):
+                lat, lon, radius_nm = near
+                with np.errstate(invalid='ignore'):
+                    inside = self.distance_nm(lat, lon, rows) <= radius_nm + self._columns['radius'][rows]
+                rows = rows[inside]
+
+            return self._columns['notam_no'][rows].tolist()
@@ -0,0 +1,97 @@
+"""
+NOTAM 시각 변환 (원문 문자열 -> UTC epoch 정수)
+작성일: 2026-10-17
+기능:
+  - 'YYMMDDHHMM' (UTC), 'YYYYMMDDHHMM', 'YYMMDDHHMMEST', 'PERM' 변환
+  - 종료 시각 PERM/EST 플래그 (종료 시각이 없거나 해석할 수 없으면 끝나지 않은 NOTAM으로 취급)
+  - 크롤링 1회 배치 단위 변환 (배치 안의 고유 문자열만 한 번씩 변환)
+"""
+
+import calendar
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# PERM 종료 시각 (9999-12-31 23:59:59 UTC): 구간 조회에서 항상 유효로 판정되도록 최댓값 사용
+PERM_EPOCH = 253402300799
+
+# 한 NOTAM의 epoch 컬럼 (notam_records 컬럼 순서와 동일)
+EPOCH_COLUMNS = ('issue_ts', 'start_ts', 'end_ts', 'end_perm', 'end_est')
+
+
+def parse_notam_time(value: Optional[str]) -> Tuple[Optional[int], bool, bool]:
+    """
+    NOTAM 시각 문자열 변환
+
+    Args:
+        value (str): 'YYMMDDHHMM', 'YYYYMMDDHHMM', 뒤에 'EST'가 붙은 값 또는 'PERM'
+
+    Returns:
+        Tuple[Optional[int], bool, bool]: (UTC epoch 초, PERM 여부, EST 여부).
+            형식이 맞지 않으면 epoch는 None
+    """
+    text = (value or '').strip().upper()
+    if text == 'PERM':
+        return PERM_EPOCH, True, False
+
+    estimated = text.endswith('EST')
+    if estimated:
+        text = text[:-3].rstrip()
+    # '2026-04-01 01:00' 같은 구분자 포함 형식
+    if not text.isdigit():
+        text = ''.join(ch for ch in text if ch.isdigit())
+
+    if len(text) == 10:
+        year = 2000 + int(text[:2])
+        text = text[2:]
+    elif len(text) == 12:
+        year = int(text[:4])
+        text = text[4:]
+    else:
+        return None, False, estimated
+
+    month, day, hour, minute = int(text[:2]), int(text[2:4]), int(text[4:6]), int(text[6:8])
+    if not (1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]
+            and hour <= 24 and minute <= 59):
+        return None, False, estimated
+    # calendar.timegm은 24시 등 범위 밖 값을 다음 날로 넘겨 계산
+    return calendar.timegm((year, month, day, hour, minute, 0)), False, estimated
+
+
+def epoch_columns(notams: Iterable[Dict]) -> List[Tuple]:
+    """
+    크롤링 배치의 epoch 컬럼 일괄 계산
+
+    발행/시작/종료 시각은 배치 안에서 많이 겹치므로 고유 문자열만 한 번씩 변환한다.
+
+    종료 시각이 비어 있거나 해석할 수 없으면 취소될 때까지 유효한 것으로 보고 end_ts를
+    PERM_EPOCH로 둔다 (end_perm=0이므로 원문 PERM과 구분됨). 유효 NOTAM을 빠뜨리지 않기 위함이며,
+    변환된 행은 end_ts가 항상 NULL이 아니다.
+
+    Args:
+        notams (Iterable[Dict]): NOTAM 데이터 (issue_time, start_time, end_time)
+
+    Returns:
+        List[Tuple]: NOTAM마다 (issue_ts, start_ts, end_ts, end_perm, end_est)
+    """
+    notams = notams if isinstance(notams, list) else list(notams)
+    issue = [notam.get('issue_time') or '' for notam in notams]
+    start = [notam.get('start_time') or '' for notam in notams]
+    end = [notam.get('end_time') or '' for notam in notams]
+
+    # 고유 문자열만 변환
+    epochs = {value: parse_notam_time(value)[0] for value in set(issue).union(start)}
+    ends = {}
+    for value in set(end):
+        end_ts, perm, estimated = parse_notam_time(value)
+        if end_ts is None:
+            end_ts = PERM_EPOCH
+        ends[value] = (end_ts, int(perm), int(estimated))
+
+    return [(epochs[i], epochs[s]) + ends[e] for i, s, e in zip(issue, start, end)]
+
+
+def to_epoch(moment: datetime) -> int:
+    """datetime -> UTC epoch 초 (tzinfo가 없으면 UTC로 간주)"""
+    if moment.tzinfo is None:
+        return calendar.timegm(moment.timetuple())
+    return int(moment.timestamp())